@@ -0,0 +1,91 @@
+"""
+Startup benchmark: time from spawning the MCP server over stdio to its
+response to the `initialize` request.
+
+Usage:
+    python benchmarks/startup.py [--runs 10] [--json]
+
+The LightRAG API does not need to be running; the server must answer
+`initialize` without contacting it.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"},
+    },
+}
+
+
+def time_to_initialize(command, env) -> float:
+    """Spawn the server, send `initialize` and return the seconds until its response."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        text=True,
+    )
+    try:
+        proc.stdin.write(json.dumps(INITIALIZE) + "\n")
+        proc.stdin.flush()
+        for line in proc.stdout:
+            message = json.loads(line)
+            if message.get("id") == 1:
+                if "error" in message:
+                    raise RuntimeError(f"initialize failed: {message['error']}")
+                return time.perf_counter() - start
+        raise RuntimeError("Server exited before answering initialize")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MCP server time-to-initialize")
+    parser.add_argument("--runs", type=int, default=10, help="Number of server launches")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    command = [sys.executable, "-m", "mcp_lightrag.cli", "--log-level", "ERROR"]
+    env = dict(os.environ)
+    # An unreachable API makes sure start-up does not depend on LightRAG
+    env.setdefault("LIGHTRAG_HOST", "127.0.0.1")
+    env.setdefault("LIGHTRAG_PORT", "9")
+    env.setdefault("LIGHTRAG_MANIFEST_PATH", "")
+
+    # The first launch also compiles bytecode; keep it out of the statistics
+    time_to_initialize(command, env)
+    samples = [time_to_initialize(command, env) for _ in range(args.runs)]
+
+    result = {
+        "runs": args.runs,
+        "min_ms": round(min(samples) * 1000, 1),
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(
+            f"time to initialize over {result['runs']} runs: "
+            f"min {result['min_ms']} ms, median {result['median_ms']} ms, max {result['max_ms']} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
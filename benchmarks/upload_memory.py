@@ -0,0 +1,91 @@
+"""
+Upload memory benchmark: peak Python heap while uploading one large file,
+with the generated multipart body and with the streamed upload path.
+
+Usage:
+    python benchmarks/upload_memory.py [--size-mb 256]
+
+A minimal local HTTP server stands in for LightRAG and discards the body.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from mcp_lightrag.api_client import LightRAGApiClient
+from mcp_lightrag.models import ServerSettings
+
+BODY = b'{"status": "success", "message": "ok", "track_id": "t"}'
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+
+
+async def discard_upload(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Read one request, drop its body and answer like /documents/upload."""
+    headers = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in headers.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    if length:
+        while length > 0:
+            chunk = await reader.read(min(length, 1024 * 1024))
+            if not chunk:
+                break
+            length -= len(chunk)
+    else:
+        # Chunked transfer encoding: read until the terminating chunk
+        while not (await reader.readline()).strip() == b"0":
+            pass
+        await reader.readline()
+    writer.write(RESPONSE)
+    await writer.drain()
+    writer.close()
+
+
+async def measure(path: Path, port: int, stream_threshold: int):
+    client = LightRAGApiClient(ServerSettings(
+        host="127.0.0.1", port=port, manifest_path=None, stream_upload_threshold=stream_threshold
+    ))
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        await client.upload_file(path)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        await client.close()
+    return peak, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure peak memory of large file uploads")
+    parser.add_argument("--size-mb", type=int, default=256, help="Size of the uploaded file")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    server = await asyncio.start_server(discard_upload, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large.pdf"
+        with open(path, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+
+        for label, threshold in (("generated multipart", 2 ** 62), ("streamed", 0)):
+            peak, elapsed = await measure(path, port, threshold)
+            print(f"{label:>20}: peak heap {peak / 2 ** 20:8.1f} MiB, {elapsed:6.2f} s for {args.size_mb} MiB")
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,106 +3,146 @@ API client for LightRAG with robust error handling and retries.
 """
 
 import asyncio
+import hashlib
+import importlib.util
+import json
 import logging
-import re
+import os
+import socket
+from collections import deque
+from contextlib import aclosing
 import functools
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar, Union
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar, Union
 
 import httpx
 from .exceptions import (
     APIConnectionError, 
     APIResponseError, 
+    LightRAGError,
     ResourceNotFoundError
 )
-from .models import ServerSettings
+from .models import BatchResult, ContextProjection, ManifestEntry, ServerSettings
+from .batch import ProgressCallback, run_batch
+from .cache import QueryCache, SingleFlight, query_cache_key
+from .doc_index import DocumentIndex
+from .manifest import Manifest, hash_file
+from .retrieval import project_query_data
+from .circuit_breaker import BREAKER_GROUPS, CircuitBreaker, CircuitState, is_breaker_failure
+from .retry import (
+    Idempotency,
+    RetryableStatus,
+    RetryBudget,
+    RetryPolicy,
+    call_with_retry,
+    raise_for_retryable_status
+)
 
 # Import auto-generated client components
 from .client.light_rag_server_api_client.client import AuthenticatedClient
+from .client.light_rag_server_api_client.types import File, Unset
+from .client.light_rag_server_api_client.errors import UnexpectedStatus
+from .endpoints import LazyEndpoint, api_models, decode_json
+from .upload import MultipartFileStream
+from .broker import BrokerTransport
+from .balancer import LoadBalancingTransport
+from .scanner import check_directory, scan_files, walk_files
+
+if TYPE_CHECKING:
+    from .client.light_rag_server_api_client.models import QueryRequest
+
+# Generated endpoints are imported on first use (see endpoints.py)
 
 # Default
-from .client.light_rag_server_api_client.api.default.get_status_health_get import asyncio as async_get_health
+async_get_health = LazyEndpoint("default.get_status_health_get")
 
 # Documents
-from .client.light_rag_server_api_client.api.documents.documents_documents_get import asyncio as async_get_documents
-from .client.light_rag_server_api_client.api.documents.get_pipeline_status_documents_pipeline_status_get import asyncio as async_get_pipeline_status
-from .client.light_rag_server_api_client.api.documents.insert_text_documents_text_post import asyncio as async_insert_document
-from .client.light_rag_server_api_client.api.documents.insert_texts_documents_texts_post import asyncio as async_insert_texts
-from .client.light_rag_server_api_client.api.documents.scan_for_new_documents_documents_scan_post import asyncio as async_scan_for_new_documents
-from .client.light_rag_server_api_client.api.documents.upload_to_input_dir_documents_upload_post import asyncio as async_upload_document
-from .client.light_rag_server_api_client.api.documents.delete_document_documents_delete_document_delete import asyncio as async_delete_by_doc_id
-from .client.light_rag_server_api_client.api.documents.delete_entity_documents_delete_entity_delete import asyncio as async_delete_entity
-
+async_get_documents = LazyEndpoint("documents.documents_documents_get")
+async_get_documents_paginated = LazyEndpoint("documents.get_documents_paginated_documents_paginated_post")
+async_get_pipeline_status = LazyEndpoint("documents.get_pipeline_status_documents_pipeline_status_get")
+async_insert_document = LazyEndpoint("documents.insert_text_documents_text_post")
+async_insert_texts = LazyEndpoint("documents.insert_texts_documents_texts_post")
+async_scan_for_new_documents = LazyEndpoint("documents.scan_for_new_documents_documents_scan_post")
+async_upload_document = LazyEndpoint("documents.upload_to_input_dir_documents_upload_post")
+# Target of streamed uploads, which bypass the generated multipart body
+UPLOAD_PATH = "/documents/upload"
+async_delete_by_doc_id = LazyEndpoint("documents.delete_document_documents_delete_document_delete")
+async_delete_entity = LazyEndpoint("documents.delete_entity_documents_delete_entity_delete")
+async_get_track_status = LazyEndpoint("documents.get_track_status_documents_track_status_track_id_get")
+async_get_status_counts = LazyEndpoint("documents.get_document_status_counts_documents_status_counts_get")
 
 # Graph
-from .client.light_rag_server_api_client.api.graph.create_entity_graph_entity_create_post import asyncio as async_create_entity
-from .client.light_rag_server_api_client.api.graph.create_relation_graph_relation_create_post import asyncio as async_create_relation
-from .client.light_rag_server_api_client.api.graph.update_entity_graph_entity_edit_post import asyncio as async_edit_entity
-from .client.light_rag_server_api_client.api.graph.update_relation_graph_relation_edit_post import asyncio as async_edit_relation
-from .client.light_rag_server_api_client.api.graph.get_graph_labels_graph_label_list_get import asyncio as async_get_graph_labels
-from .client.light_rag_server_api_client.api.graph.merge_entities_graph_entities_merge_post import asyncio as async_merge_entities
+async_create_entity = LazyEndpoint("graph.create_entity_graph_entity_create_post")
+async_create_relation = LazyEndpoint("graph.create_relation_graph_relation_create_post")
+async_edit_entity = LazyEndpoint("graph.update_entity_graph_entity_edit_post")
+async_edit_relation = LazyEndpoint("graph.update_relation_graph_relation_edit_post")
+async_get_graph_labels = LazyEndpoint("graph.get_graph_labels_graph_label_list_get")
+async_merge_entities = LazyEndpoint("graph.merge_entities_graph_entities_merge_post")
 
 # Query
-from .client.light_rag_server_api_client.api.query.query_text_query_post import asyncio as async_query_document
-
-from .client.light_rag_server_api_client.models import (
-    BodyUploadToInputDirDocumentsUploadPost,
-    InsertTextRequest,
-    InsertTextsRequest,
-    QueryRequest,
-    EntityMergeRequest as MergeEntitiesRequest,
-    EntityCreateRequest,
-    EntityCreateRequestEntityData,
-    EntityUpdateRequest,
-    EntityUpdateRequestUpdatedData,
-    RelationCreateRequest,
-    RelationCreateRequestRelationData,
-    RelationUpdateRequest,
-    RelationUpdateRequestUpdatedData,
-    DeleteDocRequest,
-    DeleteEntityRequest,
-    DocumentsRequest,
-    DocumentsRequestSortField,
-    DocumentsRequestSortDirection,
-)
-
-from .client.light_rag_server_api_client.api.documents.get_documents_paginated_documents_paginated_post import asyncio as async_get_documents_paginated
-from .client.light_rag_server_api_client.types import File
-from .client.light_rag_server_api_client.errors import UnexpectedStatus
+async_query_document = LazyEndpoint("query.query_text_query_post")
+stream_query_kwargs = LazyEndpoint("query.query_text_stream_query_stream_post", attr="_get_kwargs")
+async_query_data = LazyEndpoint("query.query_data_query_data_post")
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
-def with_retry(max_retries: int = 3, base_delay: float = 1.0):
+# Page size used when listing every document
+DOCUMENT_PAGE_SIZE = 100
+
+# Polling interval bounds while waiting for server-side processing
+POLL_INTERVAL = 1.0
+POLL_MAX_INTERVAL = 10.0
+# Polls answered without any document before a track is reported as having none
+EMPTY_TRACK_POLLS = 3
+
+# Fields kept by document_summary
+DOCUMENT_SUMMARY_FIELDS = ("id", "file_path", "status", "updated_at", "track_id", "chunks_count", "error_msg")
+
+# Document states after which the server no longer processes a document
+TERMINAL_DOC_STATUSES = frozenset({"processed", "failed"})
+
+def with_retry(max_retries: int = 3, base_delay: float = 1.0, idempotency: Idempotency = Idempotency.SAFE):
     """
-    Decorator for async methods to implement exponential backoff retry logic.
+    Decorator for async methods to implement exponential backoff retry logic
+    with full jitter.
     """
+    policy = RetryPolicy(max_attempts=max_retries, base_delay=base_delay)
+
     def decorator(func: Callable[..., Awaitable[T]]):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
-                    return await func(*args, **kwargs)
-                except (httpx.ConnectError, httpx.TimeoutException, UnexpectedStatus) as e:
-                    last_exception = e
-                    # Don't retry on certain status codes if it's an UnexpectedStatus
-                    if isinstance(e, UnexpectedStatus) and e.status_code in [400, 401, 403, 404]:
-                        raise
-                    
-                    delay = base_delay * (2 ** attempt)
-                    logger.warning(
-                        f"Attempt {attempt + 1} failed for {func.__name__}: {str(e)}. "
-                        f"Retrying in {delay:.2f}s..."
-                    )
-                    await asyncio.sleep(delay)
-            
-            logger.error(f"All {max_retries} attempts failed for {func.__name__}")
-            raise last_exception
+            return await call_with_retry(
+                lambda: func(*args, **kwargs), func.__name__, policy, idempotency
+            )
         return wrapper
     return decorator
 
+def _endpoint_group(api_func) -> str:
+    """Endpoint group of a generated API function, e.g. 'query' for api.query.*."""
+    module = getattr(api_func, "__module__", "") or ""
+    marker = ".api."
+    if marker not in module:
+        return "default"
+    return module.split(marker, 1)[1].split(".", 1)[0]
+
+async def _call_checked(api_func, client: Any, **kwargs) -> Any:
+    """Call an endpoint; generated ones raise UnexpectedStatus instead of returning error models."""
+    if isinstance(api_func, LazyEndpoint):
+        return await api_func.checked(client, **kwargs)
+    return await api_func(client=client, **kwargs)
+
+def _flight_key(name: str, raw: bool, kwargs: Dict[str, Any]) -> str:
+    """Single-flight key of a read: operation name plus a hash of its canonical request body and arguments."""
+    args = {k: v.to_dict() if hasattr(v, "to_dict") else v for k, v in kwargs.items()}
+    body = args.pop("body", None)
+    payload = dict(body) if isinstance(body, dict) else ({"body": body} if body is not None else {})
+    payload.update(args)
+    digest = hashlib.sha256(query_cache_key(name, payload).encode()).hexdigest()
+    return f"{name}:{'raw' if raw else 'model'}:{digest}"
+
 class LightRAGApiClient:
     """
     Client for interacting with the LightRAG API.
@@ -113,67 +153,376 @@ class LightRAGApiClient:
         Initialize the client with provided settings.
         """
         self.settings = settings
+        connection_args = self._connection_args(settings)
+        transport = connection_args["httpx_args"].get("transport")
+        if isinstance(transport, BrokerTransport):
+            transport = transport.direct
+        self.balancer = transport if isinstance(transport, LoadBalancingTransport) else None
         # Use AuthenticatedClient only if api_key is provided, otherwise use Client
         # This avoids sending invalid 'Bearer ' header when auth is disabled
         if settings.api_key:
             self.client = AuthenticatedClient(
                 base_url=settings.base_url, 
                 token=settings.api_key, 
-                verify_ssl=False
+                verify_ssl=False,
+                raise_on_unexpected_status=True,
+                **connection_args
             )
         else:
             from .client.light_rag_server_api_client.client import Client
             self.client = Client(
                 base_url=settings.base_url,
-                verify_ssl=False
+                verify_ssl=False,
+                raise_on_unexpected_status=True,
+                **connection_args
+            )
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.retry_max_attempts,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay
+        )
+        self.retry_budget = RetryBudget(ratio=settings.retry_budget_ratio)
+        self.breakers = {
+            group: CircuitBreaker(
+                group,
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_timeout=settings.circuit_reset_timeout
             )
+            for group in BREAKER_GROUPS
+        }
+        self._probe_lock = asyncio.Lock()
+        self.query_cache = QueryCache(max_entries=settings.query_cache_size, ttl=settings.query_cache_ttl)
+        self.single_flight = SingleFlight()
+        self.doc_index = DocumentIndex(ttl=settings.doc_index_ttl)
+        self._doc_index_lock = asyncio.Lock()
+        self.manifest = Manifest(settings.manifest_path, settings.base_url) if settings.manifest_path else None
         logger.info(f"Connected to LightRAG API at {settings.base_url}")
 
+    @staticmethod
+    def _connection_args(settings: ServerSettings) -> Dict[str, Any]:
+        """Build the timeout, pool limits and HTTP version for the shared httpx client."""
+        http2 = settings.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1")
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry
+        )
+        httpx_args = {
+            "limits": limits,
+            "http2": http2,
+            "event_hooks": {"response": [raise_for_retryable_status]}
+        }
+        # A custom transport replaces the client's own pool, so it gets the same limits
+        def pool() -> httpx.AsyncBaseTransport:
+            return httpx.AsyncHTTPTransport(verify=False, limits=limits, http2=http2)
+
+        transport: Optional[httpx.AsyncBaseTransport] = None
+        if len(settings.endpoints) > 1:
+            probe_headers = {"Authorization": f"Bearer {settings.api_key}"} if settings.api_key else {}
+            transport = LoadBalancingTransport(settings.endpoints, pool, settings.health_probe_interval, probe_headers)
+        if settings.broker_socket and hasattr(socket, "AF_UNIX"):
+            transport = BrokerTransport(settings.broker_socket, transport or pool(), settings.base_url)
+        if transport is not None:
+            httpx_args["transport"] = transport
+        return {
+            "timeout": httpx.Timeout(
+                connect=settings.connect_timeout,
+                read=settings.read_timeout,
+                write=settings.write_timeout,
+                pool=settings.pool_timeout
+            ),
+            "httpx_args": httpx_args
+        }
+
+    async def warm_up(self) -> bool:
+        """
+        Open a pooled connection ahead of the first tool call by checking health.
+        Returns False (without raising) if the server is not reachable yet.
+        """
+        try:
+            await self.check_health()
+            logger.info("Connection pool warmed up")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not warm up connection to LightRAG: {str(e)}")
+            return False
+
     async def close(self):
         """Clean up resources."""
         await self.client.get_async_httpx_client().aclose()
+        if self.manifest:
+            self.manifest.close()
         logger.debug("API client connection closed")
 
-    @with_retry()
-    async def _execute_op(self, api_func, name: str, **kwargs) -> Any:
-        """Helper to execute API operations with logging and retries."""
-        try:
+    async def _execute_op(
+        self,
+        api_func,
+        name: str,
+        idempotency: Idempotency = Idempotency.GUARDED,
+        group: Optional[str] = None,
+        raw: bool = False,
+        **kwargs
+    ) -> Any:
+        """
+        Helper to execute API operations with logging and retries.
+
+        Reads should pass Idempotency.SAFE; everything else is only retried
+        when the server provably did not process the request. Calls to the
+        query, documents and graph endpoints go through that group's circuit
+        breaker (derived from the generated module unless `group` is given).
+        With `raw`, the response is returned as plain JSON data instead of
+        generated model objects, for callers that only forward it. Error
+        statuses always raise, also the documented ones (e.g. a 500 from
+        /query) that generated functions return as models, so that retries
+        and breakers see them.
+
+        Identical reads (same name and arguments) that overlap share a single
+        request; writes are always sent on their own.
+        """
+        if idempotency is Idempotency.SAFE:
+            return await self.single_flight.run(
+                _flight_key(name, raw, kwargs),
+                lambda: self._run_op(api_func, name, idempotency, group, raw, **kwargs)
+            )
+        return await self._run_op(api_func, name, idempotency, group, raw, **kwargs)
+
+    async def _run_op(
+        self,
+        api_func,
+        name: str,
+        idempotency: Idempotency,
+        group: Optional[str],
+        raw: bool,
+        **kwargs
+    ) -> Any:
+        breaker = self.breakers.get(group or _endpoint_group(api_func))
+        if breaker is not None:
+            await self._admit(breaker)
+
+        async def call():
             logger.debug(f"Starting operation: {name}")
-            result = await api_func(client=self.client, **kwargs)
-            return result
-        except UnexpectedStatus as e:
-            logger.error(f"API Error ({name}): {e.status_code} - {e.content!r}")
-            raise APIResponseError(f"API operation '{name}' failed", status_code=e.status_code, details=str(e.content))
+            if raw:
+                return await self._call_raw(api_func, **kwargs)
+            return await _call_checked(api_func, client=self.client, **kwargs)
+
+        try:
+            result = await call_with_retry(call, name, self.retry_policy, idempotency, self.retry_budget)
+        except asyncio.CancelledError:
+            self._after_write(idempotency)
+            if breaker is not None:
+                breaker.release()
+            raise
         except Exception as e:
-            logger.error(f"Unexpected error during {name}: {str(e)}")
-            raise APIConnectionError(f"Failed to connect for '{name}'") from e
+            self._after_write(idempotency)
+            if breaker is not None:
+                if is_breaker_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            raise self._api_error(name, e) from e
+
+        self._after_write(idempotency)
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+    async def _call_raw(self, api_func, **kwargs) -> Any:
+        """Call an endpoint and return plain JSON data."""
+        if isinstance(api_func, LazyEndpoint):
+            return await api_func.raw(self.client, **kwargs)
+        result = await api_func(client=self.client, **kwargs)
+        return result.to_dict() if hasattr(result, "to_dict") else result
+
+    def _after_write(self, idempotency: Idempotency):
+        """
+        Invalidate cached query results once an operation that may change the
+        graph has run. Reads still in flight may predate the change, so later
+        reads no longer join them.
+        """
+        if idempotency is not Idempotency.SAFE:
+            self.query_cache.invalidate()
+            self.single_flight.forget()
+
+    @staticmethod
+    def _api_error(name: str, error: Exception) -> LightRAGError:
+        """Translate a low-level failure into the client's exception types."""
+        if isinstance(error, (UnexpectedStatus, RetryableStatus)):
+            logger.error(f"API Error ({name}): {error.status_code} - {error.content!r}")
+            return APIResponseError(f"API operation '{name}' failed", status_code=error.status_code, details=str(error.content))
+        logger.error(f"Unexpected error during {name}: {str(error)}")
+        return APIConnectionError(f"Failed to connect for '{name}'")
+
+    async def _admit(self, breaker: CircuitBreaker):
+        """
+        Let a call through the breaker. Once an open circuit has cooled down,
+        a health check decides whether it may move to half-open.
+        """
+        if breaker.state is CircuitState.OPEN and breaker.cooldown_remaining() == 0 \
+                and not self._probe_lock.locked():
+            async with self._probe_lock:
+                if breaker.state is CircuitState.OPEN and breaker.cooldown_remaining() == 0:
+                    try:
+                        await self.check_health()
+                    except Exception:
+                        breaker.trip()
+        breaker.before_call()
 
     # --- Document Operations ---
 
     async def query(self, params: 'QueryRequest') -> Any:
-        """Perform a knowledge graph query."""
-        return await self._execute_op(async_query_document, "query", body=params)
+        """Perform a knowledge graph query, served from the query cache when possible."""
+        return await self._cached_query("query", async_query_document, params)
+
+    async def _cached_query(self, kind: str, api_func, params: 'QueryRequest', raw: bool = False) -> Any:
+        """Execute a read-only query through the LRU/TTL query cache."""
+        key = query_cache_key(kind, params.to_dict())
+        cached = self.query_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Query cache hit ({kind})")
+            return cached
+        generation = self.query_cache.generation
+        result = await self._execute_op(api_func, kind, Idempotency.SAFE, raw=raw, body=params)
+        # Only successful answers are cached, never error payloads
+        if isinstance(result, dict if raw else (api_models.QueryResponse, api_models.QueryDataResponse)):
+            self.query_cache.put(key, result, generation=generation)
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Client-side metrics, e.g. query cache hits and misses, coalesced reads and per-endpoint load."""
+        metrics: Dict[str, Any] = {
+            "query_cache": self.query_cache.stats(),
+            "single_flight": self.single_flight.stats(),
+        }
+        if self.balancer is not None:
+            metrics["endpoints"] = self.balancer.stats()
+        return metrics
+
+    async def query_data(self, params: 'QueryRequest', projection: Optional[ContextProjection] = None) -> Any:
+        """
+        Retrieve structured context (entities, relationships, chunks and
+        references) without LLM generation, optionally projected to fit a
+        token budget.
+        """
+        payload = await self._cached_query("query_data", async_query_data, params, raw=True)
+        if projection is None or not isinstance(payload, dict):
+            return payload
+        return project_query_data(payload, projection)
+
+    async def query_stream(self, params: 'QueryRequest') -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Run a query against /query/stream and yield each NDJSON object as it
+        arrives: {"references": [...]} first, then {"response": "<chunk>"} lines,
+        or {"error": "<message>"}.
+        """
+        name = "query_stream"
+        breaker = self.breakers["query"]
+        await self._admit(breaker)
+        opened = False
+        http = self.client.get_async_httpx_client()
+        try:
+            async with http.stream(**stream_query_kwargs(body=params)) as response:
+                if response.status_code >= 400:
+                    raise UnexpectedStatus(response.status_code, await response.aread())
+                breaker.record_success()
+                opened = True
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        try:
+                            message = json.loads(line)
+                        except ValueError as e:
+                            raise APIResponseError(
+                                f"API operation '{name}' returned an invalid line", details=line[:200]
+                            ) from e
+                        yield message
+        except (GeneratorExit, asyncio.CancelledError):
+            if not opened:
+                breaker.release()
+            raise
+        except APIResponseError:
+            raise
+        except Exception as e:
+            if not opened:
+                if is_breaker_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            raise self._api_error(name, e) from e
+
+    async def query_streaming(
+        self,
+        params: 'QueryRequest',
+        on_chunk: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a query, awaiting `on_chunk` with every piece of the answer as it
+        arrives, and return the assembled {"response", "references"} result.
+        """
+        chunks: List[str] = []
+        references: List[Any] = []
+        # Closed explicitly so an error line or a failing callback releases the connection at once
+        async with aclosing(self.query_stream(params)) as messages:
+            async for message in messages:
+                if "error" in message:
+                    raise APIResponseError(f"Streaming query failed: {message['error']}")
+                if message.get("references"):
+                    references = message["references"]
+                chunk = message.get("response")
+                if chunk:
+                    chunks.append(chunk)
+                    if on_chunk:
+                        await on_chunk(chunk)
+        return {"response": "".join(chunks), "references": references}
 
     async def add_text(self, text: Union[str, List[str]]) -> Any:
         """Insert text content into the graph."""
         if isinstance(text, str):
-            request = InsertTextRequest(text=text)
+            request = api_models.InsertTextRequest(text=text)
             return await self._execute_op(async_insert_document, "insert_text", body=request)
         else:
-            request = InsertTextsRequest(texts=text)
+            request = api_models.InsertTextsRequest(texts=text)
             return await self._execute_op(async_insert_texts, "insert_texts", body=request)
 
     async def upload_file(self, file_path: Union[str, Path]) -> Any:
-        """Upload a file to the inputs directory for processing."""
+        """
+        Upload a file to the inputs directory for processing.
+
+        Files of at least settings.stream_upload_threshold bytes are streamed
+        from disk in chunks read off the event loop.
+        """
         path = Path(file_path)
         if not path.exists():
             raise ResourceNotFoundError(f"File not found: {file_path}")
-            
+
+        if path.stat().st_size >= self.settings.stream_upload_threshold:
+            return await self._execute_op(
+                self._stream_upload, f"upload_{path.name}", group="documents", path=path
+            )
+
         with open(path, "rb") as f:
-            request = BodyUploadToInputDirDocumentsUploadPost(
+            request = api_models.BodyUploadToInputDirDocumentsUploadPost(
                 file=File(payload=f, file_name=path.name)
             )
-            return await self._execute_op(async_upload_document, f"upload_{path.name}", body=request)
+
+            async def upload(**kwargs):
+                # Rewind so a retried attempt sends the whole file again
+                f.seek(0)
+                return await _call_checked(async_upload_document, **kwargs)
+
+            return await self._execute_op(upload, f"upload_{path.name}", group="documents", body=request)
+
+    async def _stream_upload(self, client: AuthenticatedClient, path: Path) -> Any:
+        """POST a file to /documents/upload as a streamed multipart body."""
+        # A fresh stream per attempt, so retries resend the file from the start
+        body = MultipartFileStream(path, chunk_size=self.settings.upload_chunk_size)
+        response = await client.get_async_httpx_client().post(
+            UPLOAD_PATH, content=body, headers=body.headers
+        )
+        if response.status_code != 200:
+            raise UnexpectedStatus(response.status_code, response.content)
+        return api_models.InsertResponse.from_dict(decode_json(response.content))
 
     async def index_file(self, file_path: Union[str, Path]) -> Any:
         """Directly index a local file.
@@ -182,11 +531,11 @@ class LightRAGApiClient:
         # Fallback to upload_file since insert_file is removed
         return await self.upload_file(file_path)
 
-    async def get_all_documents(self) -> Any:
-        """Retrieve list of all indexed documents."""
+    async def get_all_documents(self, raw: bool = False) -> Any:
+        """Retrieve list of all indexed documents (as plain JSON data with `raw`)."""
         # Use paginated API to fetch all documents if possible, or fallback to legacy endpoint
         # The legacy endpoint is deprecated and limited to 1000 docs
-        return await self._execute_op(async_get_documents, "list_documents")
+        return await self._execute_op(async_get_documents, "list_documents", Idempotency.SAFE, raw=raw)
 
     async def get_documents_paginated(
         self, 
@@ -194,64 +543,130 @@ class LightRAGApiClient:
         page_size: int = 50,
         sort_field: str = "updated_at",
         sort_direction: str = "desc",
-        status_filter: Optional[str] = None
+        status_filter: Optional[str] = None,
+        raw: bool = False
     ) -> Any:
-        """Retrieve documents with pagination."""
-        request = DocumentsRequest(
+        """Retrieve documents with pagination (as plain JSON data with `raw`)."""
+        request = api_models.DocumentsRequest(
             page=page,
             page_size=page_size,
-            sort_field=DocumentsRequestSortField(sort_field),
-            sort_direction=DocumentsRequestSortDirection(sort_direction),
+            sort_field=api_models.DocumentsRequestSortField(sort_field),
+            sort_direction=api_models.DocumentsRequestSortDirection(sort_direction),
             status_filter=status_filter or None
         )
-        return await self._execute_op(async_get_documents_paginated, "list_documents_paginated", body=request)
+        return await self._execute_op(
+            async_get_documents_paginated, "list_documents_paginated", Idempotency.SAFE, raw=raw, body=request
+        )
+
+    async def iter_documents(
+        self,
+        status_filter: Optional[str] = None,
+        sort_field: str = "updated_at",
+        sort_direction: str = "desc",
+        page_size: int = DOCUMENT_PAGE_SIZE,
+        prefetch: Optional[int] = None
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Yield every document (DocStatusResponse) page by page.
+
+        Once the first page reveals the total count, up to `prefetch` further
+        pages (defaults to settings.page_prefetch) are requested concurrently
+        while earlier ones are consumed, so only that window of pages is held
+        in memory. Documents changing while the listing runs may shift
+        between pages, as with any offset pagination.
+        """
+        prefetch = self.settings.page_prefetch if prefetch is None else max(0, prefetch)
+
+        async def fetch(page: int) -> Any:
+            return await self.get_documents_paginated(
+                page=page,
+                page_size=page_size,
+                sort_field=sort_field,
+                sort_direction=sort_direction,
+                status_filter=status_filter
+            )
+
+        first = await fetch(1)
+        docs = list(getattr(first, "documents", None) or [])
+        pagination = getattr(first, "pagination", None)
+        total_count = getattr(pagination, "total_count", 0) if pagination else 0
+        total_pages = -(-total_count // page_size)
+        for doc in docs:
+            yield doc
+        if not docs:
+            return
+
+        window: "deque[asyncio.Task]" = deque()
+        next_page = 2
+        try:
+            while next_page <= total_pages or window:
+                while next_page <= total_pages and len(window) <= prefetch:
+                    window.append(asyncio.create_task(fetch(next_page)))
+                    next_page += 1
+                response = await window.popleft()
+                docs = list(getattr(response, "documents", None) or [])
+                if not docs:
+                    break
+                for doc in docs:
+                    yield doc
+        finally:
+            for task in window:
+                task.cancel()
+            if window:
+                await asyncio.gather(*window, return_exceptions=True)
 
     async def find_document_by_file_name(self, file_name: str) -> Optional[Any]:
         """
         Find a document by its file name or path.
         Returns the document DocStatusResponse object if found, None otherwise.
         
-        This method iterates through paginated results to find the document.
+        Lookups are served from the in-process document index. On a miss the
+        index is refreshed incrementally before giving up.
         """
-        page = 1
-        page_size = 100
-        
-        while True:
-            response = await self.get_documents_paginated(page=page, page_size=page_size)
-            
-            # Handle response structure
-            if not response:
-                break
-                
-            docs = getattr(response, "documents", [])
-            
-            # Access pagination object properties correctly
-            pagination = getattr(response, "pagination", None)
-            total_count = getattr(pagination, "total_count", 0) if pagination else 0
-            
-            # Check current page
-            for doc in docs:
-                doc_path = getattr(doc, "file_path", "") or ""
-                doc_name = Path(doc_path).name
-                
-                # Check for exact match on full path or filename
-                if file_name == doc_path or file_name == doc_name:
-                    return doc
-                
-                # Only log if check fails
-                # logger.debug(f"Checking doc: {doc_path} ({doc_name}) vs {file_name}")
-            
-            # Check if we need to fetch next page
-            if (page * page_size) >= total_count or not docs:
-                break
-                
-            page += 1
-            
-        return None
+        if self.doc_index.is_expired():
+            await self.refresh_document_index()
+            return self.doc_index.get(file_name)
+
+        doc = self.doc_index.get(file_name)
+        if doc is None:
+            await self.refresh_document_index()
+            doc = self.doc_index.get(file_name)
+        return doc
+
+    async def refresh_document_index(self, full: bool = False):
+        """
+        Bring the document index up to date.
+
+        A full sweep pages through every document; otherwise only documents
+        updated since the last seen `updated_at` are fetched.
+        """
+        async with self._doc_index_lock:
+            if full or self.doc_index.is_expired():
+                self.doc_index.clear()
+                await self._sweep_documents(incremental=False)
+                self.doc_index.mark_built()
+            else:
+                await self._sweep_documents(incremental=True)
+
+    async def _sweep_documents(self, incremental: bool):
+        """Page through documents (newest first) and feed them into the index."""
+        watermark = self.doc_index.watermark if incremental else None
+        # Incremental sweeps usually stop within the first page, so prefetching would be wasted
+        documents = self.iter_documents(prefetch=0 if incremental else None)
+        async with aclosing(documents):
+            async for doc in documents:
+                if watermark and (getattr(doc, "updated_at", "") or "") < watermark:
+                    break
+                self.doc_index.add(doc)
 
     async def get_pipeline_status(self) -> Any:
         """Check the status of the indexing pipeline."""
-        return await self._execute_op(async_get_pipeline_status, "pipeline_status")
+        return await self._execute_op(async_get_pipeline_status, "pipeline_status", Idempotency.SAFE)
+
+    async def get_status_counts(self) -> Dict[str, int]:
+        """Number of documents per processing status, without listing any documents."""
+        result = await self._execute_op(async_get_status_counts, "status_counts", Idempotency.SAFE, raw=True)
+        return (result or {}).get("status_counts", {})
 
     async def scan_inputs(self) -> Any:
         """Trigger a scan for new files in the inputs directory."""
@@ -264,96 +679,207 @@ class LightRAGApiClient:
         depth: int = 1,
         include_only: List[str] = None,
         ignore_files: List[str] = None,
-        ignore_dirs: List[str] = None
+        ignore_dirs: List[str] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
-        """Index a collection of files from a directory."""
-        dir_path = Path(directory)
-        if not dir_path.exists() or not dir_path.is_dir():
-            raise ResourceNotFoundError(f"Directory not found: {directory}")
-
-        include_re = [re.compile(p) for p in (include_only or [])]
-        ignore_file_re = [re.compile(p) for p in (ignore_files or [])]
-        ignore_dir_re = [re.compile(p) for p in (ignore_dirs or [])]
-
-        def should_include(p: Path) -> bool:
-            if include_re:
-                return any(r.search(p.name) for r in include_re)
-            if ignore_file_re:
-                return not any(r.search(p.name) for r in ignore_file_re)
-            return True
-
-        def should_ignore_dir(p: Path) -> bool:
-            return any(r.search(p.name) for r in ignore_dir_re)
-
-        files_to_process = []
-
-        def collect(curr_dir: Path, curr_depth: int):
-            for item in curr_dir.iterdir():
-                if item.is_dir() and recursive and curr_depth < depth:
-                    if not should_ignore_dir(item):
-                        collect(item, curr_depth + 1)
-                elif item.is_file():
-                    if should_include(item):
-                        files_to_process.append(item)
-
-        collect(dir_path, 0)
-        logger.info(f"Found {len(files_to_process)} files in {directory}")
+        """
+        Index a collection of files from a directory.
 
-        results = []
-        for f in files_to_process:
-            try:
-                await self.index_file(f)
-                results.append({"file": str(f), "status": "ok"})
-            except Exception as e:
-                results.append({"file": str(f), "status": "fail", "error": str(e)})
+        The directory is walked in a worker thread and uploads start as soon
+        as the first matching files are found. Uploads run concurrently,
+        bounded by `concurrency` (defaults to settings.max_concurrency), and
+        each file is limited to `timeout` seconds.
+        If given, `progress` is awaited with (completed, total) after every file.
+        """
+        check_directory(directory)
+        files = scan_files(directory, recursive, depth, include_only, ignore_files, ignore_dirs)
+        async with aclosing(files):
+            batch = await run_batch(
+                files,
+                self.index_file,
+                lambda f: {"file": str(f)},
+                concurrency=concurrency or self.settings.max_concurrency,
+                timeout=timeout or self.settings.file_timeout,
+                progress=progress
+            )
 
         return {
-            "total": len(files_to_process),
-            "successful": sum(1 for r in results if r['status'] == 'ok'),
-            "failed": sum(1 for r in results if r['status'] == 'fail'),
-            "details": results
+            "total": batch.total,
+            "successful": batch.successful,
+            "failed": batch.failed,
+            # Keep the original {"file", "status"[, "error"]} shape; upload responses are not JSON data
+            "details": [{k: v for k, v in r.items() if k != "data"} for r in batch.results]
         }
 
+    async def _collect_files(
+        self,
+        directory: Union[str, Path],
+        recursive: bool = False,
+        depth: int = 1,
+        include_only: Optional[List[str]] = None,
+        ignore_files: Optional[List[str]] = None,
+        ignore_dirs: Optional[List[str]] = None
+    ) -> List[Path]:
+        """List the files of a directory that pass the include/ignore filters."""
+        dir_path = check_directory(directory)
+        files = await asyncio.to_thread(lambda: list(walk_files(
+            dir_path, recursive, depth, include_only, ignore_files, ignore_dirs
+        )))
+        logger.info(f"Found {len(files)} files in {directory}")
+        return files
+
     # --- Graph Operations ---
 
     async def get_labels(self) -> Any:
         """Get labels from the knowledge graph."""
-        return await self._execute_op(async_get_graph_labels, "get_labels")
+        return await self._execute_op(async_get_graph_labels, "get_labels", Idempotency.SAFE)
 
     async def create_entity(self, name: str, type: str, description: str, source_id: str) -> Any:
         """Add a new entity to the knowledge graph."""
-        data = EntityCreateRequestEntityData.from_dict({
+        data = api_models.EntityCreateRequestEntityData.from_dict({
             "entity_type": type, 
             "description": description, 
             "source_id": source_id
         })
-        body = EntityCreateRequest(entity_name=name, entity_data=data)
+        body = api_models.EntityCreateRequest(entity_name=name, entity_data=data)
         return await self._execute_op(async_create_entity, f"create_entity_{name}", body=body)
 
     async def delete_entity(self, name: str) -> Any:
         """Remove an entity from the knowledge graph."""
-        body = DeleteEntityRequest(entity_name=name)
+        body = api_models.DeleteEntityRequest(entity_name=name)
         return await self._execute_op(async_delete_entity, f"delete_entity_{name}", body=body)
 
     async def delete_by_doc(self, doc_id: str) -> Any:
         """Remove all graph elements associated with a document ID."""
-        body = DeleteDocRequest(doc_ids=[doc_id])
-        return await self._execute_op(async_delete_by_doc_id, f"delete_doc_{doc_id}", body=body)
+        body = api_models.DeleteDocRequest(doc_ids=[doc_id])
+        result = await self._execute_op(async_delete_by_doc_id, f"delete_doc_{doc_id}", body=body)
+        if getattr(result, "status", None) == api_models.DeleteDocByIdResponseStatus.DELETION_STARTED:
+            await self._forget_documents([doc_id])
+        return result
+
+    async def delete_by_docs(
+        self,
+        doc_ids: List[str],
+        delete_file: bool = False,
+        delete_llm_cache: bool = False
+    ) -> Any:
+        """Remove several documents and their graph elements in a single request."""
+        body = api_models.DeleteDocRequest(doc_ids=list(doc_ids), delete_file=delete_file, delete_llm_cache=delete_llm_cache)
+        result = await self._execute_op(async_delete_by_doc_id, f"delete_docs_{len(doc_ids)}", body=body)
+        if getattr(result, "status", None) == api_models.DeleteDocByIdResponseStatus.DELETION_STARTED:
+            await self._forget_documents(doc_ids)
+        return result
+
+    async def _forget_documents(self, doc_ids: List[str]):
+        """Drop deleted documents from the index and the manifest, so their files count as new again."""
+        track_ids = []
+        for doc_id in doc_ids:
+            track_id = getattr(self.doc_index.get_by_id(doc_id), "track_id", None)
+            if isinstance(track_id, str) and track_id:
+                track_ids.append(track_id)
+            self.doc_index.remove(doc_id)
+        if self.manifest:
+            await asyncio.to_thread(self.manifest.remove_documents, doc_ids, track_ids)
+
+    async def delete_documents(
+        self,
+        doc_ids: List[str],
+        delete_file: bool = False,
+        delete_llm_cache: bool = False,
+        batch_size: Optional[int] = None,
+        busy_timeout: Optional[float] = None
+    ) -> BatchResult:
+        """
+        Delete documents in multi-id requests of up to `batch_size` IDs
+        (defaults to settings.delete_batch_size) and report an entry per ID.
+        The server answers for a request as a whole, so every ID sent in the
+        same request shares that request's outcome; entries carry the
+        1-based number of their request under "request".
+
+        The server runs one pipeline job at a time and answers "busy" while
+        it is working, so chunks are sent one after another and a rejected
+        chunk is resent once the pipeline is idle again, for at most
+        `busy_timeout` seconds (defaults to settings.file_timeout).
+        """
+        ids = list(dict.fromkeys(doc_ids))
+        batch_size = max(1, batch_size or self.settings.delete_batch_size)
+        busy_timeout = busy_timeout or self.settings.file_timeout
+        results: List[Dict[str, Any]] = []
+
+        for n in range(0, len(ids), batch_size):
+            chunk = ids[n:n + batch_size]
+            outcome = await self._delete_chunk(chunk, delete_file, delete_llm_cache, busy_timeout)
+            results.extend(dict(outcome, id=doc_id, request=n // batch_size + 1) for doc_id in chunk)
+
+        return BatchResult(
+            total=len(ids),
+            successful=sum(1 for r in results if r["status"] == "ok"),
+            failed=sum(1 for r in results if r["status"] == "fail"),
+            results=results
+        )
+
+    async def _delete_chunk(
+        self,
+        chunk: List[str],
+        delete_file: bool,
+        delete_llm_cache: bool,
+        busy_timeout: float
+    ) -> Dict[str, Any]:
+        """Send one deletion request, waiting out a busy pipeline, and describe its outcome."""
+        deadline = asyncio.get_running_loop().time() + busy_timeout
+        while True:
+            try:
+                result = await self.delete_by_docs(chunk, delete_file, delete_llm_cache)
+            except Exception as e:
+                return {"status": "fail", "error": str(e)}
+
+            status = getattr(result, "status", None)
+            data = {"status": str(status), "message": getattr(result, "message", "")}
+            if status == api_models.DeleteDocByIdResponseStatus.BUSY:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining > 0 and await self._wait_for_pipeline_idle(remaining):
+                    continue
+                return {"status": "fail", "error": f"Pipeline busy: {data['message']}"}
+            if status == api_models.DeleteDocByIdResponseStatus.DELETION_STARTED:
+                return {"status": "ok", "data": data}
+            if status == api_models.DeleteDocByIdResponseStatus.NOT_ALLOWED:
+                return {"status": "fail", "error": f"Deletion not allowed: {data['message']}"}
+            return {"status": "fail", "error": f"Unexpected deletion response: {data['status']} {data['message']}".rstrip()}
+
+    async def _wait_for_pipeline_idle(self, timeout: float) -> bool:
+        """Poll the pipeline status with growing intervals until it is idle; False on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = POLL_INTERVAL
+        while True:
+            try:
+                status = await self.get_pipeline_status()
+                if not getattr(status, "busy", False):
+                    return True
+            except LightRAGError as e:
+                logger.debug(f"Pipeline status check failed: {str(e)}")
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, POLL_MAX_INTERVAL)
 
     async def edit_entity(self, name: str, type: str, description: str, source_id: str) -> Any:
         """Update an existing entity."""
-        data = EntityUpdateRequestUpdatedData.from_dict({
+        data = api_models.EntityUpdateRequestUpdatedData.from_dict({
             "entity_type": type, 
             "description": description, 
             "source_id": source_id
         })
-        body = EntityUpdateRequest(entity_name=name, updated_data=data)
+        body = api_models.EntityUpdateRequest(entity_name=name, updated_data=data)
         return await self._execute_op(async_edit_entity, f"edit_entity_{name}", body=body)
 
     async def merge_entities(self, sources: List[str], target: str, strategy: Dict[str, str]) -> Any:
         """Merge multiple entities into a single target entity."""
         # Strategy argument is kept for API compatibility but ignored as the server API handles it differently now
-        body = MergeEntitiesRequest(
+        body = api_models.EntityMergeRequest(
             entities_to_change=sources,
             entity_to_change_into=target
         )
@@ -365,12 +891,12 @@ class LightRAGApiClient:
         """Create or update a relationship between entities."""
         
         if is_edit:
-            data = RelationUpdateRequestUpdatedData.from_dict({
+            data = api_models.RelationUpdateRequestUpdatedData.from_dict({
                 "description": description,
                 "keywords": keywords,
                 "weight": weight
             })
-            body = RelationUpdateRequest(
+            body = api_models.RelationUpdateRequest(
                 source_entity=source,
                 target_entity=target,
                 updated_data=data
@@ -381,13 +907,13 @@ class LightRAGApiClient:
                 body=body
             )
         else:
-            data = RelationCreateRequestRelationData.from_dict({
+            data = api_models.RelationCreateRequestRelationData.from_dict({
                 "description": description,
                 "keywords": keywords,
                 "weight": weight,
                 "source_id": source_id
             })
-            body = RelationCreateRequest(
+            body = api_models.RelationCreateRequest(
                 source_entity=source,
                 target_entity=target,
                 relation_data=data
@@ -399,8 +925,183 @@ class LightRAGApiClient:
             )
 
     async def check_health(self) -> Any:
-        """Check if the LightRAG service is healthy."""
-        return await self._execute_op(async_get_health, "health_check")
+        """
+        Check if the LightRAG service is healthy.
+        A successful check also moves open circuit breakers to half-open.
+        """
+        result = await self._execute_op(async_get_health, "health_check", Idempotency.SAFE)
+        for breaker in self.breakers.values():
+            breaker.half_open()
+        return result
+
+    async def get_track_status(self, track_id: str) -> Any:
+        """Get the processing status of the documents created under a track ID."""
+        return await self._execute_op(async_get_track_status, f"track_status_{track_id}", Idempotency.SAFE, track_id=track_id)
+
+    async def wait_for_track(
+        self,
+        track_id: str,
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Wait until every document created under `track_id` is processed or
+        failed, or until `timeout` seconds (defaults to settings.file_timeout)
+        have passed.
+
+        The track status is polled with an interval that starts at
+        POLL_INTERVAL, doubles while nothing changes (up to POLL_MAX_INTERVAL)
+        and resets whenever a document advances. `progress` is awaited with
+        (finished, total) whenever that count changes.
+
+        A track that still has no documents after EMPTY_TRACK_POLLS polls is
+        unknown or created none (e.g. the upload was a duplicate); it is
+        reported with "found" set to False instead of waiting for the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.settings.file_timeout)
+        interval = POLL_INTERVAL
+        last_summary = None
+        last_finished = -1
+        polls = 0
+
+        while True:
+            status = await self.get_track_status(track_id)
+            polls += 1
+            docs = list(getattr(status, "documents", None) or [])
+            if not docs and polls >= EMPTY_TRACK_POLLS:
+                return {
+                    "track_id": track_id,
+                    "found": False,
+                    "completed": False,
+                    "timed_out": False,
+                    "message": "No documents belong to this track ID: it is unknown, or the upload created "
+                               "none (e.g. the file was already indexed)",
+                    "total_count": 0,
+                    "status_summary": {},
+                    "documents": [],
+                }
+            summary = status.status_summary.to_dict() if getattr(status, "status_summary", None) else {}
+            finished = sum(1 for d in docs if getattr(d, "status", None) in TERMINAL_DOC_STATUSES)
+            completed = bool(docs) and finished == len(docs)
+
+            if finished != last_finished and progress:
+                try:
+                    await progress(finished, len(docs))
+                except Exception as e:
+                    logger.debug(f"Progress callback failed: {str(e)}")
+            if summary != last_summary or finished != last_finished:
+                interval = POLL_INTERVAL
+            else:
+                interval = min(interval * 2, POLL_MAX_INTERVAL)
+            last_summary, last_finished = summary, finished
+
+            remaining = deadline - loop.time()
+            if completed or remaining <= 0:
+                if completed:
+                    self.doc_index.add_all(docs)
+                return {
+                    "track_id": track_id,
+                    "found": bool(docs),
+                    "completed": completed,
+                    "timed_out": not completed,
+                    "total_count": getattr(status, "total_count", len(docs)),
+                    "status_summary": summary,
+                    "documents": [document_summary(d) for d in docs],
+                }
+            await asyncio.sleep(min(interval, remaining))
+
+    async def _resolve_doc_id(self, track_id: Optional[str]) -> Optional[str]:
+        """Resolve the server document ID created by an upload from its track ID."""
+        if not track_id:
+            return None
+        doc = self.doc_index.get_by_track_id(track_id)
+        if doc is not None:
+            return getattr(doc, "id", None)
+        status = await self.get_track_status(track_id)
+        docs = getattr(status, "documents", None) or []
+        return getattr(docs[0], "id", None) if docs else None
+
+    async def _record_upload(self, key: str, stat: os.stat_result, content_hash: Optional[str],
+                             doc_id: Optional[str] = None, result: Any = None):
+        """Store the uploaded state of a file in the manifest, if enabled."""
+        if not self.manifest or content_hash is None:
+            return
+        await asyncio.to_thread(self.manifest.put, ManifestEntry(
+            path=key,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=content_hash,
+            doc_id=doc_id,
+            track_id=getattr(result, "track_id", None)
+        ))
+
+    async def _plan_upsert(
+        self,
+        path: Path,
+        find_existing: Callable[[str], Awaitable[Optional[Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Decide whether a file must be created, skipped or updated.
+
+        Change detection uses the local manifest when the file has been uploaded
+        before: an unchanged size and mtime skips with a single stat() call, and
+        otherwise the SHA-256 of the file decides. Files unknown to the manifest
+        fall back to comparing the server's content length.
+
+        Returns a plan dict with 'action', 'doc_id' (the server document to keep
+        or replace), optional 'reason', and the file state to record after upload.
+        """
+        file_name = path.name
+        key = str(path.resolve())
+        stat = path.stat()
+        plan = {"file_name": file_name, "key": key, "stat": stat, "content_hash": None, "doc_id": None}
+        entry = await asyncio.to_thread(self.manifest.get, key) if self.manifest else None
+
+        if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            return {**plan, "action": "skipped", "reason": "file unchanged since last upload", "doc_id": entry.doc_id}
+
+        content_hash = await asyncio.to_thread(hash_file, path) if self.manifest else None
+        plan["content_hash"] = content_hash
+
+        if self.manifest and entry:
+            if entry.content_hash == content_hash:
+                await asyncio.to_thread(self.manifest.put, replace(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns))
+                return {**plan, "action": "skipped", "reason": "document already exists with identical content",
+                        "doc_id": entry.doc_id}
+
+            # Known file whose content changed: replace the old version without a listing call
+            doc_id = entry.doc_id or await self._resolve_doc_id(entry.track_id)
+            if doc_id is None:
+                existing_doc = await find_existing(file_name)
+                doc_id = getattr(existing_doc, "id", None)
+            return {**plan, "action": "updated", "doc_id": doc_id}
+
+        # Check if document already exists
+        existing_doc = await find_existing(file_name)
+        if existing_doc is None:
+            return {**plan, "action": "created"}
+
+        # Document exists, check if it's identical
+        existing_size = getattr(existing_doc, "content_length", None)
+        doc_id = getattr(existing_doc, "id", None)
+
+        # Compare by content length - handle trailing whitespace differences
+        # Server may store content with/without trailing newline
+        if existing_size is not None:
+            local_size = stat.st_size
+            # Check exact match OR match after stripping trailing whitespace
+            sizes_match = (
+                existing_size == local_size or
+                existing_size == local_size - _trailing_whitespace(path, local_size) or
+                abs(existing_size - local_size) <= 2  # Allow 2-byte tolerance for newline variations (\n vs \r\n)
+            )
+            if sizes_match:
+                await self._record_upload(key, stat, content_hash, doc_id=doc_id)
+                return {**plan, "action": "skipped", "reason": "document already exists with identical content",
+                        "doc_id": doc_id}
+
+        return {**plan, "action": "updated", "doc_id": doc_id}
 
     async def upsert_document(self, file_path: Union[str, Path]) -> Dict[str, Any]:
         """
@@ -410,59 +1111,53 @@ class LightRAGApiClient:
         - If document exists but was modified: delete and re-upload
         
         Returns a dict with 'action' (created/skipped/updated), 'doc_id', and optional 'reason'.
+        If the old version could not be deleted, nothing is uploaded and
+        'action' is 'failed' with an 'error'.
         """
         path = Path(file_path)
         if not path.exists():
             raise ResourceNotFoundError(f"File not found: {file_path}")
-        
-        # Get local file info
-        local_content = path.read_bytes()
-        local_size = len(local_content)
-        # Also compute stripped size to handle trailing whitespace differences
-        local_size_stripped = len(local_content.rstrip())
-        file_name = path.name
-        
-        # Check if document already exists
-        existing_doc = await self.find_document_by_file_name(file_name)
-        
-        if existing_doc is None:
+
+        plan = await self._plan_upsert(path, self.find_document_by_file_name)
+        file_name = plan["file_name"]
+        doc_id = plan["doc_id"]
+
+        if plan["action"] == "skipped":
+            logger.info(f"Document {file_name} skipped: {plan['reason']}")
+            return {
+                "action": "skipped",
+                "reason": plan["reason"],
+                "doc_id": doc_id,
+                "file_name": file_name
+            }
+
+        if plan["action"] == "created":
             # Document doesn't exist, upload it
             result = await self.upload_file(file_path)
+            await self._record_upload(plan["key"], plan["stat"], plan["content_hash"], result=result)
             logger.info(f"Created new document: {file_name}")
             return {
                 "action": "created",
                 "file_name": file_name,
                 "result": result
             }
-        
-        # Document exists, check if it's identical
-        existing_size = getattr(existing_doc, "content_length", None)
-        doc_id = getattr(existing_doc, "id", None)
-        
-        # Compare by content length - handle trailing whitespace differences
-        # Server may store content with/without trailing newline
-        if existing_size is not None:
-            # Check exact match OR match after stripping trailing whitespace
-            sizes_match = (
-                existing_size == local_size or 
-                existing_size == local_size_stripped or
-                abs(existing_size - local_size) <= 2  # Allow 2-byte tolerance for newline variations (\n vs \r\n)
-            )
-            if sizes_match:
-                logger.info(f"Document {file_name} already exists with same content (skipped)")
-                return {
-                    "action": "skipped",
-                    "reason": "document already exists with identical content",
-                    "doc_id": doc_id,
-                    "file_name": file_name
-                }
-        
+
         # Document exists but was modified, delete and re-upload
         if doc_id:
             logger.info(f"Document {file_name} was modified, deleting old version...")
-            await self.delete_by_doc(doc_id)
-        
+            deletion = await self.delete_documents([doc_id])
+            if deletion.failed:
+                error = deletion.results[0]["error"]
+                logger.warning(f"Not updating {file_name}: failed to delete old version: {error}")
+                return {
+                    "action": "failed",
+                    "old_doc_id": doc_id,
+                    "file_name": file_name,
+                    "error": f"Failed to delete old version: {error}"
+                }
+
         result = await self.upload_file(file_path)
+        await self._record_upload(plan["key"], plan["stat"], plan["content_hash"], result=result)
         logger.info(f"Updated document: {file_name}")
         return {
             "action": "updated",
@@ -470,3 +1165,181 @@ class LightRAGApiClient:
             "file_name": file_name,
             "result": result
         }
+
+    async def upsert_many(
+        self,
+        paths: Union[str, Path, Sequence[Union[str, Path]]],
+        recursive: bool = False,
+        depth: int = 1,
+        include_only: Optional[List[str]] = None,
+        ignore_files: Optional[List[str]] = None,
+        ignore_dirs: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Upsert many documents with one listing sweep.
+
+        `paths` is either a directory (filtered like ingest_batch) or a list of
+        file paths. The document index is refreshed once, every file is diffed
+        locally, outdated documents are deleted in multi-id requests and the
+        new versions are uploaded concurrently.
+        """
+        if isinstance(paths, (str, Path)):
+            files = await self._collect_files(paths, recursive, depth, include_only, ignore_files, ignore_dirs)
+        else:
+            files = [Path(p) for p in paths]
+
+        concurrency = max(1, concurrency or self.settings.max_concurrency)
+        timeout = timeout or self.settings.file_timeout
+        semaphore = asyncio.Semaphore(concurrency)
+        details: List[Dict[str, Any]] = [{"file": str(f)} for f in files]
+        plans: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        completed = 0
+
+        async def finish(index: int, **fields):
+            nonlocal completed
+            details[index].update(fields)
+            completed += 1
+            if progress:
+                try:
+                    await progress(completed, len(files))
+                except Exception as e:
+                    logger.debug(f"Progress callback failed: {str(e)}")
+
+        async def find_in_index(file_name: str) -> Optional[Any]:
+            return self.doc_index.get(file_name)
+
+        await self.refresh_document_index()
+
+        async def plan(index: int, f: Path):
+            if not f.is_file():
+                await finish(index, action="failed", status="fail", error=f"File not found: {f}")
+                return
+            async with semaphore:
+                try:
+                    p = await self._plan_upsert(f, find_in_index)
+                except Exception as e:
+                    await finish(index, action="failed", status="fail", error=str(e))
+                    return
+            plans[index] = p
+            if p["action"] == "skipped":
+                await finish(index, action="skipped", status="ok", doc_id=p["doc_id"], reason=p["reason"])
+
+        await asyncio.gather(*(plan(i, f) for i, f in enumerate(files)))
+
+        # Delete outdated versions in multi-id requests
+        pending = {i: p for i, p in enumerate(plans) if p is not None and p["action"] != "skipped"}
+        stale = [i for i, p in pending.items() if p["action"] == "updated" and p["doc_id"]]
+        delete_failures: Dict[int, str] = {}
+
+        if stale:
+            deletion = await self.delete_documents([pending[i]["doc_id"] for i in stale])
+            failed_ids = {r["id"]: r["error"] for r in deletion.results if r["status"] == "fail"}
+            for i in stale:
+                if pending[i]["doc_id"] in failed_ids:
+                    delete_failures[i] = failed_ids[pending[i]["doc_id"]]
+
+        async def upload(index: int):
+            p = pending[index]
+            action = p["action"]
+            if index in delete_failures:
+                await finish(index, action=action, status="fail", old_doc_id=p["doc_id"],
+                             error=f"Failed to delete old version: {delete_failures[index]}")
+                return
+            async with semaphore:
+                try:
+                    result = await asyncio.wait_for(self.upload_file(files[index]), timeout=timeout)
+                except asyncio.TimeoutError:
+                    await finish(index, action=action, status="fail", error=f"Timed out after {timeout}s")
+                    return
+                except Exception as e:
+                    await finish(index, action=action, status="fail", error=str(e))
+                    return
+            await self._record_upload(p["key"], p["stat"], p["content_hash"], result=result)
+            fields = {"old_doc_id": p["doc_id"]} if action == "updated" else {}
+            await finish(index, action=action, status="ok", **fields)
+
+        await asyncio.gather(*(upload(i) for i in pending))
+
+        return {
+            "total": len(files),
+            "created": sum(1 for d in details if d.get("action") == "created" and d["status"] == "ok"),
+            "updated": sum(1 for d in details if d.get("action") == "updated" and d["status"] == "ok"),
+            "skipped": sum(1 for d in details if d.get("action") == "skipped"),
+            "failed": sum(1 for d in details if d.get("status") == "fail"),
+            "details": details
+        }
+
+    async def remove_files(self, paths: Sequence[Union[str, Path]]) -> BatchResult:
+        """
+        Delete the server documents of local files that no longer exist.
+
+        A path may also be a removed directory, which removes every file below
+        it that the manifest knows about. Documents are found through the
+        manifest only: server documents are named by file name alone, which
+        does not tell files of different directories apart, so without a
+        manifest every path is reported as "skipped" and nothing is deleted.
+        Manifest entries are dropped once their document is deleted.
+        """
+        results: List[Dict[str, Any]] = []
+        if not self.manifest:
+            for p in paths:
+                results.append({"file": str(Path(p).resolve()), "id": None, "status": "skipped",
+                                "reason": "upload manifest disabled: the document of a removed file is unknown"})
+            logger.warning(f"Not deleting the documents of {len(results)} removed path(s) without an upload manifest")
+            return BatchResult(total=len(results), successful=0, failed=0, results=results)
+
+        targets: Dict[str, Optional[str]] = {}
+        for p in paths:
+            key = str(Path(p).resolve())
+            for path, entry in (await asyncio.to_thread(self.manifest.entries_under, key)).items():
+                targets[path] = entry.doc_id or await self._resolve_doc_id(entry.track_id)
+
+        deletion = await self.delete_documents([doc_id for doc_id in targets.values() if doc_id])
+        outcomes = {r["id"]: r for r in deletion.results}
+        for path, doc_id in targets.items():
+            outcome = outcomes.get(doc_id, {"status": "ok", "data": "no server document"})
+            if outcome["status"] == "ok":
+                await asyncio.to_thread(self.manifest.remove, path)
+            results.append(dict(outcome, file=path, id=doc_id))
+
+        return BatchResult(
+            total=len(results),
+            successful=sum(1 for r in results if r["status"] == "ok"),
+            failed=sum(1 for r in results if r["status"] == "fail"),
+            results=results
+        )
+
+
+def document_summary(doc: Any) -> Dict[str, Any]:
+    """Compact view of a DocStatusResponse (or its raw JSON form) for tool output."""
+    if isinstance(doc, dict):
+        return {key: doc.get(key) for key in DOCUMENT_SUMMARY_FIELDS}
+    return {
+        "id": doc.id,
+        "file_path": doc.file_path,
+        "status": str(doc.status),
+        "updated_at": doc.updated_at,
+        "track_id": None if isinstance(doc.track_id, Unset) else doc.track_id,
+        "chunks_count": None if isinstance(doc.chunks_count, Unset) else doc.chunks_count,
+        "error_msg": doc.error_msg or None,
+    }
+
+
+def _trailing_whitespace(path: Path, size: int, block_size: int = 4096) -> int:
+    """Count trailing whitespace bytes by reading the file backwards from the end."""
+    count = 0
+    with open(path, "rb") as f:
+        offset = size
+        while offset > 0:
+            read_size = min(block_size, offset)
+            offset -= read_size
+            f.seek(offset)
+            block = f.read(read_size)
+            stripped = block.rstrip()
+            count += len(block) - len(stripped)
+            if stripped:
+                break
+    return count
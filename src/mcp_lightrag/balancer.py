@@ -0,0 +1,190 @@
+"""
+Client-side load balancing across LightRAG replicas that share storage.
+
+Reads served from the shared storage (queries, document listings, graph
+labels; see BALANCED_READS) go to the healthy replica with the lowest
+(outstanding requests + 1) x observed latency, and fail over to another
+replica when a connection cannot be made. Everything else goes to the primary
+(the first endpoint): writes, so that only one replica runs the ingestion
+pipeline, and reads of state kept in a process's memory, such as the
+pipeline status, which only the primary knows. A background task probes
+/health on every replica and ejects those that fail until they recover.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import AbstractSet, Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, cast
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SMOOTHING = 0.3
+PROBE_TIMEOUT = 5.0
+# Latency assumed for a replica that has not answered yet (seconds)
+DEFAULT_LATENCY = 0.1
+
+# Requests any replica can answer from the shared storage
+BALANCED_READS = frozenset({
+    ("POST", "/query"), ("POST", "/query/data"), ("POST", "/query/stream"),
+    ("GET", "/documents"), ("POST", "/documents/paginated"), ("GET", "/documents/status_counts"),
+    ("GET", "/graph/label/list"), ("GET", "/graph/label/popular"), ("GET", "/graph/label/search"),
+})
+
+
+class Endpoint:
+    """One replica with its connection pool and observed load."""
+
+    def __init__(self, url: str, transport: httpx.AsyncBaseTransport):
+        self.url = httpx.URL(url)
+        self.transport = transport
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.healthy = True
+        self.requests = 0
+        self.failures = 0
+
+    def score(self) -> float:
+        return (self.outstanding + 1) * (self.latency if self.latency is not None else DEFAULT_LATENCY)
+
+    def observe(self, seconds: float):
+        """Fold a response time into the exponentially weighted latency."""
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": str(self.url),
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body that reports when it is closed, i.e. when the request is really over."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close: Optional[Callable[[], None]] = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class LoadBalancingTransport(httpx.AsyncBaseTransport):
+    """httpx transport spreading requests over several LightRAG endpoints."""
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        make_transport: Callable[[], httpx.AsyncBaseTransport],
+        probe_interval: float = 10.0,
+        probe_headers: Optional[Mapping[str, str]] = None
+    ):
+        if not urls:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = [Endpoint(url, make_transport()) for url in urls]
+        self.primary = self.endpoints[0]
+        self.probe_interval = probe_interval
+        self.probe_headers = dict(probe_headers or {})
+        self._probe_task: Optional[asyncio.Task] = None
+
+    def pick(self, exclude: AbstractSet[Endpoint] = frozenset()) -> Endpoint:
+        """Healthy endpoint with the lowest load score; ejected ones only if nothing else is left."""
+        candidates = [e for e in self.endpoints if e not in exclude]
+        healthy = [e for e in candidates if e.healthy]
+        return min(healthy or candidates, key=lambda e: (e.score(), random.random()))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._probe_task is None and self.probe_interval > 0 and len(self.endpoints) > 1:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+        if (request.method, request.url.path) not in BALANCED_READS:
+            return await self._send(self.primary, request)
+
+        tried: Set[Endpoint] = set()
+        while True:
+            endpoint = self.pick(tried)
+            try:
+                return await self._send(endpoint, request)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # Nothing was sent, so the read can go to another replica
+                tried.add(endpoint)
+                self._set_health(endpoint, False, str(e))
+                if len(tried) == len(self.endpoints):
+                    raise
+
+    async def _send(self, endpoint: Endpoint, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme=endpoint.url.scheme, host=endpoint.url.host, port=endpoint.url.port)
+        request.headers["Host"] = endpoint.url.netloc.decode("ascii")
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        start = time.monotonic()
+
+        def done():
+            endpoint.outstanding -= 1
+
+        try:
+            response = await endpoint.transport.handle_async_request(request)
+        except BaseException:
+            endpoint.failures += 1
+            done()
+            raise
+        endpoint.observe(time.monotonic() - start)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            # Async transports always answer with async streams
+            stream=_TrackedStream(cast(httpx.AsyncByteStream, response.stream), done),
+            extensions=response.extensions
+        )
+
+    def _set_health(self, endpoint: Endpoint, healthy: bool, reason: str = ""):
+        if endpoint.healthy and not healthy:
+            logger.warning(f"Ejecting LightRAG endpoint {endpoint.url}: {reason}")
+        elif healthy and not endpoint.healthy:
+            logger.info(f"LightRAG endpoint {endpoint.url} is healthy again")
+        endpoint.healthy = healthy
+
+    async def probe(self, endpoint: Endpoint):
+        """Check one endpoint's /health; any answer below 500 counts as healthy."""
+        request = httpx.Request("GET", endpoint.url.join("/health"), headers=self.probe_headers)
+        try:
+            response = await asyncio.wait_for(endpoint.transport.handle_async_request(request), PROBE_TIMEOUT)
+            await response.aclose()
+        except (httpx.HTTPError, OSError, asyncio.TimeoutError) as e:
+            self._set_health(endpoint, False, str(e) or type(e).__name__)
+            return
+        self._set_health(endpoint, response.status_code < 500, f"health check returned {response.status_code}")
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.gather(*(self.probe(e) for e in self.endpoints))
+            await asyncio.sleep(self.probe_interval)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [dict(e.stats(), primary=e is self.primary) for e in self.endpoints]
+
+    async def aclose(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            await asyncio.gather(self._probe_task, return_exceptions=True)
+        for endpoint in self.endpoints:
+            await endpoint.transport.aclose()
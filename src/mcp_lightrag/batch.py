@@ -0,0 +1,110 @@
+"""
+Bounded-concurrency executor shared by the batch tools.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Iterable, Sized
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar, Union
+
+from .models import BatchResult
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Awaited with (completed, total) as long-running operations make progress
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+async def _iterate(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def run_batch(
+    items: Union[Sequence[T], AsyncIterable[T]],
+    func: Callable[[T], Awaitable[Any]],
+    label: Callable[[T], Dict[str, Any]],
+    concurrency: int = 8,
+    timeout: Optional[float] = None,
+    fail_fast: bool = False,
+    progress: Optional[ProgressCallback] = None
+) -> BatchResult:
+    """
+    Apply `func` to every item with at most `concurrency` calls in flight.
+
+    `items` may be an async iterable (e.g. files found by a running directory
+    scan); calls start as items arrive and the total reported to `progress`
+    grows until the iterable is exhausted.
+
+    Each result starts from `label(item)` (e.g. {"name": ...}) and gets a
+    status of "ok" (with "data"), "fail" (with "error") or, with `fail_fast`,
+    "skipped" for items that had not started when the first failure happened.
+    Calls already in flight are allowed to finish. Results keep input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: List[Dict[str, Any]] = []
+    tasks: List[asyncio.Task] = []
+    known_total = len(items) if isinstance(items, Sized) else None
+    aborted = False
+    completed = 0
+
+    def describe(item: T) -> Dict[str, Any]:
+        try:
+            return dict(label(item))
+        except Exception:
+            return {"item": repr(item)}
+
+    async def finish():
+        nonlocal completed
+        completed += 1
+        if progress:
+            try:
+                await progress(completed, known_total if known_total is not None else len(results))
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {str(e)}")
+
+    async def run(entry: Dict[str, Any], item: T):
+        nonlocal aborted
+        try:
+            if timeout:
+                data = await asyncio.wait_for(func(item), timeout=timeout)
+            else:
+                data = await func(item)
+            entry.update(status="ok", data=data)
+        except asyncio.TimeoutError:
+            entry.update(status="fail", error=f"Timed out after {timeout}s")
+        except Exception as e:
+            entry.update(status="fail", error=str(e))
+        if entry["status"] == "fail" and fail_fast:
+            aborted = True
+        semaphore.release()
+        await finish()
+
+    try:
+        async for item in _iterate(items):
+            entry = describe(item)
+            results.append(entry)
+            await semaphore.acquire()
+            if aborted:
+                semaphore.release()
+                entry.update(status="skipped", error="Skipped after an earlier failure")
+                await finish()
+                continue
+            tasks.append(asyncio.create_task(run(entry, item)))
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return BatchResult(
+        total=len(results),
+        successful=sum(1 for r in results if r["status"] == "ok"),
+        failed=sum(1 for r in results if r["status"] == "fail"),
+        results=results
+    )
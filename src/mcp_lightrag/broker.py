@@ -0,0 +1,323 @@
+"""
+Local connection broker shared by the MCP server processes of one host.
+
+`mcp-lightrag broker` listens on a Unix domain socket and forwards HTTP
+requests to LightRAG over a single keep-alive pool, answering repeated reads
+from a shared cache and bounding the requests in flight host-wide. MCP
+servers configured with its socket send their requests through it
+(BrokerTransport) whenever the socket is reachable and connect to LightRAG
+directly otherwise.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from .cache import QueryCache, query_cache_key
+from .exceptions import ConfigurationError
+from .models import ServerSettings
+from .settings import default_broker_socket
+
+logger = logging.getLogger(__name__)
+
+# Seconds a broker that refused a connection is bypassed before it is tried again
+BROKER_RETRY_INTERVAL = 5.0
+# Document listings change while the pipeline runs, so they are only shared briefly
+BROKER_DOCUMENT_TTL = 5.0
+
+# POST endpoints that do not change the server's state
+READ_ONLY_POSTS = frozenset({
+    "/query", "/query/data", "/query/stream", "/documents/paginated", "/api/chat", "/api/generate", "/login"
+})
+QUERY_CACHE_ROUTES = frozenset({
+    ("POST", "/query"), ("POST", "/query/data"), ("GET", "/graph/label/list"), ("GET", "/graph/label/popular")
+})
+DOCUMENT_CACHE_ROUTES = frozenset({
+    ("GET", "/documents"), ("POST", "/documents/paginated"), ("GET", "/documents/status_counts")
+})
+# Request headers that authorize a response and so belong in cache keys
+VARY_HEADERS = ("authorization", "x-api-key")
+# Sent by BrokerTransport: the LightRAG server the client means to talk to
+UPSTREAM_HEADER = "x-lightrag-upstream"
+# Not forwarded: hop-by-hop headers, and content negotiation the upstream pool does itself
+REQUEST_SKIP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+    "transfer-encoding", "upgrade", "host", "accept-encoding", UPSTREAM_HEADER
+})
+RESPONSE_SKIP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+    "transfer-encoding", "upgrade", "content-encoding", "content-length"
+})
+
+
+def is_write(method: str, path: str) -> bool:
+    return method not in ("GET", "HEAD", "OPTIONS") and path not in READ_ONLY_POSTS
+
+
+class BrokerTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that sends requests through the broker's Unix socket and
+    falls back to direct connections while the broker is not running.
+
+    Before its first request the transport asks the broker which server it
+    forwards to, and connects directly if that is not its own `upstream`.
+    Every request also names the upstream, and a broker restarted for another
+    server answers 421 instead of forwarding it. A refused connection happens
+    before any part of the request is sent, so the fallback is safe for
+    writes too.
+    """
+
+    def __init__(self, socket_path: str, direct: httpx.AsyncBaseTransport, upstream: str):
+        self.socket_path = socket_path
+        self.direct = direct
+        self.upstream = upstream.rstrip("/")
+        self.broker = httpx.AsyncHTTPTransport(uds=socket_path)
+        self._bypass_until = 0.0
+        self._verified = False
+
+    async def _broker_upstream(self) -> Optional[str]:
+        """The server the broker forwards to, from its stats route."""
+        response = await self.broker.handle_async_request(httpx.Request("GET", "http://broker/_broker/stats"))
+        try:
+            await response.aread()
+            if response.status_code != 200:
+                return None
+            return (json.loads(response.content).get("upstream") or "").rstrip("/")
+        except ValueError:
+            return None
+        finally:
+            await response.aclose()
+
+    def _bypass(self, reason: str):
+        logger.info(f"Broker at {self.socket_path} {reason}; connecting directly")
+        self._bypass_until = time.monotonic() + BROKER_RETRY_INTERVAL
+        self._verified = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if time.monotonic() >= self._bypass_until and os.path.exists(self.socket_path):
+            try:
+                if not self._verified:
+                    upstream = await self._broker_upstream()
+                    self._verified = upstream == self.upstream
+                    if not self._verified:
+                        self._bypass(f"forwards to {upstream or 'an unknown server'}, not {self.upstream}")
+                        return await self.direct.handle_async_request(request)
+                request.headers[UPSTREAM_HEADER] = self.upstream
+                response = await self.broker.handle_async_request(request)
+                # A body that was streamed to the broker cannot be sent again
+                if response.status_code != 421 or not isinstance(request.stream, httpx.ByteStream):
+                    return response
+                await response.aclose()
+                del request.headers[UPSTREAM_HEADER]
+                self._bypass("now forwards to another server")
+            except httpx.ConnectError as e:
+                self._bypass(f"not reachable ({str(e)})")
+        return await self.direct.handle_async_request(request)
+
+    async def aclose(self):
+        await self.broker.aclose()
+        await self.direct.aclose()
+
+
+class Broker:
+    """Forwards requests to LightRAG with one shared pool, cache and in-flight limit."""
+
+    def __init__(self, settings: ServerSettings, upstream: Optional[httpx.AsyncClient] = None):
+        # Imported here so that MCP servers only using BrokerTransport skip it
+        from .api_client import LightRAGApiClient
+
+        self.settings = settings
+        if upstream is None:
+            # The broker itself connects to LightRAG (or its replicas) directly
+            args = LightRAGApiClient._connection_args(replace(settings, broker_socket=None))
+            upstream = httpx.AsyncClient(
+                base_url=settings.base_url,
+                verify=False,
+                timeout=args["timeout"],
+                **{k: v for k, v in args["httpx_args"].items() if k in ("limits", "http2", "transport")}
+            )
+        self.upstream = upstream
+        self.limit = asyncio.Semaphore(max(1, settings.broker_max_inflight))
+        self.query_cache = QueryCache(max_entries=settings.query_cache_size, ttl=settings.query_cache_ttl)
+        self.document_cache = QueryCache(max_entries=settings.query_cache_size, ttl=BROKER_DOCUMENT_TTL)
+        self.in_flight = 0
+        self.forwarded = 0
+
+    def _cache_for(self, method: str, path: str) -> Optional[QueryCache]:
+        if (method, path) in QUERY_CACHE_ROUTES:
+            return self.query_cache
+        if (method, path) in DOCUMENT_CACHE_ROUTES:
+            return self.document_cache
+        return None
+
+    @staticmethod
+    def _cache_key(method: str, path: str, query: str, headers: Dict[str, str], body: bytes) -> str:
+        vary = "|".join(hashlib.sha256(headers.get(h, "").encode()).hexdigest()[:16] for h in VARY_HEADERS)
+        kind = f"{method} {path}?{query} {vary}"
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            return query_cache_key(kind, payload)
+        return f"{kind}:{hashlib.sha256(body).hexdigest()}"
+
+    async def __call__(self, scope, receive, send):
+        """ASGI entry point."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await self.upstream.aclose()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        if path == "/_broker/stats":
+            await self._respond(send, 200, [(b"content-type", b"application/json")],
+                                json.dumps(self.stats()).encode())
+            return
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        claimed = headers.get(UPSTREAM_HEADER)
+        if claimed is not None and claimed.rstrip("/") != self.settings.base_url:
+            detail = json.dumps({"detail": f"This broker forwards to {self.settings.base_url}, not {claimed}"})
+            await self._respond(send, 421, [(b"content-type", b"application/json")], detail.encode())
+            return
+        query = scope["query_string"].decode("latin-1")
+        cache = self._cache_for(method, path)
+        body = await self._read_body(receive) if cache is not None else None
+
+        key = None
+        if cache is not None and cache.enabled:
+            key = self._cache_key(method, path, query, headers, body)
+            cached = cache.get(key)
+            if cached is not None:
+                await self._respond(send, *cached)
+                return
+
+        generation = cache.generation if cache is not None else None
+        forward_headers = [(k, v) for k, v in headers.items() if k not in REQUEST_SKIP_HEADERS]
+        raw_path = scope.get("raw_path") or path.encode()
+        request = self.upstream.build_request(
+            method, raw_path.decode("latin-1"), params=query or None, headers=forward_headers,
+            content=body if body is not None else self._stream_body(receive)
+        )
+
+        async with self.limit:
+            self.in_flight += 1
+            self.forwarded += 1
+            try:
+                response = await self.upstream.send(request, stream=True)
+            except httpx.HTTPError as e:
+                self.in_flight -= 1
+                detail = json.dumps({"detail": f"Broker could not reach LightRAG: {str(e)}"}).encode()
+                await self._respond(send, 502, [(b"content-type", b"application/json")], detail)
+                return
+            try:
+                # Bodies are passed on decoded, so their encoding and length headers no longer apply
+                response_headers = [
+                    (k.encode("latin-1"), v.encode("latin-1"))
+                    for k, v in response.headers.multi_items() if k.lower() not in RESPONSE_SKIP_HEADERS
+                ]
+                if key is not None and response.status_code == 200:
+                    content = b"".join([chunk async for chunk in response.aiter_bytes()])
+                    cache.put(key, (200, response_headers, content), generation=generation)
+                    await self._respond(send, 200, response_headers, content)
+                else:
+                    await send({"type": "http.response.start", "status": response.status_code,
+                                "headers": response_headers})
+                    async for chunk in response.aiter_bytes():
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                    await send({"type": "http.response.body", "body": b""})
+            finally:
+                await response.aclose()
+                self.in_flight -= 1
+                if is_write(method, path):
+                    self.query_cache.invalidate()
+                    self.document_cache.invalidate()
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def _stream_body(receive) -> AsyncIterator[bytes]:
+        while True:
+            message = await receive()
+            if message.get("body"):
+                yield message["body"]
+            if not message.get("more_body"):
+                return
+
+    @staticmethod
+    async def _respond(send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        headers = headers + [(b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "upstream": self.settings.base_url,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.settings.broker_max_inflight,
+            "forwarded": self.forwarded,
+            "query_cache": self.query_cache.stats(),
+            "document_cache": self.document_cache.stats(),
+        }
+
+
+def bind_socket(socket_path: str) -> socket.socket:
+    """Bind the broker socket (owner-only), replacing a stale socket file left by a crashed broker."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise ConfigurationError("The broker needs Unix domain sockets, which this platform does not support")
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            raise ConfigurationError(f"A broker is already listening on {socket_path}")
+        finally:
+            probe.close()
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    return sock
+
+
+def serve_broker(settings: ServerSettings, log_level: str = "INFO"):
+    """Run the broker until interrupted."""
+    import uvicorn
+
+    socket_path = settings.broker_socket or default_broker_socket(settings.base_url)
+    broker = Broker(settings)
+    sock = bind_socket(socket_path)
+    logger.info(f"Broker for {settings.base_url} listening on {socket_path}")
+    try:
+        server = uvicorn.Server(uvicorn.Config(broker, log_level=log_level.lower(), lifespan="on"))
+        asyncio.run(server.serve(sockets=[sock]))
+    finally:
+        sock.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
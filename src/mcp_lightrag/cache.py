@@ -0,0 +1,157 @@
+"""
+Bounded LRU + TTL cache for query results, and single-flight coalescing of
+identical reads that are in flight at the same time.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def query_cache_key(kind: str, body: Dict[str, Any]) -> str:
+    """
+    Canonical cache key for a query body (QueryRequest.to_dict()).
+
+    Whitespace in the query text is collapsed and keyword lists are sorted,
+    so requests differing only in formatting share an entry. Case is kept:
+    the LLM may answer "Apple" and "apple" differently.
+    """
+    normalized = dict(body)
+    query = normalized.get("query")
+    if isinstance(query, str):
+        normalized["query"] = " ".join(query.split())
+    for field in ("hl_keywords", "ll_keywords"):
+        if isinstance(normalized.get(field), list):
+            normalized[field] = sorted(k.strip() for k in normalized[field])
+    return kind + ":" + json.dumps(normalized, sort_keys=True, default=str)
+
+
+class QueryCache:
+    """
+    Least-recently-used cache whose entries also expire after `ttl` seconds.
+
+    Every invalidation bumps `generation`; results computed under an older
+    generation are not stored, so a write racing a slow query cannot leave a
+    stale answer behind.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        # Entries are (expires_at, value) tuples, so None only means a miss
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """Store a value unless the cache was invalidated since `generation` was read."""
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry, e.g. after the knowledge graph changed."""
+        self.generation += 1
+        if self._entries:
+            self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time: callers arriving while a call
+    with the same key is in flight await its result instead of starting
+    their own. A caller that is cancelled only stops waiting; the call itself
+    is cancelled once no caller is left.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(func()))
+            self._flights[key] = flight
+            self.calls += 1
+
+            def land(_, key=key, flight=flight):
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+            flight.task.add_done_callback(land)
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def forget(self):
+        """Let later callers start new calls, e.g. after a write made in-flight reads stale."""
+        self._flights.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._flights), "calls": self.calls, "coalesced": self.coalesced}
@@ -0,0 +1,105 @@
+"""
+Circuit breakers that fail fast while a group of LightRAG endpoints is unavailable.
+"""
+
+import enum
+import logging
+import time
+
+import httpx
+
+from .client.light_rag_server_api_client.errors import UnexpectedStatus
+from .exceptions import CircuitOpenError
+from .retry import RetryableStatus
+
+logger = logging.getLogger(__name__)
+
+# Endpoint groups guarded by a breaker; other groups (e.g. health) always pass
+BREAKER_GROUPS = ("query", "documents", "graph")
+
+
+class CircuitState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_breaker_failure(error: BaseException) -> bool:
+    """Whether an error indicates the server is unavailable (as opposed to a bad request)."""
+    if isinstance(error, (httpx.TransportError, RetryableStatus)):
+        return True
+    if isinstance(error, UnexpectedStatus):
+        return error.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """
+    Classic closed/open/half-open breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    are rejected for `reset_timeout` seconds. The client then probes server
+    health and, if healthy, moves the circuit to half-open, where a single
+    trial call decides whether it closes again or re-opens.
+    """
+
+    def __init__(self, group: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.group = group
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def cooldown_remaining(self) -> float:
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def before_call(self):
+        """Admit a call or raise CircuitOpenError."""
+        if self.state is CircuitState.OPEN:
+            raise CircuitOpenError(
+                f"LightRAG '{self.group}' endpoints are unavailable; "
+                f"circuit open, retry in {self.cooldown_remaining():.0f}s",
+                group=self.group
+            )
+        if self.state is CircuitState.HALF_OPEN:
+            if self._trial_in_flight:
+                raise CircuitOpenError(
+                    f"LightRAG '{self.group}' endpoints are recovering; trial request in progress",
+                    group=self.group
+                )
+            self._trial_in_flight = True
+
+    def release(self):
+        """Give up a half-open trial slot without an outcome (e.g. the call was cancelled)."""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        if self.state is not CircuitState.CLOSED:
+            logger.info(f"Circuit for '{self.group}' closed")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state is CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self):
+        """Open the circuit and restart the cooldown."""
+        if self.state is not CircuitState.OPEN:
+            logger.warning(f"Circuit for '{self.group}' opened after {self.failures} failures")
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def half_open(self):
+        if self.state is CircuitState.OPEN:
+            logger.info(f"Circuit for '{self.group}' half-open")
+            self.state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
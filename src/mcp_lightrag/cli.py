@@ -3,11 +3,15 @@ Command-line interface for the LightRAG MCP server.
 """
 
 import argparse
+import asyncio
 import logging
 import sys
 import os
 
+from .broker import serve_broker
 from .mcp_tools import mcp
+from .settings import get_settings
+from .transports import TRANSPORTS, serve
 
 def setup_logging(level: str = "INFO"):
     """Configure structured logging for the server."""
@@ -17,14 +21,96 @@ def setup_logging(level: str = "INFO"):
         handlers=[logging.StreamHandler(sys.stderr)]
     )
 
-def main():
-    """Entry point for starting the MCP server."""
+def add_connection_arguments(parser: argparse.ArgumentParser, suppress_defaults: bool = False):
+    """Options shared by the server and the sync command."""
+    # Sub-command parsers must not reset options given before the sub-command
+    default = argparse.SUPPRESS if suppress_defaults else None
+    parser.add_argument("--host", default=default, help="LightRAG API host")
+    parser.add_argument("--port", type=int, default=default, help="LightRAG API port")
+    parser.add_argument("--api-key", default=default, help="Optional API key for authentication")
+    parser.add_argument("--max-concurrency", type=int, default=default, help="Maximum number of concurrent uploads during batch ingestion")
+    parser.add_argument("--file-timeout", type=float, default=default, help="Timeout in seconds for each file upload during batch ingestion")
+    parser.add_argument("--doc-index-ttl", type=float, default=default, help="Seconds before the local document index is rebuilt from the server")
+    parser.add_argument("--manifest-path", default=default, help="Path of the local upload manifest used for change detection (empty to disable)")
+    parser.add_argument("--max-connections", type=int, default=default, help="Maximum number of connections in the HTTP pool")
+    parser.add_argument("--max-keepalive", type=int, default=default, help="Maximum number of idle keep-alive connections in the HTTP pool")
+    parser.add_argument("--keepalive-expiry", type=float, default=default, help="Seconds an idle keep-alive connection is kept open")
+    parser.add_argument("--connect-timeout", type=float, default=default, help="Timeout in seconds for establishing a connection")
+    parser.add_argument("--read-timeout", type=float, default=default, help="Timeout in seconds for reading a response")
+    parser.add_argument("--write-timeout", type=float, default=default, help="Timeout in seconds for sending a request")
+    parser.add_argument("--pool-timeout", type=float, default=default, help="Timeout in seconds for acquiring a connection from the pool")
+    parser.add_argument("--http2", action="store_true", default=default, help="Use HTTP/2 (requires the 'http2' extra)")
+    parser.add_argument("--retry-attempts", type=int, default=default, help="Maximum attempts per API call, including the first one")
+    parser.add_argument("--retry-budget", type=float, default=default, help="Fraction of requests that may be retried client-wide (e.g. 0.2)")
+    parser.add_argument("--query-cache-size", type=int, default=default, help="Maximum number of cached query results (0 disables the cache)")
+    parser.add_argument("--query-cache-ttl", type=float, default=default, help="Seconds a cached query result stays valid")
+    parser.add_argument("--delete-batch-size", type=int, default=default, help="Maximum number of document IDs per deletion request")
+    parser.add_argument("--page-prefetch", type=int, default=default, help="Document list pages fetched ahead while paging through all documents")
+    parser.add_argument("--stream-upload-threshold", type=int, default=default, help="File size in bytes from which uploads are streamed from disk")
+    parser.add_argument("--upload-chunk-size", type=int, default=default, help="Bytes read from disk per chunk when streaming an upload")
+    parser.add_argument("--sync-debounce", type=float, default=default, help="Seconds without file changes before a sync batch is applied")
+    parser.add_argument("--sync-poll-interval", type=float, default=default, help="Seconds between directory scans when native file events are unavailable")
+    parser.add_argument("--endpoints", default=default, help="Comma-separated URLs of LightRAG replicas; the first receives all writes")
+    parser.add_argument("--health-probe-interval", type=float, default=default, help="Seconds between health probes of the replicas given with --endpoints")
+    parser.add_argument("--shards", default=default, help="Comma-separated [name=]URL list of LightRAG shards that queries fan out to")
+    parser.add_argument("--shard-timeout", type=float, default=default, help="Seconds each shard has to answer a fanned-out query before it is dropped")
+    parser.add_argument("--broker-socket", default=default, help="Unix socket of the local connection broker to send requests through; 'auto' for the default socket of this LightRAG server (default: connect directly)")
+    parser.add_argument("--broker-max-inflight", type=int, default=default, help="Maximum requests the broker sends to LightRAG at once")
+    parser.add_argument("--log-level", default=argparse.SUPPRESS if suppress_defaults else "INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Set logging verbosity")
+
+def add_sync_arguments(parser: argparse.ArgumentParser):
+    """Options of the `sync` command."""
+    parser.add_argument("--watch", required=True, metavar="DIR", help="Directory to keep in sync with LightRAG")
+    parser.add_argument("--once", action="store_true", help="Sync the changes since the last run and exit instead of watching")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    parser.add_argument("--max-depth", type=int, default=1, help="Maximum subdirectory depth with --recursive")
+    parser.add_argument("--include", action="append", default=[], metavar="PATTERN", help="Glob or regex of file names to sync (repeatable)")
+    parser.add_argument("--ignore", action="append", default=[], metavar="PATTERN", help="Glob or regex of file names to skip (repeatable)")
+    parser.add_argument("--ignore-dir", action="append", default=[], metavar="PATTERN", help="Glob or regex of directory names to skip (repeatable)")
+    parser.add_argument("--polling", action="store_true", help="Scan the directory periodically instead of using native file events")
+
+async def run_sync(args: argparse.Namespace):
+    """Run `mcp-lightrag sync` until interrupted (or once with --once)."""
+    from .api_client import LightRAGApiClient
+    from .sync import DirectorySync
+
+    client = LightRAGApiClient(get_settings())
+    try:
+        sync = DirectorySync(
+            client,
+            args.watch,
+            recursive=args.recursive,
+            depth=args.max_depth,
+            include_only=args.include,
+            ignore_files=args.ignore,
+            ignore_dirs=args.ignore_dir,
+            force_polling=args.polling
+        )
+        if args.once:
+            await sync.catch_up()
+        else:
+            await sync.run()
+    finally:
+        await client.close()
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="LightRAG MCP Server - Bridge between MCP and LightRAG API")
-    parser.add_argument("--host", help="LightRAG API host")
-    parser.add_argument("--port", type=int, help="LightRAG API port")
-    parser.add_argument("--api-key", help="Optional API key for authentication")
-    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Set logging verbosity")
-    
+    add_connection_arguments(parser)
+    parser.add_argument("--transport", choices=TRANSPORTS, help="MCP transport: stdio (default) or an HTTP transport shared by many agents")
+    parser.add_argument("--bind", help="HOST:PORT the HTTP transports listen on (default 127.0.0.1:8000)")
+    parser.add_argument("--workers", type=int, help="Number of server processes for the streamable-http transport")
+    commands = parser.add_subparsers(dest="command", metavar="{sync,broker}")
+    sync_parser = commands.add_parser("sync", help="Mirror a local directory into LightRAG by watching it for changes")
+    add_connection_arguments(sync_parser, suppress_defaults=True)
+    add_sync_arguments(sync_parser)
+    broker_parser = commands.add_parser("broker", help="Run the local connection broker shared by the MCP servers of this host")
+    add_connection_arguments(broker_parser, suppress_defaults=True)
+    return parser
+
+def main():
+    """Entry point for starting the MCP server (or the `sync` command)."""
+    parser = build_parser()
     args = parser.parse_args()
     setup_logging(args.log_level)
     logger = logging.getLogger("mcp_lightrag")
@@ -36,12 +122,75 @@ def main():
         os.environ["LIGHTRAG_PORT"] = str(args.port)
     if args.api_key:
         os.environ["LIGHTRAG_API_KEY"] = args.api_key
+
+    # Remaining tuning options map one-to-one onto environment variables
+    env_overrides = {
+        "LIGHTRAG_MAX_CONCURRENCY": args.max_concurrency,
+        "LIGHTRAG_FILE_TIMEOUT": args.file_timeout,
+        "LIGHTRAG_DOC_INDEX_TTL": args.doc_index_ttl,
+        "LIGHTRAG_MANIFEST_PATH": args.manifest_path,
+        "LIGHTRAG_MAX_CONNECTIONS": args.max_connections,
+        "LIGHTRAG_MAX_KEEPALIVE_CONNECTIONS": args.max_keepalive,
+        "LIGHTRAG_KEEPALIVE_EXPIRY": args.keepalive_expiry,
+        "LIGHTRAG_CONNECT_TIMEOUT": args.connect_timeout,
+        "LIGHTRAG_READ_TIMEOUT": args.read_timeout,
+        "LIGHTRAG_WRITE_TIMEOUT": args.write_timeout,
+        "LIGHTRAG_POOL_TIMEOUT": args.pool_timeout,
+        "LIGHTRAG_HTTP2": args.http2,
+        "LIGHTRAG_RETRY_MAX_ATTEMPTS": args.retry_attempts,
+        "LIGHTRAG_RETRY_BUDGET_RATIO": args.retry_budget,
+        "LIGHTRAG_QUERY_CACHE_SIZE": args.query_cache_size,
+        "LIGHTRAG_QUERY_CACHE_TTL": args.query_cache_ttl,
+        "LIGHTRAG_DELETE_BATCH_SIZE": args.delete_batch_size,
+        "LIGHTRAG_PAGE_PREFETCH": args.page_prefetch,
+        "LIGHTRAG_STREAM_UPLOAD_THRESHOLD": args.stream_upload_threshold,
+        "LIGHTRAG_UPLOAD_CHUNK_SIZE": args.upload_chunk_size,
+        "LIGHTRAG_SYNC_DEBOUNCE": args.sync_debounce,
+        "LIGHTRAG_SYNC_POLL_INTERVAL": args.sync_poll_interval,
+        "LIGHTRAG_ENDPOINTS": args.endpoints,
+        "LIGHTRAG_HEALTH_PROBE_INTERVAL": args.health_probe_interval,
+        "LIGHTRAG_SHARDS": args.shards,
+        "LIGHTRAG_SHARD_TIMEOUT": args.shard_timeout,
+        "LIGHTRAG_BROKER_SOCKET": args.broker_socket,
+        "LIGHTRAG_BROKER_MAX_INFLIGHT": args.broker_max_inflight,
+        "LIGHTRAG_MCP_TRANSPORT": args.transport,
+        "LIGHTRAG_MCP_BIND": args.bind,
+        "LIGHTRAG_MCP_WORKERS": args.workers,
+    }
+    for name, value in env_overrides.items():
+        if value is not None:
+            os.environ[name] = str(value)
+
+    if args.command == "sync":
+        try:
+            asyncio.run(run_sync(args))
+        except KeyboardInterrupt:
+            logger.info("Sync stopped by user signal")
+        except Exception as e:
+            logger.exception(f"Sync failed: {str(e)}")
+            sys.exit(1)
+        return
+
+    if args.command == "broker":
+        try:
+            serve_broker(get_settings(), args.log_level)
+        except KeyboardInterrupt:
+            logger.info("Broker stopped by user signal")
+        except Exception as e:
+            logger.exception(f"Broker failed: {str(e)}")
+            sys.exit(1)
+        return
         
     logger.info("Initializing LightRAG MCP Server...")
     
     try:
-        # Run using stdio transport as default for MCP
-        mcp.run(transport="stdio")
+        settings = get_settings()
+        if settings.transport == "stdio":
+            mcp.run(transport="stdio")
+        else:
+            # One process serves every agent, sharing the API client and its caches
+            logger.info(f"Serving MCP over {settings.transport} on {settings.bind}")
+            serve(settings, args.log_level)
     except KeyboardInterrupt:
         logger.info("Server stopped by user signal")
     except Exception as e:
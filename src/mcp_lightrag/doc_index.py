@@ -0,0 +1,102 @@
+"""
+In-process index of server documents for constant-time lookups by path or file name.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+
+class DocumentIndex:
+    """
+    Maps document file paths and base names to their DocStatusResponse objects.
+
+    The index is filled by a full paginated sweep, kept fresh by incremental
+    sweeps over the most recently updated documents (tracked by `watermark`),
+    and considered expired `ttl` seconds after the last full sweep.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.by_path: Dict[str, Any] = {}
+        self.by_name: Dict[str, Any] = {}
+        self.by_track_id: Dict[str, Any] = {}
+        # Document ID -> the (mapping, key) entries pointing at it, so removal does not scan
+        self._entries_by_id: Dict[str, Set[Tuple[str, str]]] = {}
+        self.watermark: Optional[str] = None
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self.built_at is not None
+
+    def is_expired(self) -> bool:
+        """Whether a full sweep is required before the index can be trusted."""
+        if self.built_at is None:
+            return True
+        return (time.monotonic() - self.built_at) >= self.ttl
+
+    def clear(self):
+        """Drop all entries and force a full sweep on the next refresh."""
+        self.by_path.clear()
+        self.by_name.clear()
+        self.by_track_id.clear()
+        self._entries_by_id.clear()
+        self.watermark = None
+        self.built_at = None
+
+    def mark_built(self):
+        self.built_at = time.monotonic()
+
+    def _set(self, mapping_name: str, key: str, doc: Any):
+        mapping: Dict[str, Any] = getattr(self, mapping_name)
+        current_id = getattr(mapping.get(key), "id", None)
+        if current_id is not None and current_id in self._entries_by_id:
+            self._entries_by_id[current_id].discard((mapping_name, key))
+        mapping[key] = doc
+        doc_id = getattr(doc, "id", None)
+        if doc_id is not None:
+            self._entries_by_id.setdefault(doc_id, set()).add((mapping_name, key))
+
+    def add(self, doc: Any):
+        """Insert or replace a document, keeping the most recently updated one per key."""
+        doc_path = getattr(doc, "file_path", "") or ""
+        if not doc_path:
+            return
+        updated_at = getattr(doc, "updated_at", "") or ""
+
+        for mapping_name, key in (("by_path", doc_path), ("by_name", Path(doc_path).name)):
+            current = getattr(self, mapping_name).get(key)
+            if current is None or (getattr(current, "updated_at", "") or "") <= updated_at:
+                self._set(mapping_name, key, doc)
+
+        track_id = getattr(doc, "track_id", None)
+        if isinstance(track_id, str) and track_id:
+            self._set("by_track_id", track_id, doc)
+
+        if updated_at and (self.watermark is None or updated_at > self.watermark):
+            self.watermark = updated_at
+
+    def add_all(self, docs: Iterable[Any]):
+        for doc in docs:
+            self.add(doc)
+
+    def remove(self, doc_id: str):
+        """Remove every entry pointing at the given document ID."""
+        for mapping_name, key in self._entries_by_id.pop(doc_id, ()):
+            del getattr(self, mapping_name)[key]
+
+    def get(self, file_name: str) -> Optional[Any]:
+        """Look up a document by full path first, then by base name."""
+        return self.by_path.get(file_name) or self.by_name.get(file_name)
+
+    def get_by_id(self, doc_id: str) -> Optional[Any]:
+        for mapping_name, key in self._entries_by_id.get(doc_id, ()):
+            return getattr(self, mapping_name)[key]
+        return None
+
+    def get_by_track_id(self, track_id: str) -> Optional[Any]:
+        return self.by_track_id.get(track_id)
+
+    def __len__(self) -> int:
+        return len(self.by_path)
@@ -0,0 +1,94 @@
+"""
+Lazy access to the generated LightRAG API client.
+
+Every generated endpoint module imports the whole generated models package,
+so endpoints and models are only imported when first used. This keeps them
+out of the MCP server's start-up path.
+"""
+
+import importlib
+import json
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from .client.light_rag_server_api_client.errors import UnexpectedStatus
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up, see the "fast" extra
+    orjson = None  # type: ignore[assignment]
+
+GENERATED_PACKAGE = f"{__package__}.client.light_rag_server_api_client"
+
+
+def _raise_for_error_status(response: Any):
+    """Raise UnexpectedStatus unless the response has a 2xx status."""
+    if not 200 <= response.status_code < 300:
+        raise UnexpectedStatus(response.status_code, response.content)
+
+
+def decode_json(content: bytes) -> Any:
+    """Decode a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class LazyEndpoint:
+    """Stand-in for a generated endpoint function that imports its module on first call."""
+
+    def __init__(self, path: str, attr: str = "asyncio"):
+        # Mirror the real function's module so endpoint groups resolve without importing it
+        self.__module__ = f"{GENERATED_PACKAGE}.api.{path}"
+        self.attr = attr
+        self._func: Optional[Callable[..., Any]] = None
+
+    def resolve(self) -> Callable[..., Any]:
+        if self._func is None:
+            self._func = getattr(importlib.import_module(self.__module__), self.attr)
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    async def checked(self, client: Any, **kwargs) -> Any:
+        """
+        Call the endpoint and return its parsed response, raising
+        UnexpectedStatus for error statuses, including the documented ones
+        (400, 422, 500, ...) that the generated function returns as models.
+        """
+        detailed = getattr(importlib.import_module(self.__module__), "asyncio_detailed")
+        response = await detailed(client=client, **kwargs)
+        _raise_for_error_status(response)
+        return response.parsed
+
+    async def raw(self, client: Any, **kwargs) -> Any:
+        """
+        Send the endpoint's request and return the JSON body as plain Python
+        objects, skipping the generated response models entirely. Like
+        `checked`, any 2xx status is a success; an empty body gives None.
+        """
+        request = importlib.import_module(self.__module__)._get_kwargs(**kwargs)
+        response = await client.get_async_httpx_client().request(**request)
+        _raise_for_error_status(response)
+        return decode_json(response.content) if response.content else None
+
+    def __repr__(self) -> str:
+        return f"<LazyEndpoint {self.__module__}.{self.attr}>"
+
+
+class LazyModule:
+    """Module proxy that imports the module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# Generated request/response models (QueryRequest, DeleteDocRequest, ...)
+api_models = LazyModule(f"{GENERATED_PACKAGE}.models")
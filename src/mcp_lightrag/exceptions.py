@@ -2,6 +2,8 @@
 Centralized exception classes for the LightRAG MCP server.
 """
 
+from typing import Optional
+
 class LightRAGError(Exception):
     """Base exception for all LightRAG related errors."""
     pass
@@ -10,6 +12,12 @@ class APIConnectionError(LightRAGError):
     """Raised when there is a failure connecting to the LightRAG API."""
     pass
 
+class CircuitOpenError(APIConnectionError):
+    """Raised without contacting the API while its circuit breaker is open."""
+    def __init__(self, message: str, group: Optional[str] = None):
+        super().__init__(message)
+        self.group = group
+
 class APIResponseError(LightRAGError):
     """Raised when the API returns an error response."""
     def __init__(self, message: str, status_code: int = None, details: str = None):
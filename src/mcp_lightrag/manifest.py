@@ -0,0 +1,129 @@
+"""
+Persistent local manifest of uploaded files used for change detection.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from .exceptions import ConfigurationError
+from .models import ManifestEntry
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Stored in PRAGMA user_version; databases with another non-zero version are not ours to change
+SCHEMA_VERSION = 1
+
+
+def hash_file(path: Union[str, Path], chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Compute the SHA-256 of a file without loading it fully into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    SQLite-backed map of local file paths to the size, mtime and content hash
+    they had when last uploaded, together with the server document/track IDs.
+
+    One database can serve several LightRAG servers: entries belong to the
+    server (base URL) they were uploaded to, and a Manifest only sees those
+    of its own `server`.
+
+    Methods block on SQLite I/O, so async callers run them in a worker
+    thread; a lock keeps statements and their commit together.
+    """
+
+    COLUMNS = "path, size, mtime_ns, content_hash, doc_id, track_id"
+
+    def __init__(self, db_path: Union[str, Path], server: str = ""):
+        self.db_path = Path(db_path).expanduser()
+        self.server = server
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self._conn.close()
+            raise ConfigurationError(
+                f"{self.db_path} is not an upload manifest of this version (schema version {version})"
+            )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                server TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                doc_id TEXT,
+                track_id TEXT,
+                PRIMARY KEY (server, path)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS uploads_doc_id ON uploads (server, doc_id)")
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+        logger.debug(f"Opened upload manifest at {self.db_path} for {server or 'the default server'}")
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM uploads WHERE server = ? AND path = ?",
+                (self.server, path)
+            ).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def entries_under(self, path: str) -> Dict[str, ManifestEntry]:
+        """Entries for `path` itself and, if it is a directory, every file below it."""
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self.COLUMNS} FROM uploads "
+                "WHERE server = ? AND (path = ? OR (path >= ? AND path < ?))",
+                (self.server, path, prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+            ).fetchall()
+        return {row[0]: ManifestEntry(*row) for row in rows}
+
+    def put(self, entry: ManifestEntry):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO uploads (server, {self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.server, entry.path, entry.size, entry.mtime_ns, entry.content_hash, entry.doc_id, entry.track_id)
+            )
+            self._conn.commit()
+
+    def remove(self, path: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM uploads WHERE server = ? AND path = ?", (self.server, path))
+            self._conn.commit()
+
+    def remove_documents(self, doc_ids: Iterable[str], track_ids: Iterable[str] = ()):
+        """
+        Forget the files whose server documents were deleted, so they are
+        uploaded again. Files recorded before their document ID was known are
+        matched by the track ID of their upload.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM uploads WHERE server = ? AND doc_id = ?", ((self.server, doc_id) for doc_id in doc_ids)
+            )
+            self._conn.executemany(
+                "DELETE FROM uploads WHERE server = ? AND doc_id IS NULL AND track_id = ?",
+                ((self.server, track_id) for track_id in track_ids)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -2,37 +2,92 @@
 MCP tool definitions for LightRAG server.
 """
 
+import asyncio
 import functools
 import logging
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Union, cast
+from contextlib import aclosing, asynccontextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
 
-from .api_client import LightRAGApiClient
+from .api_client import LightRAGApiClient, document_summary
+from .batch import run_batch
 from .settings import get_settings
-from .models import OperationResult, BatchResult
-from .client.light_rag_server_api_client.models import QueryRequest, QueryRequestMode
+from .models import OperationResult, BatchResult, ContextProjection
+from .endpoints import api_models
+from .sharding import ShardedClient
+from .sync import DirectorySync
 
 logger = logging.getLogger(__name__)
 
 class AppContext:
     """Type-safe application context."""
-    def __init__(self, client: LightRAGApiClient):
+    def __init__(self, client: LightRAGApiClient, shards: Optional[ShardedClient] = None):
         self.api = client
+        # Set when queries fan out to several shards
+        self.shards = shards
+        # Background directory watchers started by sync_directory, by directory
+        self.syncs: Dict[str, Tuple[DirectorySync, asyncio.Task]] = {}
+
+class SharedAppContext:
+    """
+    One AppContext for all MCP sessions of this process.
+
+    FastMCP enters the lifespan once per session: once in total with stdio,
+    but for every connection (or, stateless, every request) with the HTTP
+    transports. Sessions therefore share a single API client, with its
+    connection pool and caches, which all tools use from the one event loop.
+    The context is closed when the last session ends, unless `persistent`
+    is set; HTTP servers set it and call close() on shutdown instead.
+    """
+
+    def __init__(self):
+        self.persistent = False
+        self._app: Optional[AppContext] = None
+        self._warm_up: Optional[asyncio.Task] = None
+        self._sessions = 0
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AppContext]:
+        if self._app is None:
+            # Re-fetch settings here to capture any environment variable overrides from CLI
+            settings = get_settings()
+            shards = ShardedClient(settings) if settings.shards else None
+            self._app = AppContext(LightRAGApiClient(settings), shards)
+            # Warm up in the background so the server answers `initialize` without waiting on LightRAG
+            self._warm_up = asyncio.create_task(self._app.api.warm_up())
+        app = self._app
+        self._sessions += 1
+        try:
+            yield app
+        finally:
+            self._sessions -= 1
+            if self._sessions == 0 and not self.persistent:
+                await self.close()
+
+    async def close(self):
+        app, self._app = self._app, None
+        if app is None:
+            return
+        self._warm_up.cancel()
+        for _, task in app.syncs.values():
+            task.cancel()
+        await asyncio.gather(*(task for _, task in app.syncs.values()), return_exceptions=True)
+        await app.api.close()
+        if app.shards is not None:
+            await app.shards.close()
+        logger.info("LightRAG MCP service shut down")
+
+shared_context = SharedAppContext()
 
 @asynccontextmanager
 async def lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
-    """Manages the lifecycle of the API client."""
-    # Re-fetch settings here to capture any environment variable overrides from CLI
-    client = LightRAGApiClient(get_settings())
-    try:
-        yield AppContext(client)
-    finally:
-        await client.close()
-        logger.info("LightRAG MCP service shut down")
+    """Attach an MCP session to the shared API client."""
+    async with shared_context.session() as app:
+        yield app
 
 # Initialize FastMCP with lifespan management
 mcp = FastMCP("LightRAG-Server", lifespan=lifespan)
@@ -49,14 +104,44 @@ def format_output(func):
             return OperationResult.failure(str(e)).__dict__
     return wrapper
 
-async def get_api(ctx: Context) -> LightRAGApiClient:
-    """Helper to extract the API client from MCP context."""
+def get_app(ctx: Context) -> AppContext:
+    """Helper to extract the application context from MCP context."""
     if not ctx or not ctx.request_context or not ctx.request_context.lifespan_context:
         raise RuntimeError("Application context not initialized")
-    return cast(AppContext, ctx.request_context.lifespan_context).api
+    return cast(AppContext, ctx.request_context.lifespan_context)
+
+async def get_api(ctx: Context) -> LightRAGApiClient:
+    """Helper to extract the API client from MCP context."""
+    return get_app(ctx).api
 
 # --- Search & Query Tools ---
 
+def build_query_request(
+    prompt: str,
+    search_mode: str = "mix",
+    limit: int = 60,
+    context_only: bool = False,
+    prompt_only: bool = False
+) -> Any:
+    """Build the QueryRequest shared by the query tools."""
+    return api_models.QueryRequest(
+        query=prompt,
+        mode=api_models.QueryRequestMode(search_mode),
+        top_k=limit,
+        only_need_context=context_only,
+        only_need_prompt=prompt_only,
+        # Sensible defaults for other params
+        response_type="Multiple Paragraphs"
+    )
+
+async def notify_chunk(ctx: Context, index: int, chunk: str):
+    """Forward a streamed chunk as a progress notification, or as a log message if the client sent no progress token."""
+    meta = ctx.request_context.meta
+    if meta is not None and getattr(meta, "progressToken", None) is not None:
+        await ctx.report_progress(index, None, message=chunk)
+    else:
+        await ctx.info(chunk)
+
 @mcp.tool(name="query_knowledge_graph", description="Search the knowledge graph for information using various strategies. Ideal for answering questions based on indexed data.")
 @format_output
 async def query_knowledge_graph(
@@ -70,22 +155,62 @@ async def query_knowledge_graph(
     context_only: bool = Field(description="If True, returns only the raw context data without LLM generation", default=False),
     prompt_only: bool = Field(description="If True, returns only the constructed LLM prompt without executing it to the LLM", default=False),
 ) -> Any:
-    """Execute a RAG query against the knowledge graph."""
+    """Execute a RAG query against the knowledge graph (every shard, when sharded)."""
+    app = get_app(ctx)
+    params = build_query_request(prompt, search_mode, limit, context_only, prompt_only)
+    if app.shards is not None:
+        return await app.shards.query(params)
+    return await app.api.query(params)
+
+@mcp.tool(name="query_knowledge_graph_stream", description="Same as query_knowledge_graph, but streams the answer while it is generated: each chunk is sent as a progress (or log) notification, and the complete answer with its references is returned at the end.")
+@format_output
+async def query_knowledge_graph_stream(
+    ctx: Context,
+    prompt: str = Field(description="The question or search query to execute against the knowledge base"),
+    search_mode: str = Field(
+        description="Search strategy to use: 'mix' (recommended), 'global', 'hybrid', 'local', 'naive' or 'bypass'",
+        default="mix"
+    ),
+    limit: int = Field(description="Maximum number of result items/paragraphs to retrieve", default=60),
+) -> Any:
+    """Execute a streaming RAG query against the knowledge graph."""
     api = await get_api(ctx)
-    params = QueryRequest(
-        query=prompt,
-        mode=QueryRequestMode(search_mode),
-        top_k=limit,
-        only_need_context=context_only,
-        only_need_prompt=prompt_only,
-        # Sensible defaults for other params
-        response_type="Multiple Paragraphs",
-        max_token_for_text_unit=4096,
-        max_token_for_global_context=4096,
-        max_token_for_local_context=4096,
-        history_turns=10
+    params = build_query_request(prompt, search_mode, limit)
+    received = 0
+
+    async def forward(chunk: str):
+        nonlocal received
+        received += 1
+        await notify_chunk(ctx, received, chunk)
+
+    return await api.query_streaming(params, on_chunk=forward)
+
+@mcp.tool(name="retrieve_context", description="Retrieve structured context (entities, relationships, text chunks and references) for a query without LLM generation. Results are trimmed to the requested limits so they fit the agent's token budget; much faster and cheaper than query_knowledge_graph with context_only.")
+@format_output
+async def retrieve_context(
+    ctx: Context,
+    prompt: str = Field(description="The question or search query to retrieve context for"),
+    search_mode: str = Field(description="Retrieval strategy: 'mix' (recommended), 'local', 'global', 'hybrid' or 'naive'", default="mix"),
+    limit: int = Field(description="Number of entities/relationships the server retrieves before trimming", default=40),
+    max_entities: int = Field(description="Maximum number of entities returned", default=20),
+    max_relationships: int = Field(description="Maximum number of relationships returned", default=20),
+    max_chunks: int = Field(description="Maximum number of text chunks returned", default=5),
+    include_chunk_content: bool = Field(description="If True, includes (truncated) chunk text; otherwise only chunk references", default=False),
+    max_description_length: int = Field(description="Maximum characters kept from each entity/relationship description", default=300)
+) -> Any:
+    """Retrieve a compact structured context from /query/data (merged across shards, when sharded)."""
+    app = get_app(ctx)
+    params = build_query_request(prompt, search_mode, limit)
+    projection = ContextProjection(
+        max_entities=max_entities,
+        max_relationships=max_relationships,
+        max_chunks=max_chunks,
+        include_chunk_content=include_chunk_content,
+        max_description_length=max_description_length
     )
-    return await api.query(params)
+    if app.shards is not None:
+        return await app.shards.query_data(params, projection)
+    return await app.api.query_data(params, projection)
 
 # --- Document Management Tools ---
 
@@ -116,7 +241,7 @@ async def upload_and_index(
     api = await get_api(ctx)
     return await api.upload_file(file_path)
 
-@mcp.tool(name="upsert_document", description="Intelligently upload a document: if it doesn't exist, creates it; if it exists and is identical (same content length), skips upload; if it exists but was modified, deletes the old version and re-uploads.")
+@mcp.tool(name="upsert_document", description="Intelligently upload a document: if it doesn't exist, creates it; if it exists and is identical (unchanged since last upload or same content hash), skips upload; if it exists but was modified, deletes the old version and re-uploads. If the old version cannot be deleted, nothing is uploaded and the action is 'failed'.")
 @format_output
 async def upsert_document(
     ctx: Context,
@@ -131,6 +256,32 @@ async def upsert_document(
     api = await get_api(ctx)
     return await api.upsert_document(file_path)
 
+@mcp.tool(name="upsert_documents", description="Upsert many documents at once from a directory or a list of file paths. Lists server documents once, skips unchanged files, deletes outdated versions in bulk and uploads new or modified files in parallel.")
+@format_output
+async def upsert_documents(
+    ctx: Context,
+    file_paths: List[str] = Field(description="Local paths of the files to upsert. Ignored if directory_path is given", default_factory=list),
+    directory_path: Optional[str] = Field(description="Directory whose files should be upserted", default=None),
+    recursive: bool = Field(description="If True, scans subdirectories of directory_path recursively", default=False),
+    max_depth: int = Field(description="Maximum depth for recursive scanning", default=1),
+    include_patterns: List[str] = Field(description="List of glob or regex patterns for files to include (e.g. ['*.md'])", default_factory=list),
+    ignore_patterns: List[str] = Field(description="List of glob or regex patterns for files to exclude", default_factory=list),
+    max_concurrency: Optional[int] = Field(description="Maximum number of files processed in parallel (defaults to the server setting)", default=None)
+) -> Any:
+    api = await get_api(ctx)
+
+    async def report(completed: int, total: int):
+        await ctx.report_progress(completed, total)
+
+    return await api.upsert_many(
+        directory_path or file_paths,
+        recursive=recursive,
+        depth=max_depth,
+        include_only=include_patterns,
+        ignore_files=ignore_patterns,
+        concurrency=max_concurrency,
+        progress=report
+    )
 
 @mcp.tool(name="ingest_batch", description="Recursively index all files in a directory that match specific patterns.")
 @format_output
@@ -139,23 +290,94 @@ async def ingest_batch(
     directory_path: str = Field(description="Absolute path to the directory to scan"),
     recursive: bool = Field(description="If True, scans subdirectories recursively", default=False),
     max_depth: int = Field(description="Maximum depth for recursive scanning", default=1),
-    include_patterns: List[str] = Field(description="List of glob patterns for files to include (e.g. ['*.txt', '*.md'])", default_factory=list),
-    ignore_patterns: List[str] = Field(description="List of glob patterns for files to exclude", default_factory=list)
+    include_patterns: List[str] = Field(description="List of glob or regex patterns for files to include (e.g. ['*.txt', '*.md']); prefix with 'glob:' or 're:' to force the type", default_factory=list),
+    ignore_patterns: List[str] = Field(description="List of glob or regex patterns for files to exclude", default_factory=list),
+    max_concurrency: Optional[int] = Field(description="Maximum number of files uploaded in parallel (defaults to the server setting)", default=None)
 ) -> Any:
     api = await get_api(ctx)
+
+    async def report(completed: int, total: int):
+        await ctx.report_progress(completed, total)
+
     return await api.ingest_batch(
         directory=directory_path,
         recursive=recursive,
         depth=max_depth,
         include_only=include_patterns,
-        ignore_files=ignore_patterns
+        ignore_files=ignore_patterns,
+        concurrency=max_concurrency,
+        progress=report
     )
 
-@mcp.tool(name="list_all_docs", description="List ALL documents currently in the system. WARNING: Can be slow if there are many documents. Use get_latest_documents for better performance.")
+@mcp.tool(name="sync_directory", description="Mirror a local directory (e.g. an Obsidian vault) into the knowledge graph. Syncs only what changed since the last sync (new and modified files are upserted, documents of deleted files are removed; removal needs the upload manifest). With watch=True, keeps watching the directory in the background and applies further changes in debounced batches until stop_directory_sync is called.")
+@format_output
+async def sync_directory(
+    ctx: Context,
+    directory_path: str = Field(description="Absolute path to the directory to sync"),
+    recursive: bool = Field(description="If True, includes subdirectories", default=False),
+    max_depth: int = Field(description="Maximum subdirectory depth when recursive", default=1),
+    include_patterns: List[str] = Field(description="List of glob or regex patterns for files to include (e.g. ['*.md'])", default_factory=list),
+    ignore_patterns: List[str] = Field(description="List of glob or regex patterns for files to exclude", default_factory=list),
+    ignore_dir_patterns: List[str] = Field(description="List of glob or regex patterns for directories to skip (e.g. ['.obsidian', '.git'])", default_factory=list),
+    watch: bool = Field(description="If True, keep watching the directory in the background after the initial sync", default=False)
+) -> Any:
+    app = get_app(ctx)
+    sync = DirectorySync(
+        app.api,
+        directory_path,
+        recursive=recursive,
+        depth=max_depth,
+        include_only=include_patterns,
+        ignore_files=ignore_patterns,
+        ignore_dirs=ignore_dir_patterns
+    )
+    key = str(sync.root)
+    if key in app.syncs and not app.syncs[key][1].done():
+        raise ValueError(f"{key} is already being watched")
+    if not watch:
+        return await sync.catch_up()
+
+    task = asyncio.create_task(sync.run())
+    app.syncs[key] = (sync, task)
+    return {"directory": key, "watching": True, "mode": "polling" if sync.polling else "native events"}
+
+@mcp.tool(name="stop_directory_sync", description="Stop watching a directory started with sync_directory(watch=True) and return its sync statistics.")
+@format_output
+async def stop_directory_sync(
+    ctx: Context,
+    directory_path: str = Field(description="Directory passed to sync_directory")
+) -> Any:
+    app = get_app(ctx)
+    key = str(Path(directory_path).resolve())
+    if key not in app.syncs:
+        raise ValueError(f"{key} is not being watched")
+    sync, task = app.syncs.pop(key)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return {"directory": key, **sync.stats}
+
+@mcp.tool(name="list_all_docs", description="List ALL documents currently in the system. WARNING: Can be slow if there are many documents and is capped at 1000 documents. Use list_all_docs_paginated for larger sets, get_latest_documents for better performance, or get_document_status_counts to only count documents per status.")
 @format_output
 async def list_all_docs(ctx: Context) -> Any:
     api = await get_api(ctx)
-    return await api.get_all_documents()
+    return await api.get_all_documents(raw=True)
+
+@mcp.tool(name="list_all_docs_paginated", description="List ALL documents as compact summaries (newest first) by paging through the server with pages fetched ahead concurrently. Not capped at 1000 documents; optionally filtered by status.")
+@format_output
+async def list_all_docs_paginated(
+    ctx: Context,
+    status: Optional[str] = Field(description="Optional filter by status (e.g. 'processed', 'failed', 'pending')", default=None),
+    max_documents: Optional[int] = Field(description="Stop after this many documents (default: no limit)", default=None)
+) -> Any:
+    api = await get_api(ctx)
+    documents = []
+    pages = api.iter_documents(status_filter=status)
+    async with aclosing(pages):
+        async for doc in pages:
+            documents.append(document_summary(doc))
+            if max_documents and len(documents) >= max_documents:
+                break
+    return {"count": len(documents), "documents": documents}
 
 @mcp.tool(name="find_document", description="Check if a document exists by its filename or path. Returns a dictionary with detailed status: 'id', 'status' (processed/failed/pending), 'created_at', 'updated_at', 'content_length', 'chunks_count', and 'error_msg' if any.")
 @format_output
@@ -169,7 +391,7 @@ async def find_document(
         return doc.to_dict()
     return doc
 
-@mcp.tool(name="get_latest_documents", description="Get a paginated list of the most recently updated documents. Useful for monitoring ingestion progress.")
+@mcp.tool(name="get_latest_documents", description="Get the most recently updated documents together with the number of documents per status. Useful for monitoring ingestion progress.")
 @format_output
 async def get_latest_documents(
     ctx: Context,
@@ -179,10 +401,37 @@ async def get_latest_documents(
     api = await get_api(ctx)
     # Ensure limit is within API bounds (10-200)
     limit = max(10, min(limit, 100))
-    result = await api.get_documents_paginated(page=1, page_size=limit, sort_field="updated_at", sort_direction="desc", status_filter=status)
-    if result and hasattr(result, "to_dict"):
-        return result.to_dict()
-    return result
+    result = await api.get_documents_paginated(
+        page=1, page_size=limit, sort_field="updated_at", sort_direction="desc", status_filter=status, raw=True
+    )
+    if not isinstance(result, dict):
+        return result
+    # The page already carries the server-wide status counts
+    return {
+        "status_counts": result.get("status_counts", {}),
+        "total_count": result.get("pagination", {}).get("total_count", 0),
+        "documents": [document_summary(d) for d in result.get("documents", [])]
+    }
+
+@mcp.tool(name="get_document_status_counts", description="Get the number of documents per processing status (processed, processing, pending, failed). A cheap ingestion health check that does not list documents.")
+@format_output
+async def get_document_status_counts(ctx: Context) -> Any:
+    api = await get_api(ctx)
+    return await api.get_status_counts()
+
+@mcp.tool(name="wait_for_ingestion", description="Wait until the documents of an upload (identified by the track_id returned by ingest_text/ingest_file/upload_and_index) are processed or failed, reporting progress while waiting. Returns early with found=false if the track has no documents (unknown ID or duplicate upload). Use this instead of polling check_indexing_status or get_latest_documents.")
+@format_output
+async def wait_for_ingestion(
+    ctx: Context,
+    track_id: str = Field(description="Track ID returned when the document was uploaded or inserted"),
+    timeout_seconds: Optional[float] = Field(description="Maximum time to wait (defaults to the server's file timeout)", default=None)
+) -> Any:
+    api = await get_api(ctx)
+
+    async def report(finished: int, total: int):
+        await ctx.report_progress(finished, total, message=f"{finished}/{total} documents finished")
+
+    return await api.wait_for_track(track_id, timeout=timeout_seconds, progress=report)
 
 @mcp.tool(name="check_indexing_status", description="Check the current status of the document processing pipeline (idle or busy).")
 @format_output
@@ -198,6 +447,12 @@ async def get_graph_metadata(ctx: Context) -> Any:
     api = await get_api(ctx)
     return await api.get_labels()
 
+@mcp.tool(name="get_client_metrics", description="Report client-side metrics of this MCP server, such as query cache size, hits, misses and hit rate.")
+@format_output
+async def get_client_metrics(ctx: Context) -> Any:
+    api = await get_api(ctx)
+    return api.get_metrics()
+
 @mcp.tool(name="verify_server_health", description="Check if the LightRAG server is reachable and healthy.")
 @format_output
 async def verify_server_health(ctx: Context) -> Any:
@@ -206,110 +461,124 @@ async def verify_server_health(ctx: Context) -> Any:
 
 # --- Entity & Relationship Management ---
 
+async def run_batch_tool(
+    api: LightRAGApiClient,
+    items: List[Any],
+    func,
+    label,
+    max_concurrency: Optional[int],
+    fail_fast: bool
+) -> BatchResult:
+    """Run a per-item tool operation through the shared batch executor."""
+    # Each item is bounded by the same per-request limit used for file uploads
+    return await run_batch(
+        items,
+        func,
+        label,
+        concurrency=max_concurrency or api.settings.max_concurrency,
+        timeout=api.settings.file_timeout,
+        fail_fast=fail_fast
+    )
+
 @mcp.tool(name="create_entities", description="Manually insert specific entities into the knowledge graph.")
 @format_output
 async def create_entities(
     ctx: Context,
-    entities: List[Dict[str, Any]] = Field(description="List of entity dictionaries. Each must contain: 'name', 'type', 'description', 'source_id'")
+    entities: List[Dict[str, Any]] = Field(description="List of entity dictionaries. Each must contain: 'name', 'type', 'description', 'source_id'"),
+    max_concurrency: Optional[int] = Field(description="Maximum number of items processed in parallel (defaults to the server setting)", default=None),
+    fail_fast: bool = Field(description="Stop starting new items after the first failure; the rest are reported as skipped", default=False)
 ) -> Any:
     api = await get_api(ctx)
-    results = []
-    for e in entities:
-        try:
-            res = await api.create_entity(
-                name=str(e['name']), 
-                type=str(e['type']), 
-                description=str(e['description']), 
-                source_id=str(e['source_id'])
-            )
-            results.append({"name": e['name'], "status": "ok", "data": res})
-        except Exception as err:
-            results.append({"name": e.get('name', 'unknown'), "status": "fail", "error": str(err)})
-    
-    return BatchResult(
-        total=len(entities),
-        successful=sum(1 for r in results if r['status'] == 'ok'),
-        failed=sum(1 for r in results if r['status'] == 'fail'),
-        results=results
+
+    async def create(e: Dict[str, Any]):
+        return await api.create_entity(
+            name=str(e['name']),
+            type=str(e['type']),
+            description=str(e['description']),
+            source_id=str(e['source_id'])
+        )
+
+    return await run_batch_tool(
+        api, entities, create, lambda e: {"name": e.get('name', 'unknown')}, max_concurrency, fail_fast
     )
 
 @mcp.tool(name="remove_entities", description="Delete one or more specific entities from the knowledge graph by name.")
 @format_output
 async def remove_entities(
     ctx: Context,
-    names: List[str] = Field(description="List of entity names to delete")
+    names: List[str] = Field(description="List of entity names to delete"),
+    max_concurrency: Optional[int] = Field(description="Maximum number of items processed in parallel (defaults to the server setting)", default=None),
+    fail_fast: bool = Field(description="Stop starting new items after the first failure; the rest are reported as skipped", default=False)
 ) -> Any:
     api = await get_api(ctx)
-    results = []
-    for name in names:
-        try:
-            res = await api.delete_entity(name)
-            results.append({"name": name, "status": "ok", "data": res})
-        except Exception as err:
-            results.append({"name": name, "status": "fail", "error": str(err)})
-    return results
+    return await run_batch_tool(
+        api, names, api.delete_entity, lambda name: {"name": name}, max_concurrency, fail_fast
+    )
 
-@mcp.tool(name="purge_by_document", description="Remove all entities and relationships associated with specific document IDs from the graph.")
+@mcp.tool(name="purge_by_document", description="Remove all entities and relationships associated with specific document IDs from the graph. IDs are deleted in multi-id requests; the server reports one outcome per request, which is repeated for every ID it contained.")
 @format_output
 async def purge_by_document(
     ctx: Context,
-    doc_ids: List[str] = Field(description="List of document IDs (e.g., from find_document) to prune from the graph")
+    doc_ids: List[str] = Field(description="List of document IDs (e.g., from find_document) to prune from the graph"),
+    delete_file: bool = Field(description="Also delete the uploaded source files on the server", default=False),
+    delete_llm_cache: bool = Field(description="Also delete the cached LLM extraction results for these documents", default=False),
+    batch_size: Optional[int] = Field(description="Maximum number of document IDs per deletion request (defaults to the server setting)", default=None)
 ) -> Any:
     api = await get_api(ctx)
-    results = []
-    for doc_id in doc_ids:
-        try:
-            res = await api.delete_by_doc(doc_id)
-            results.append({"id": doc_id, "status": "ok", "data": res})
-        except Exception as err:
-            results.append({"id": doc_id, "status": "fail", "error": str(err)})
-    return results
+    return await api.delete_documents(
+        doc_ids,
+        delete_file=delete_file,
+        delete_llm_cache=delete_llm_cache,
+        batch_size=batch_size
+    )
 
 @mcp.tool(name="modify_entities", description="Update the properties (type, description, source_id) of existing entities.")
 @format_output
 async def modify_entities(
     ctx: Context,
-    entities: List[Dict[str, Any]] = Field(description="List of dictionaries with updated entity fields. Must include 'name'. Optional: 'type', 'description', 'source_id'")
+    entities: List[Dict[str, Any]] = Field(description="List of dictionaries with updated entity fields. Must include 'name'. Optional: 'type', 'description', 'source_id'"),
+    max_concurrency: Optional[int] = Field(description="Maximum number of items processed in parallel (defaults to the server setting)", default=None),
+    fail_fast: bool = Field(description="Stop starting new items after the first failure; the rest are reported as skipped", default=False)
 ) -> Any:
     api = await get_api(ctx)
-    results = []
-    for e in entities:
-        try:
-            res = await api.edit_entity(
-                name=str(e['name']),
-                type=str(e['type']),
-                description=str(e['description']),
-                source_id=str(e['source_id'])
-            )
-            results.append({"name": e['name'], "status": "ok", "data": res})
-        except Exception as err:
-            results.append({"name": e['name'], "status": "fail", "error": str(err)})
-    return results
+
+    async def modify(e: Dict[str, Any]):
+        return await api.edit_entity(
+            name=str(e['name']),
+            type=str(e['type']),
+            description=str(e['description']),
+            source_id=str(e['source_id'])
+        )
+
+    return await run_batch_tool(
+        api, entities, modify, lambda e: {"name": e.get('name', 'unknown')}, max_concurrency, fail_fast
+    )
 
 @mcp.tool(name="connect_entities", description="Define or update relationships between entities, including edge weights and descriptions.")
 @format_output
 async def connect_entities(
     ctx: Context,
-    relations: List[Dict[str, Any]] = Field(description="List of relationship definitions. Required: 'source', 'target'. Optional: 'description', 'keywords', 'weight', 'type', 'edit_mode'")
+    relations: List[Dict[str, Any]] = Field(description="List of relationship definitions. Required: 'source', 'target'. Optional: 'description', 'keywords', 'weight', 'type', 'edit_mode'"),
+    max_concurrency: Optional[int] = Field(description="Maximum number of items processed in parallel (defaults to the server setting)", default=None),
+    fail_fast: bool = Field(description="Stop starting new items after the first failure; the rest are reported as skipped", default=False)
 ) -> Any:
     api = await get_api(ctx)
-    results = []
-    for r in relations:
-        try:
-            res = await api.manage_relation(
-                source=str(r['source']),
-                target=str(r['target']),
-                description=str(r['description']),
-                keywords=str(r['keywords']),
-                relation_type=r.get('type'),
-                source_id=r.get('source_id'),
-                weight=r.get('weight'),
-                is_edit=bool(r.get('edit_mode', False))
-            )
-            results.append({"rel": f"{r['source']}->{r['target']}", "status": "ok", "data": res})
-        except Exception as err:
-            results.append({"rel": f"{r.get('source')}->{r.get('target')}", "status": "fail", "error": str(err)})
-    return results
+
+    async def connect(r: Dict[str, Any]):
+        return await api.manage_relation(
+            source=str(r['source']),
+            target=str(r['target']),
+            description=str(r['description']),
+            keywords=str(r['keywords']),
+            relation_type=r.get('type'),
+            source_id=r.get('source_id'),
+            weight=r.get('weight'),
+            is_edit=bool(r.get('edit_mode', False))
+        )
+
+    return await run_batch_tool(
+        api, relations, connect, lambda r: {"rel": f"{r.get('source')}->{r.get('target')}"}, max_concurrency, fail_fast
+    )
 
 @mcp.tool(name="unify_entities", description="Merge multiple source entities into a single target entity to resolve duplicates or synonyms.")
 @format_output
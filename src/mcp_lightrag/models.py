@@ -3,7 +3,7 @@ Data models and type definitions for LightRAG MCP server.
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 @dataclass(frozen=True)
 class ServerSettings:
@@ -11,11 +11,60 @@ class ServerSettings:
     host: str = "localhost"
     port: int = 9621
     api_key: str = ""
+    max_concurrency: int = 8
+    file_timeout: float = 300.0
+    doc_index_ttl: float = 300.0
+    manifest_path: Optional[str] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 300.0
+    write_timeout: float = 60.0
+    pool_timeout: float = 30.0
+    http2: bool = False
+    retry_max_attempts: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 30.0
+    retry_budget_ratio: float = 0.2
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    query_cache_size: int = 256
+    query_cache_ttl: float = 300.0
+    delete_batch_size: int = 500
+    page_prefetch: int = 4
+    stream_upload_threshold: int = 8 * 1024 * 1024
+    upload_chunk_size: int = 1024 * 1024
+    sync_debounce: float = 2.0
+    sync_poll_interval: float = 5.0
+    transport: str = "stdio"
+    bind: str = "127.0.0.1:8000"
+    workers: int = 1
+    broker_socket: Optional[str] = None
+    broker_max_inflight: int = 64
+    # Replica URLs; the first is the primary that receives all writes
+    endpoints: Tuple[str, ...] = ()
+    health_probe_interval: float = 10.0
+    # Instances holding separate parts of the corpus, as "[name=]url"; queries fan out to all of them
+    shards: Tuple[str, ...] = ()
+    shard_timeout: float = 20.0
     
     @property
     def base_url(self) -> str:
+        if self.endpoints:
+            return self.endpoints[0].rstrip("/")
         return f"http://{self.host}:{self.port}"
 
+@dataclass(frozen=True)
+class ManifestEntry:
+    """State of a local file as of its last upload."""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    doc_id: Optional[str] = None
+    track_id: Optional[str] = None
+
 @dataclass
 class QueryParams:
     """Parameters for document queries."""
@@ -32,6 +81,16 @@ class QueryParams:
     ll_keywords: List[str] = field(default_factory=list)
     history_turns: int = 10
 
+@dataclass(frozen=True)
+class ContextProjection:
+    """Limits applied to structured retrieval results before returning them to an agent."""
+    max_entities: Optional[int] = 20
+    max_relationships: Optional[int] = 20
+    max_chunks: Optional[int] = 5
+    include_chunk_content: bool = False
+    max_chunk_length: Optional[int] = 1000
+    max_description_length: Optional[int] = 300
+
 @dataclass
 class OperationResult:
     """Standardized response for API operations."""
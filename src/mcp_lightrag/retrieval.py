@@ -0,0 +1,66 @@
+"""
+Helpers for shaping structured retrieval results from /query/data.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .models import ContextProjection
+
+# Bulky fields that are of no use to an agent reading the context
+_DROPPED_FIELDS = {
+    "entities": {"source_id", "created_at"},
+    "relationships": {"source_id", "created_at"},
+    "chunks": set(),
+}
+
+
+def _truncate(text: Any, limit: Optional[int]) -> Any:
+    if limit is None or not isinstance(text, str) or len(text) <= limit:
+        return text
+    return text[:limit].rstrip() + "…"
+
+
+def _project_items(items: List[Dict[str, Any]], kind: str, limit: Optional[int],
+                   projection: ContextProjection) -> List[Dict[str, Any]]:
+    dropped = _DROPPED_FIELDS[kind]
+    projected = []
+    for item in items[:limit] if limit is not None else items:
+        item = {k: v for k, v in item.items() if k not in dropped}
+        if "description" in item:
+            item["description"] = _truncate(item["description"], projection.max_description_length)
+        if kind == "chunks":
+            if projection.include_chunk_content:
+                item["content"] = _truncate(item.get("content"), projection.max_chunk_length)
+            else:
+                item.pop("content", None)
+        projected.append(item)
+    return projected
+
+
+def project_query_data(payload: Dict[str, Any], projection: ContextProjection) -> Dict[str, Any]:
+    """
+    Reduce a /query/data payload to what fits an agent's token budget: the top
+    entities, relationships and chunks, truncated descriptions, optional chunk
+    text, and only the references still cited by the kept items.
+    """
+    data = payload.get("data") or {}
+    entities = _project_items(data.get("entities") or [], "entities", projection.max_entities, projection)
+    relationships = _project_items(data.get("relationships") or [], "relationships",
+                                   projection.max_relationships, projection)
+    chunks = _project_items(data.get("chunks") or [], "chunks", projection.max_chunks, projection)
+
+    cited = {item.get("reference_id") for item in entities + relationships + chunks}
+    references = [ref for ref in data.get("references") or [] if ref.get("reference_id") in cited]
+
+    metadata = payload.get("metadata") or {}
+    return {
+        "status": payload.get("status"),
+        "message": payload.get("message"),
+        "data": {
+            "entities": entities,
+            "relationships": relationships,
+            "chunks": chunks,
+            "references": references,
+        },
+        "metadata": {k: v for k, v in metadata.items() if k in ("query_mode", "keywords", "processing_info")},
+    }
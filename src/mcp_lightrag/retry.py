@@ -0,0 +1,164 @@
+"""
+Retry policy for LightRAG API calls: idempotency classes, full-jitter backoff,
+Retry-After handling and a client-wide retry budget.
+"""
+
+import asyncio
+import enum
+import logging
+import random
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from .client.light_rag_server_api_client.errors import UnexpectedStatus
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses that signal a transient server condition
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Statuses that guarantee the server did not process the request
+REJECTED_STATUSES = frozenset({429, 503})
+# Statuses raised from the response hook so their headers reach the retry loop
+HOOKED_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class Idempotency(enum.Enum):
+    """How safely an operation may be repeated."""
+    SAFE = "safe"          # Reads: retry on any transient failure
+    GUARDED = "guarded"    # Writes: retry only if the request was never processed
+
+
+class RetryableStatus(Exception):
+    """Raised for transient HTTP statuses, carrying the server's Retry-After hint."""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None, content: bytes = b""):
+        super().__init__(f"Transient status code: {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.content = content
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+async def raise_for_retryable_status(response: httpx.Response):
+    """httpx response hook turning transient statuses into RetryableStatus."""
+    if response.status_code in HOOKED_STATUSES:
+        raise RetryableStatus(
+            response.status_code,
+            retry_after=parse_retry_after(response.headers.get("Retry-After"))
+        )
+
+
+def is_retryable(error: BaseException, idempotency: Idempotency) -> bool:
+    """Decide whether an error may be retried for an operation of the given class."""
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        # The request never reached the server
+        return True
+    if isinstance(error, RetryableStatus):
+        if idempotency is Idempotency.SAFE:
+            return True
+        return error.status_code in REJECTED_STATUSES
+    if isinstance(error, UnexpectedStatus):
+        if idempotency is Idempotency.SAFE:
+            return error.status_code in RETRYABLE_STATUSES
+        return error.status_code in REJECTED_STATUSES
+    if isinstance(error, (httpx.TimeoutException, httpx.RemoteProtocolError, httpx.ReadError)):
+        # The server may have processed the request already
+        return idempotency is Idempotency.SAFE
+    return False
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff parameters shared by every retried operation."""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before retry number `attempt` (0-based): full jitter over an
+        exponentially growing window, or the server's Retry-After if given.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class RetryBudget:
+    """
+    Client-wide token bucket limiting retries to a fraction of traffic.
+
+    Every request deposits `ratio` tokens and every retry spends one, so during
+    an outage retries stay around `ratio` of the request rate instead of
+    multiplying it.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min_tokens
+
+    def record_request(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[T]],
+    name: str,
+    policy: RetryPolicy,
+    idempotency: Idempotency = Idempotency.SAFE,
+    budget: Optional[RetryBudget] = None
+) -> T:
+    """Await `func()` and retry it according to the policy, idempotency class and budget."""
+    if budget is not None:
+        budget.record_request()
+
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as e:
+            attempt += 1
+            if not is_retryable(e, idempotency):
+                raise
+            if attempt >= policy.max_attempts:
+                logger.error(f"All {policy.max_attempts} attempts failed for {name}")
+                raise
+            if budget is not None and not budget.try_spend():
+                logger.warning(f"Retry budget exhausted, not retrying {name}")
+                raise
+            delay = policy.backoff(attempt - 1, getattr(e, "retry_after", None))
+            logger.warning(
+                f"Attempt {attempt} failed for {name}: {str(e)}. "
+                f"Retrying in {delay:.2f}s..."
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,187 @@
+"""
+Directory scanning for batch ingestion: os.scandir walks run in a worker
+thread and hand files to the event loop as they are found.
+"""
+
+import asyncio
+import fnmatch
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import AsyncGenerator, Callable, Iterable, Iterator, List, Optional, Pattern, Union
+
+from .exceptions import ResourceNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Syntax that only makes sense in a regular expression
+_REGEX_ONLY = re.compile(r"[\\^$+(){}|]|\.[*+?]")
+
+
+def _pattern_regex(pattern: str) -> str:
+    """
+    Translate one filter pattern into a regex fragment matched against file names.
+
+    `glob:` and `re:` prefixes force the pattern type. Otherwise a pattern
+    that is not a valid regex, or that uses `*`, `?` or `[...]` without any
+    regex-only syntax (anchors, escapes, groups, `.*`), is a glob matching the
+    whole name; anything else is a regex searched anywhere in the name.
+    """
+    if pattern.startswith("glob:"):
+        return "^" + fnmatch.translate(pattern[5:])
+    if pattern.startswith("re:"):
+        return pattern[3:]
+    try:
+        re.compile(pattern)
+    except re.error:
+        return "^" + fnmatch.translate(pattern)
+    if not _REGEX_ONLY.search(pattern) and any(c in pattern for c in "*?["):
+        return "^" + fnmatch.translate(pattern)
+    return pattern
+
+
+def compile_patterns(patterns: Optional[Iterable[str]]) -> Optional[Pattern]:
+    """Combine glob/regex patterns into a single precompiled alternation (None if empty)."""
+    parts = [_pattern_regex(p) for p in patterns or [] if p]
+    if not parts:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in parts))
+
+
+def _name_filter(include_only: Optional[List[str]], ignore_files: Optional[List[str]]) -> Callable[[str], bool]:
+    """Return a predicate on file names; include patterns take precedence over ignore patterns."""
+    include_re = compile_patterns(include_only)
+    if include_re is not None:
+        return lambda name: include_re.search(name) is not None
+    ignore_re = compile_patterns(ignore_files)
+    if ignore_re is not None:
+        return lambda name: ignore_re.search(name) is None
+    return lambda name: True
+
+
+def walk_files(
+    directory: Union[str, Path],
+    recursive: bool = False,
+    depth: int = 1,
+    include_only: Optional[List[str]] = None,
+    ignore_files: Optional[List[str]] = None,
+    ignore_dirs: Optional[List[str]] = None,
+    stop: Optional[threading.Event] = None
+) -> Iterator[Path]:
+    """
+    Yield the files of a directory that pass the include/ignore filters.
+
+    Include patterns take precedence over ignore patterns. Subdirectories are
+    entered up to `depth` levels when `recursive` is set. Each entry costs at
+    most the stat calls os.scandir cannot answer from the directory listing.
+    """
+    name_ok = _name_filter(include_only, ignore_files)
+    ignore_dir_re = compile_patterns(ignore_dirs)
+
+    pending = [(os.fspath(directory), 0)]
+    while pending:
+        current, current_depth = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if stop is not None and stop.is_set():
+                        return
+                    try:
+                        if entry.is_dir():
+                            if recursive and current_depth < depth and not (
+                                ignore_dir_re and ignore_dir_re.search(entry.name)
+                            ):
+                                pending.append((entry.path, current_depth + 1))
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    if name_ok(entry.name):
+                        yield Path(entry.path)
+        except OSError as e:
+            logger.warning(f"Cannot scan {current}: {str(e)}")
+
+
+def path_filter(
+    directory: Union[str, Path],
+    recursive: bool = False,
+    depth: int = 1,
+    include_only: Optional[List[str]] = None,
+    ignore_files: Optional[List[str]] = None,
+    ignore_dirs: Optional[List[str]] = None
+) -> Callable[[Path], bool]:
+    """Return a predicate telling whether walk_files with these arguments would list a file path."""
+    root = Path(directory)
+    name_ok = _name_filter(include_only, ignore_files)
+    ignore_dir_re = compile_patterns(ignore_dirs)
+    max_dirs = depth if recursive else 0
+
+    def matches(path: Path) -> bool:
+        try:
+            *dirs, name = Path(path).relative_to(root).parts
+        except ValueError:
+            return False
+        if len(dirs) > max_dirs:
+            return False
+        if ignore_dir_re is not None and any(ignore_dir_re.search(d) for d in dirs):
+            return False
+        return name_ok(name)
+
+    return matches
+
+
+def check_directory(directory: Union[str, Path]) -> Path:
+    dir_path = Path(directory)
+    if not dir_path.is_dir():
+        raise ResourceNotFoundError(f"Directory not found: {directory}")
+    return dir_path
+
+
+async def scan_files(
+    directory: Union[str, Path],
+    recursive: bool = False,
+    depth: int = 1,
+    include_only: Optional[List[str]] = None,
+    ignore_files: Optional[List[str]] = None,
+    ignore_dirs: Optional[List[str]] = None
+) -> AsyncGenerator[Path, None]:
+    """
+    Asynchronously yield matching files while a worker thread is still
+    scanning, so callers can start processing before the walk finishes.
+    """
+    dir_path = check_directory(directory)
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue" = asyncio.Queue()
+    stop = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            for path in walk_files(dir_path, recursive, depth, include_only, ignore_files, ignore_dirs, stop):
+                loop.call_soon_threadsafe(queue.put_nowait, path)
+            item = done
+        except BaseException as e:
+            item = e
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            pass  # The event loop is already closed
+
+    producer = loop.run_in_executor(None, produce)
+    count = 0
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            count += 1
+            yield item
+        logger.info(f"Found {count} files in {directory}")
+    finally:
+        stop.set()
+        await asyncio.shield(producer)
@@ -2,18 +2,76 @@
 Settings management for the LightRAG MCP server.
 """
 
+import hashlib
 import os
+from dataclasses import replace
+from pathlib import Path
 from .models import ServerSettings
 
+DEFAULT_MANIFEST_PATH = str(Path.home() / ".cache" / "mcp-lightrag" / "manifest.sqlite3")
+BROKER_SOCKET_DIR = Path.home() / ".cache" / "mcp-lightrag"
+# LIGHTRAG_BROKER_SOCKET value selecting default_broker_socket() of the configured server
+BROKER_SOCKET_AUTO = "auto"
+
+def default_broker_socket(base_url: str) -> str:
+    """Broker socket of one LightRAG server, so servers for different hosts never share a broker."""
+    digest = hashlib.sha256(base_url.rstrip("/").encode()).hexdigest()[:16]
+    return str(BROKER_SOCKET_DIR / f"broker-{digest}.sock")
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
 def get_settings() -> ServerSettings:
     """
     Retrieve settings from environment variables with defaults.
     """
-    return ServerSettings(
+    settings = ServerSettings(
         host=os.environ.get("LIGHTRAG_HOST", "localhost"),
         port=int(os.environ.get("LIGHTRAG_PORT", 9621)),
-        api_key=os.environ.get("LIGHTRAG_API_KEY", "")
+        api_key=os.environ.get("LIGHTRAG_API_KEY", ""),
+        max_concurrency=int(os.environ.get("LIGHTRAG_MAX_CONCURRENCY", 8)),
+        file_timeout=float(os.environ.get("LIGHTRAG_FILE_TIMEOUT", 300.0)),
+        doc_index_ttl=float(os.environ.get("LIGHTRAG_DOC_INDEX_TTL", 300.0)),
+        manifest_path=os.environ.get("LIGHTRAG_MANIFEST_PATH", DEFAULT_MANIFEST_PATH) or None,
+        max_connections=int(os.environ.get("LIGHTRAG_MAX_CONNECTIONS", 100)),
+        max_keepalive_connections=int(os.environ.get("LIGHTRAG_MAX_KEEPALIVE_CONNECTIONS", 20)),
+        keepalive_expiry=float(os.environ.get("LIGHTRAG_KEEPALIVE_EXPIRY", 30.0)),
+        connect_timeout=float(os.environ.get("LIGHTRAG_CONNECT_TIMEOUT", 10.0)),
+        read_timeout=float(os.environ.get("LIGHTRAG_READ_TIMEOUT", 300.0)),
+        write_timeout=float(os.environ.get("LIGHTRAG_WRITE_TIMEOUT", 60.0)),
+        pool_timeout=float(os.environ.get("LIGHTRAG_POOL_TIMEOUT", 30.0)),
+        http2=_env_bool("LIGHTRAG_HTTP2", False),
+        retry_max_attempts=int(os.environ.get("LIGHTRAG_RETRY_MAX_ATTEMPTS", 3)),
+        retry_base_delay=float(os.environ.get("LIGHTRAG_RETRY_BASE_DELAY", 0.5)),
+        retry_max_delay=float(os.environ.get("LIGHTRAG_RETRY_MAX_DELAY", 30.0)),
+        retry_budget_ratio=float(os.environ.get("LIGHTRAG_RETRY_BUDGET_RATIO", 0.2)),
+        circuit_failure_threshold=int(os.environ.get("LIGHTRAG_CIRCUIT_FAILURE_THRESHOLD", 5)),
+        circuit_reset_timeout=float(os.environ.get("LIGHTRAG_CIRCUIT_RESET_TIMEOUT", 30.0)),
+        query_cache_size=int(os.environ.get("LIGHTRAG_QUERY_CACHE_SIZE", 256)),
+        query_cache_ttl=float(os.environ.get("LIGHTRAG_QUERY_CACHE_TTL", 300.0)),
+        delete_batch_size=int(os.environ.get("LIGHTRAG_DELETE_BATCH_SIZE", 500)),
+        page_prefetch=int(os.environ.get("LIGHTRAG_PAGE_PREFETCH", 4)),
+        stream_upload_threshold=int(os.environ.get("LIGHTRAG_STREAM_UPLOAD_THRESHOLD", 8 * 1024 * 1024)),
+        upload_chunk_size=int(os.environ.get("LIGHTRAG_UPLOAD_CHUNK_SIZE", 1024 * 1024)),
+        sync_debounce=float(os.environ.get("LIGHTRAG_SYNC_DEBOUNCE", 2.0)),
+        sync_poll_interval=float(os.environ.get("LIGHTRAG_SYNC_POLL_INTERVAL", 5.0)),
+        transport=os.environ.get("LIGHTRAG_MCP_TRANSPORT", "stdio"),
+        bind=os.environ.get("LIGHTRAG_MCP_BIND", "127.0.0.1:8000"),
+        workers=int(os.environ.get("LIGHTRAG_MCP_WORKERS", 1)),
+        broker_socket=os.environ.get("LIGHTRAG_BROKER_SOCKET") or None,
+        broker_max_inflight=int(os.environ.get("LIGHTRAG_BROKER_MAX_INFLIGHT", 64)),
+        endpoints=tuple(url.strip() for url in os.environ.get("LIGHTRAG_ENDPOINTS", "").split(",") if url.strip()),
+        health_probe_interval=float(os.environ.get("LIGHTRAG_HEALTH_PROBE_INTERVAL", 10.0)),
+        shards=tuple(spec.strip() for spec in os.environ.get("LIGHTRAG_SHARDS", "").split(",") if spec.strip()),
+        shard_timeout=float(os.environ.get("LIGHTRAG_SHARD_TIMEOUT", 20.0))
     )
+    # The broker is opt-in: without a socket every request goes to LightRAG directly
+    if settings.broker_socket == BROKER_SOCKET_AUTO:
+        settings = replace(settings, broker_socket=default_broker_socket(settings.base_url))
+    return settings
 
 # Default configuration instance
 DEFAULT_SETTINGS = get_settings()
@@ -0,0 +1,199 @@
+"""
+Scatter-gather queries over several LightRAG instances (shards), each
+holding part of the corpus, e.g. one per business unit.
+
+Queries go to every shard at once and each shard gets the same deadline;
+shards that fail or miss it are reported and left out instead of holding up
+the answer. Structured results (/query/data) are merged into one: entities
+are deduplicated by name and relationships by their (undirected) endpoints,
+and all lists are ranked by reciprocal-rank fusion of the shards' rankings.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Coroutine, Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .api_client import LightRAGApiClient
+from .endpoints import api_models
+from .exceptions import APIConnectionError, APIResponseError, ConfigurationError
+from .models import ContextProjection, ServerSettings
+from .retrieval import project_query_data
+
+logger = logging.getLogger(__name__)
+
+# Damping constant of reciprocal-rank fusion (Cormack et al.): score = sum of 1 / (k + rank)
+RRF_K = 60
+
+FUSED_KINDS = ("entities", "relationships", "chunks")
+
+
+@dataclass
+class Shard:
+    name: str
+    client: LightRAGApiClient
+
+
+def parse_shard(spec: str) -> Tuple[str, str]:
+    """Split a `name=url` shard spec; without a name, the URL's host:port names the shard."""
+    name, sep, url = spec.partition("=")
+    if not sep:
+        name, url = "", spec
+    name, url = name.strip(), url.strip().rstrip("/")
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ConfigurationError(f"Invalid shard '{spec}': expected [name=]http(s)://host:port")
+    return name or parts.netloc, url
+
+
+def _item_key(kind: str, item: Dict[str, Any]) -> Optional[Hashable]:
+    if kind == "entities":
+        return item.get("entity_name")
+    if kind == "relationships":
+        if item.get("src_id") is None or item.get("tgt_id") is None:
+            return None
+        return tuple(sorted((str(item["src_id"]), str(item["tgt_id"]))))
+    return item.get("chunk_id") or item.get("content")
+
+
+def fuse_query_data(results: Sequence[Tuple[str, Dict[str, Any]]], k: int = RRF_K) -> Dict[str, Any]:
+    """
+    Merge the /query/data payloads of several shards, given as (shard name,
+    payload) pairs in shard order.
+
+    Each entity, relationship and chunk scores 1 / (k + rank) for every shard
+    that returned it, and the fused lists are sorted by that score. Duplicates
+    keep the fields of their best-ranked copy and are tagged with its shard.
+    Reference IDs are only unique within a shard, so they are renumbered.
+    """
+    data: Dict[str, List[Dict[str, Any]]] = {}
+    references: List[Dict[str, Any]] = []
+    reference_ids: Dict[Tuple[str, Any], str] = {}
+    shard_refs = {
+        shard: {ref.get("reference_id"): ref for ref in (payload.get("data") or {}).get("references") or []}
+        for shard, payload in results
+    }
+
+    def renumber(shard: str, reference_id: Any) -> Any:
+        if reference_id is None:
+            return None
+        if (shard, reference_id) not in reference_ids:
+            new_id = str(len(reference_ids) + 1)
+            reference_ids[shard, reference_id] = new_id
+            ref = shard_refs[shard].get(reference_id)
+            if ref is not None:
+                references.append(dict(ref, reference_id=new_id, shard=shard))
+        return reference_ids[shard, reference_id]
+
+    for kind in FUSED_KINDS:
+        scores: Dict[Hashable, float] = {}
+        best: Dict[Hashable, Tuple[int, str, Dict[str, Any]]] = {}
+        for shard, payload in results:
+            for rank, item in enumerate((payload.get("data") or {}).get(kind) or [], start=1):
+                key = _item_key(kind, item)
+                if key is None:
+                    key = (shard, kind, rank)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+                if key not in best or rank < best[key][0]:
+                    best[key] = (rank, shard, item)
+        fused = []
+        # sorted() is stable, so ties keep shard order
+        for key in sorted(scores, key=lambda key: -scores[key]):
+            _, shard, item = best[key]
+            item = dict(item, shard=shard, score=round(scores[key], 6))
+            if "reference_id" in item:
+                item["reference_id"] = renumber(shard, item["reference_id"])
+            fused.append(item)
+        data[kind] = fused
+    data["references"] = references
+
+    metadata = dict((results[0][1].get("metadata") or {}) if results else {})
+    metadata["shards"] = [shard for shard, _ in results]
+    return {
+        "status": "success",
+        "message": f"Merged results of {len(results)} shard(s)",
+        "data": data,
+        "metadata": metadata,
+    }
+
+
+class ShardedClient:
+    """Fans read-only queries out to every shard and merges what arrives in time."""
+
+    def __init__(self, settings: ServerSettings):
+        self.timeout = settings.shard_timeout
+        self.shards: List[Shard] = []
+        for spec in settings.shards:
+            name, url = parse_shard(spec)
+            # Shards are queried only; uploads keep going to the main server. A broker
+            # forwards to a single server, so shards are always connected to directly.
+            shard_settings = replace(settings, endpoints=(url,), shards=(), manifest_path=None, broker_socket=None)
+            self.shards.append(Shard(name, LightRAGApiClient(shard_settings)))
+        names = [shard.name for shard in self.shards]
+        if len(set(names)) != len(names):
+            raise ConfigurationError(f"Shard names must be unique: {', '.join(names)}")
+
+    async def gather(
+        self, call: Callable[[LightRAGApiClient], Coroutine[Any, Any, Any]]
+    ) -> Tuple[List[Tuple[str, Any]], Dict[str, str]]:
+        """
+        Run `call` against every shard concurrently. Returns the results of the
+        shards that answered within the deadline, in shard order, and the
+        reason each other shard was dropped.
+        """
+        tasks: Dict[asyncio.Task, Shard] = {asyncio.create_task(call(shard.client)): shard for shard in self.shards}
+        done, pending = await asyncio.wait(tasks, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+            # Do not wait for the cancellation to finish, only retrieve its outcome
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        results: List[Tuple[str, Any]] = []
+        dropped: Dict[str, str] = {}
+        for task, shard in tasks.items():
+            if task in pending:
+                dropped[shard.name] = f"no answer within {self.timeout:g}s"
+            elif task.exception() is not None:
+                dropped[shard.name] = str(task.exception()) or type(task.exception()).__name__
+            else:
+                results.append((shard.name, task.result()))
+        if dropped:
+            logger.warning(f"Dropped shards: {dropped}")
+        if not results:
+            raise APIConnectionError(f"No shard answered: {dropped}")
+        return results, dropped
+
+    async def query(self, params: Any) -> Dict[str, Any]:
+        """Ask every shard the same question; their answers are returned side by side."""
+        async def answer(client: LightRAGApiClient) -> Dict[str, Any]:
+            result = await client.query(params)
+            if not isinstance(result, api_models.QueryResponse):
+                raise APIResponseError(f"Unexpected answer: {type(result).__name__}")
+            return result.to_dict()
+
+        results, dropped = await self.gather(answer)
+        return {
+            "responses": [{"shard": shard, **result} for shard, result in results],
+            "dropped_shards": dropped,
+        }
+
+    async def query_data(self, params: Any, projection: Optional[ContextProjection] = None) -> Dict[str, Any]:
+        """Retrieve structured context from every shard and fuse it into one ranked result."""
+        async def retrieve(client: LightRAGApiClient) -> Dict[str, Any]:
+            payload = await client.query_data(params)
+            if not isinstance(payload, dict) or payload.get("status") == "failure":
+                raise APIResponseError("Unexpected /query/data payload")
+            return payload
+
+        results, dropped = await self.gather(retrieve)
+        fused = fuse_query_data(results)
+        if projection is not None:
+            shards = fused["metadata"]["shards"]
+            fused = project_query_data(fused, projection)
+            fused["metadata"]["shards"] = shards
+        fused["metadata"]["dropped_shards"] = dropped
+        return fused
+
+    async def close(self):
+        await asyncio.gather(*(shard.client.close() for shard in self.shards))
@@ -0,0 +1,217 @@
+"""
+Incremental directory sync: mirror a local directory (e.g. an Obsidian
+vault) into LightRAG by watching it for changes.
+
+Change events come from `watchfiles` (inotify, FSEvents, ...) when it is
+installed and from periodic os.scandir snapshots otherwise. Bursts of events
+are debounced and applied as one batched upsert plus one batched deletion.
+The upload manifest doubles as the checkpoint: on start-up only files whose
+size or mtime differ from their manifest entry are upserted, and manifest
+entries without a file are deleted, so a restart does not re-sync everything.
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .api_client import LightRAGApiClient
+from .scanner import check_directory, path_filter, walk_files
+
+try:
+    import watchfiles  # type: ignore[import-not-found]
+except ImportError:  # Optional, see the "watch" extra
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+# A steady stream of events is flushed at least this often (seconds)
+MAX_BATCH_DELAY = 30.0
+
+FileState = Tuple[int, int]
+
+
+class DirectorySync:
+    """Keeps the documents of one directory in sync with the LightRAG server."""
+
+    def __init__(
+        self,
+        api: LightRAGApiClient,
+        directory: Union[str, Path],
+        recursive: bool = False,
+        depth: int = 1,
+        include_only: Optional[List[str]] = None,
+        ignore_files: Optional[List[str]] = None,
+        ignore_dirs: Optional[List[str]] = None,
+        debounce: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        force_polling: bool = False
+    ):
+        self.api = api
+        self.root = check_directory(directory).resolve()
+        self.recursive = recursive
+        self.depth = depth
+        self.filters = (include_only, ignore_files, ignore_dirs)
+        self.matches = path_filter(self.root, recursive, depth, include_only, ignore_files, ignore_dirs)
+        self.debounce = api.settings.sync_debounce if debounce is None else debounce
+        self.poll_interval = poll_interval or api.settings.sync_poll_interval
+        self.polling = force_polling or watchfiles is None
+        self.stats: Dict[str, Any] = {"batches": 0, "upserted": 0, "deleted": 0, "failed": 0, "last_sync": None}
+
+    def _walk(self) -> Iterable[Path]:
+        return walk_files(self.root, self.recursive, self.depth, *self.filters)
+
+    def _snapshot(self) -> Dict[str, FileState]:
+        """Size and mtime of every matching file, keyed like the manifest."""
+        snapshot = {}
+        for path in self._walk():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[str(path.resolve())] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    async def catch_up(self) -> Dict[str, Any]:
+        """Sync the changes made since the last checkpoint (the upload manifest)."""
+        current = await asyncio.to_thread(self._snapshot)
+        manifest = self.api.manifest
+        if manifest is None:
+            logger.warning("Upload manifest disabled: every file is checked against the server on start-up")
+            return await self.apply(current, [])
+
+        synced = manifest.entries_under(str(self.root))
+        changed = [
+            path for path, state in current.items()
+            if path not in synced or (synced[path].size, synced[path].mtime_ns) != state
+        ]
+        removed = [path for path in synced if path not in current and self.matches(Path(path))]
+        logger.info(f"Sync of {self.root}: {len(changed)} changed and {len(removed)} removed files since the last run")
+        return await self.apply(changed, removed)
+
+    def _classify(self, paths: Iterable[Path]) -> Tuple[Set[str], Set[str]]:
+        """Split changed paths into files to upsert and (file or directory) paths that are gone."""
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+        for path in paths:
+            if path.is_dir():
+                # A directory moved in or out only produces one event for itself
+                changed.update(str(p) for p in walk_files(path, True, self.depth) if self.matches(p))
+            elif path.is_file():
+                if self.matches(path):
+                    changed.add(str(path))
+            elif self.matches(path) or self.recursive:
+                # Gone: either a file or a whole directory
+                removed.add(str(path))
+        return changed, removed
+
+    def _removed_files(self, removed: Iterable[str]) -> List[str]:
+        """Expand removed paths (possibly directories) to the synced files they held."""
+        manifest = self.api.manifest
+        if manifest is None:
+            return [path for path in removed if self.matches(Path(path))]
+        files: Set[str] = set()
+        for path in removed:
+            files.update(key for key in manifest.entries_under(path) if self.matches(Path(key)))
+        return sorted(files)
+
+    async def apply(self, changed: Iterable[str], removed: Iterable[str]) -> Dict[str, Any]:
+        """Upsert the changed files and delete the documents of removed ones in one batch each."""
+        changed, removed = sorted(changed), sorted(removed)
+        result: Dict[str, Any] = {"directory": str(self.root), "changed": len(changed), "removed": len(removed)}
+        failed = 0
+        if removed:
+            deletion = await self.api.remove_files(removed)
+            result["deletion"] = deletion
+            self.stats["deleted"] += deletion.successful
+            failed += deletion.failed
+        if changed:
+            upsert = await self.api.upsert_many(changed)
+            result["upsert"] = upsert
+            self.stats["upserted"] += upsert["created"] + upsert["updated"]
+            failed += upsert["failed"]
+        if changed or removed:
+            self.stats["batches"] += 1
+            self.stats["failed"] += failed
+            self.stats["last_sync"] = time.time()
+            logger.info(f"Synced {self.root}: {len(changed)} changed, {len(removed)} removed, {failed} failed")
+        return result
+
+    async def _native_events(self, queue: asyncio.Queue, ready: asyncio.Event):
+        ready.set()
+        async for changes in watchfiles.awatch(
+            self.root, recursive=self.recursive, debounce=int(self.debounce * 1000)
+        ):
+            for _, path in changes:
+                queue.put_nowait(Path(path))
+
+    async def _polled_events(self, queue: asyncio.Queue, ready: asyncio.Event):
+        previous = await asyncio.to_thread(self._snapshot)
+        ready.set()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._snapshot)
+            for path in previous.keys() | current.keys():
+                if previous.get(path) != current.get(path):
+                    queue.put_nowait(Path(path))
+            previous = current
+
+    async def _watch(self, queue: asyncio.Queue, ready: asyncio.Event):
+        try:
+            await (self._polled_events(queue, ready) if self.polling else self._native_events(queue, ready))
+        except Exception as e:
+            queue.put_nowait(e)
+            raise
+        finally:
+            ready.set()
+
+    async def batches(self, queue: asyncio.Queue) -> AsyncIterator[List[Path]]:
+        """
+        Group queued paths into batches: a batch is closed once no new event
+        arrived for `debounce` seconds, or after MAX_BATCH_DELAY seconds.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await queue.get()
+            pending: Dict[Path, None] = {}
+            deadline = loop.time() + max(MAX_BATCH_DELAY, self.debounce)
+            while True:
+                if isinstance(item, Exception):
+                    raise item
+                pending[item] = None
+                timeout = min(self.debounce, deadline - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            yield list(pending)
+
+    async def run(self):
+        """Catch up with the checkpoint, then apply changes until cancelled."""
+        queue: asyncio.Queue = asyncio.Queue()
+        # Start watching first so edits made during the catch-up are not lost; the
+        # polling baseline must be taken before the catch-up snapshot for that
+        ready = asyncio.Event()
+        watcher = asyncio.create_task(self._watch(queue, ready))
+        logger.info(f"Watching {self.root} for changes ({'polling' if self.polling else 'native events'})")
+        try:
+            await ready.wait()
+            try:
+                await self.catch_up()
+            except Exception as e:
+                logger.error(f"Catch-up sync of {self.root} failed: {str(e)}")
+            async for paths in self.batches(queue):
+                changed, removed = await asyncio.to_thread(self._classify, paths)
+                try:
+                    await self.apply(changed, self._removed_files(removed))
+                except Exception as e:
+                    # Keep watching: the manifest still holds the old state, so the
+                    # files are picked up again by the next event or restart
+                    self.stats["failed"] += len(changed) + len(removed)
+                    logger.error(f"Sync of {self.root} failed: {str(e)}")
+        finally:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
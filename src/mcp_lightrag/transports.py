@@ -0,0 +1,85 @@
+"""
+HTTP transports (SSE and streamable HTTP) so that one warm MCP server
+process can serve many agent sessions.
+"""
+
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+
+from starlette.applications import Starlette
+
+from .exceptions import ConfigurationError
+from .mcp_tools import mcp, shared_context
+from .models import ServerSettings
+from .settings import get_settings
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+DEFAULT_BIND_HOST = "127.0.0.1"
+# Hosts for which FastMCP enables DNS rebinding protection by default
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def parse_bind(bind: str) -> Tuple[str, int]:
+    """Split a `HOST:PORT`, `[IPv6]:PORT` or `PORT` bind address."""
+    host, _, port = bind.rpartition(":")
+    try:
+        port_number = int(port)
+    except ValueError:
+        raise ConfigurationError(f"Invalid bind address {bind!r}: expected HOST:PORT")
+    return host.strip("[]") or DEFAULT_BIND_HOST, port_number
+
+
+def create_app(settings: Optional[ServerSettings] = None) -> Starlette:
+    """
+    Build the ASGI app for `settings.transport`.
+
+    All sessions share one API client (see SharedAppContext), which stays
+    open between sessions and is closed when the app shuts down.
+    """
+    settings = settings or get_settings()
+    host, _ = parse_bind(settings.bind)
+    if host not in LOCAL_HOSTS:
+        # Match what FastMCP does when constructed for a non-local host
+        mcp.settings.transport_security = None
+
+    if settings.transport == "sse":
+        app = mcp.sse_app()
+    elif settings.transport == "streamable-http":
+        # Sessions live in one worker process; with several workers the requests
+        # of a session may reach any of them, so every request must stand alone
+        mcp.settings.stateless_http = settings.workers > 1
+        app = mcp.streamable_http_app()
+    else:
+        raise ConfigurationError(f"Transport {settings.transport!r} is not served over HTTP")
+
+    serve_sessions = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(starlette_app: Starlette):
+        shared_context.persistent = True
+        try:
+            async with serve_sessions(starlette_app):
+                yield
+        finally:
+            await shared_context.close()
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def serve(settings: ServerSettings, log_level: str = "INFO"):
+    """Run the MCP server over HTTP with uvicorn."""
+    import uvicorn
+
+    host, port = parse_bind(settings.bind)
+    workers = max(1, settings.workers)
+    if workers > 1 and settings.transport == "sse":
+        raise ConfigurationError(
+            "The SSE transport needs a single worker: message posts must reach the process holding the stream"
+        )
+    if workers > 1:
+        # Every worker builds its own app (and API client) from the environment
+        uvicorn.run(f"{__name__}:create_app", factory=True, host=host, port=port,
+                    workers=workers, log_level=log_level.lower())
+    else:
+        uvicorn.run(create_app(settings), host=host, port=port, log_level=log_level.lower())
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for tests that talk to an in-memory LightRAG server.
+"""
+
+import httpx
+import pytest
+
+from mcp_lightrag.api_client import LightRAGApiClient
+from mcp_lightrag.models import ServerSettings
+from mcp_lightrag.retry import raise_for_retryable_status
+
+
+@pytest.fixture
+def use_transport():
+    """Route a client's requests through an in-memory transport calling `handler`."""
+    def use(client, handler):
+        client.client.set_async_httpx_client(httpx.AsyncClient(
+            base_url=client.settings.base_url,
+            transport=httpx.MockTransport(handler),
+            # Installed like in LightRAGApiClient, so transient statuses reach the retry loop
+            event_hooks={"response": [raise_for_retryable_status]}
+        ))
+        return client
+    return use
+
+
+@pytest.fixture
+def make_client(use_transport):
+    """Create a LightRAGApiClient for localhost:9621, answered by `handler` if one is given."""
+    def make(handler=None, **settings):
+        client = LightRAGApiClient(ServerSettings(host="localhost", port=9621, **settings))
+        return use_transport(client, handler) if handler else client
+    return make
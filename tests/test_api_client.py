@@ -45,11 +45,40 @@ async def test_client_init(settings):
     with patch("mcp_lightrag.api_client.AuthenticatedClient") as mock_auth:
         client = LightRAGApiClient(settings)
         assert client.settings == settings
-        mock_auth.assert_called_once_with(
-            base_url="http://localhost:9621",
-            token="test",
-            verify_ssl=False
-        )
+        mock_auth.assert_called_once()
+        kwargs = mock_auth.call_args.kwargs
+        assert kwargs["base_url"] == "http://localhost:9621"
+        assert kwargs["token"] == "test"
+        assert kwargs["verify_ssl"] is False
+
+
+def test_client_connection_settings():
+    settings = ServerSettings(
+        max_connections=42, max_keepalive_connections=7, keepalive_expiry=12.0,
+        connect_timeout=1.5, read_timeout=90.0, write_timeout=20.0, pool_timeout=5.0
+    )
+    with patch("mcp_lightrag.client.light_rag_server_api_client.client.Client") as mock_plain:
+        LightRAGApiClient(settings)
+        kwargs = mock_plain.call_args.kwargs
+
+    timeout = kwargs["timeout"]
+    assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (1.5, 90.0, 20.0, 5.0)
+    limits = kwargs["httpx_args"]["limits"]
+    assert limits.max_connections == 42
+    assert limits.max_keepalive_connections == 7
+    assert limits.keepalive_expiry == 12.0
+    assert kwargs["httpx_args"]["http2"] is False
+
+
+@pytest.mark.asyncio
+async def test_warm_up_tolerates_unreachable_server(settings):
+    with patch("mcp_lightrag.api_client.AuthenticatedClient"):
+        client = LightRAGApiClient(settings)
+    with patch.object(client, "check_health", new_callable=AsyncMock) as mock_health:
+        mock_health.side_effect = Exception("connection refused")
+        assert await client.warm_up() is False
+        mock_health.side_effect = None
+        assert await client.warm_up() is True
 
 
 # --- Document Operation Tests ---
@@ -166,6 +195,7 @@ async def test_ingest_batch(mock_client, tmp_path):
         assert result["successful"] == 3
         assert result["failed"] == 0
         assert len(result["details"]) == 3
+        assert all(set(d) == {"file", "status"} for d in result["details"])
 
 
 @pytest.mark.asyncio
@@ -270,6 +300,22 @@ async def test_check_indexing_status_busy(mock_client):
         assert result["pending_files"] == 2
 
 
+@pytest.mark.asyncio
+async def test_get_status_counts(mock_client):
+    """Test counting documents per status without listing them."""
+    from mcp_lightrag.client.light_rag_server_api_client.models import StatusCountsResponse
+
+    with patch("mcp_lightrag.api_client.async_get_status_counts", new_callable=AsyncMock) as mock_counts:
+        mock_counts.return_value = StatusCountsResponse.from_dict(
+            {"status_counts": {"processed": 10, "failed": 1, "pending": 2}}
+        )
+
+        result = await mock_client.get_status_counts()
+
+        assert result == {"processed": 10, "failed": 1, "pending": 2}
+        mock_counts.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_verify_server_health(mock_client):
     """Test server health check (verify_server_health operation)."""
@@ -300,3 +346,84 @@ async def test_verify_server_health_unhealthy(mock_client):
         
         assert result["status"] == "degraded"
         assert "issues" in result
+
+
+@pytest.mark.asyncio
+async def test_ingest_batch_concurrency_limit(mock_client, tmp_path):
+    """Test that batch ingestion never exceeds the configured concurrency."""
+    import asyncio
+    for i in range(10):
+        (tmp_path / f"file{i}.txt").write_text(f"Content {i}")
+
+    in_flight = 0
+    peak = 0
+
+    async def slow_upload(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"status": "success"}
+
+    with patch("mcp_lightrag.api_client.async_upload_document", side_effect=slow_upload):
+        result = await mock_client.ingest_batch(tmp_path, concurrency=3)
+
+    assert result["successful"] == 10
+    assert 1 < peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_ingest_batch_timeout_and_progress(mock_client, tmp_path):
+    """Test per-file timeouts and progress reporting during batch ingestion."""
+    import asyncio
+    (tmp_path / "fast.txt").write_text("fast")
+    (tmp_path / "slow.txt").write_text("slow")
+
+    async def upload(**kwargs):
+        if kwargs["body"].file.file_name == "slow.txt":
+            await asyncio.sleep(1)
+        return {"status": "success"}
+
+    progress_calls = []
+
+    async def progress(completed, total):
+        progress_calls.append((completed, total))
+
+    with patch("mcp_lightrag.api_client.async_upload_document", side_effect=upload):
+        result = await mock_client.ingest_batch(tmp_path, timeout=0.05, progress=progress)
+
+    assert result["successful"] == 1
+    assert result["failed"] == 1
+    failed = next(r for r in result["details"] if r["status"] == "fail")
+    assert failed["file"].endswith("slow.txt")
+    assert "Timed out" in failed["error"]
+    # The total grows while the directory is still being scanned
+    assert [c for c, _ in progress_calls] == [1, 2]
+    assert progress_calls[-1] == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_raw_decoding_returns_plain_json(use_transport, make_client):
+    """Raw calls skip the generated models, accept any 2xx status and surface other statuses as errors."""
+    import httpx
+
+    client = make_client()
+    page = {
+        "documents": [{"id": "doc-1", "file_path": "a.md", "status": "processed", "updated_at": "2025-01-01",
+                       "content_summary": "...", "content_length": 3, "created_at": "2025-01-01"}],
+        "pagination": {"page": 1, "page_size": 10, "total_count": 1, "total_pages": 1,
+                       "has_next": False, "has_prev": False},
+        "status_counts": {"processed": 1},
+    }
+    responses = [httpx.Response(200, json=page), httpx.Response(201, json=page),
+                 httpx.Response(422, json={"detail": "bad page"})]
+    use_transport(client, lambda request: responses.pop(0))
+
+    result = await client.get_documents_paginated(page=1, page_size=10, raw=True)
+    assert result == page
+    assert await client.get_documents_paginated(page=1, page_size=10, raw=True) == page
+
+    with pytest.raises(APIResponseError) as exc_info:
+        await client.get_documents_paginated(page=1, page_size=10, raw=True)
+    assert exc_info.value.status_code == 422
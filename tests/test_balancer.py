@@ -0,0 +1,106 @@
+"""
+Unit tests for load balancing across LightRAG replicas.
+"""
+
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+from mcp_lightrag.api_client import LightRAGApiClient
+from mcp_lightrag.balancer import LoadBalancingTransport
+from mcp_lightrag.models import ServerSettings
+
+URLS = ["http://primary:9621", "http://replica:9621"]
+
+
+def make_balancer(handlers, **kwargs):
+    transports = iter([httpx.MockTransport(h) for h in handlers])
+    balancer = LoadBalancingTransport(URLS, lambda: next(transports), **kwargs)
+    return balancer, httpx.AsyncClient(base_url=URLS[0], transport=balancer)
+
+
+def recorder(hits, delay=0.0, fail=False):
+    async def handler(request):
+        if fail:
+            raise httpx.ConnectError("connection refused", request=request)
+        hits[request.url.host] += 1
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"status": "healthy"})
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_reads_prefer_idle_and_fast_replicas():
+    hits = Counter()
+    balancer, client = make_balancer([recorder(hits, 0.01), recorder(hits, 0.01)], probe_interval=0)
+
+    await asyncio.gather(*(client.get("/graph/label/list") for _ in range(4)))
+    assert hits == {"primary": 2, "replica": 2}
+    assert all(e.outstanding == 0 for e in balancer.endpoints)
+
+    balancer.endpoints[1].latency = 1.0
+    hits.clear()
+    for _ in range(3):
+        await client.post("/query", json={"query": "q"})
+    assert hits == {"primary": 3}
+
+
+@pytest.mark.asyncio
+async def test_writes_go_to_primary():
+    hits = Counter()
+    balancer, client = make_balancer([recorder(hits), recorder(hits)], probe_interval=0)
+    balancer.endpoints[0].latency = 5.0
+
+    await client.post("/documents/text", json={"text": "x"})
+    await client.delete("/documents/delete_document")
+
+    assert hits == {"primary": 2}
+
+
+@pytest.mark.asyncio
+async def test_per_process_state_is_read_from_primary():
+    hits = Counter()
+    balancer, client = make_balancer([recorder(hits), recorder(hits)], probe_interval=0)
+    balancer.endpoints[0].latency = 5.0
+
+    await client.get("/documents/pipeline_status")
+    await client.get("/health")
+    assert hits == {"primary": 2}
+
+    await client.get("/graph/label/list")
+    assert hits == {"primary": 2, "replica": 1}
+
+
+@pytest.mark.asyncio
+async def test_reads_fail_over_and_probes_readmit():
+    hits = Counter()
+    down = {"replica": True}
+
+    async def replica(request):
+        if down["replica"]:
+            raise httpx.ConnectError("connection refused", request=request)
+        return await recorder(hits)(request)
+
+    balancer, client = make_balancer([recorder(hits), replica], probe_interval=0)
+    balancer.endpoints[0].latency = 1.0  # Make the replica the first choice
+
+    response = await client.get("/documents/status_counts")
+
+    assert response.status_code == 200
+    assert hits == {"primary": 1}
+    assert balancer.endpoints[1].healthy is False
+    await client.get("/documents/status_counts")
+    assert hits == {"primary": 2}
+
+    down["replica"] = False
+    await balancer.probe(balancer.endpoints[1])
+    assert balancer.endpoints[1].healthy is True
+
+
+def test_client_balances_configured_endpoints():
+    client = LightRAGApiClient(ServerSettings(endpoints=tuple(URLS)))
+    assert client.settings.base_url == URLS[0]
+    assert [e["url"] for e in client.get_metrics()["endpoints"]] == URLS
+    assert client.get_metrics()["endpoints"][0]["primary"] is True
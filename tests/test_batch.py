@@ -0,0 +1,110 @@
+"""
+Unit tests for the shared batch executor and the batch tools built on it.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mcp_lightrag.batch import run_batch
+from mcp_lightrag.mcp_tools import remove_entities
+from mcp_lightrag.models import ServerSettings
+
+
+@pytest.mark.asyncio
+async def test_run_batch_is_concurrent_and_ordered():
+    in_flight = 0
+    peak = 0
+
+    async def work(n):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - n))
+        in_flight -= 1
+        return n * 2
+
+    result = await run_batch(list(range(5)), work, lambda n: {"n": n}, concurrency=3)
+
+    assert peak == 3
+    assert [r["n"] for r in result.results] == [0, 1, 2, 3, 4]
+    assert [r["data"] for r in result.results] == [0, 2, 4, 6, 8]
+    assert result.successful == 5
+
+
+@pytest.mark.asyncio
+async def test_run_batch_timeout_and_errors():
+    async def work(n):
+        if n == 1:
+            await asyncio.sleep(1)
+        if n == 2:
+            raise ValueError("bad item")
+        return n
+
+    result = await run_batch([0, 1, 2], work, lambda n: {"n": n}, timeout=0.05)
+
+    assert [r["status"] for r in result.results] == ["ok", "fail", "fail"]
+    assert "Timed out" in result.results[1]["error"]
+    assert result.results[2]["error"] == "bad item"
+    assert result.failed == 2
+
+
+@pytest.mark.asyncio
+async def test_run_batch_fail_fast_skips_pending_items():
+    calls = []
+
+    async def work(n):
+        calls.append(n)
+        if n == 0:
+            raise ValueError("boom")
+        return n
+
+    result = await run_batch([0, 1, 2], work, lambda n: {"n": n}, concurrency=1, fail_fast=True)
+
+    assert calls == [0]
+    assert [r["status"] for r in result.results] == ["fail", "skipped", "skipped"]
+    assert (result.successful, result.failed) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_remove_entities_returns_batch_result():
+    api = MagicMock()
+    api.settings = ServerSettings(host="localhost", port=9621)
+    api.delete_entity = AsyncMock(side_effect=[{"status": "ok"}, RuntimeError("missing")])
+    ctx = MagicMock()
+    ctx.request_context.lifespan_context.api = api
+
+    output = await remove_entities(ctx, names=["A", "B"], max_concurrency=None, fail_fast=False)
+
+    batch = output["response"]
+    assert output["status"] == "success"
+    assert (batch.total, batch.successful, batch.failed) == (2, 1, 1)
+    assert batch.results[1] == {"name": "B", "status": "fail", "error": "missing"}
+
+
+@pytest.mark.asyncio
+async def test_run_batch_consumes_async_iterables():
+    started = []
+
+    async def items():
+        for n in range(4):
+            yield n
+            # Work on earlier items starts before the iterable is exhausted
+            await asyncio.sleep(0.01)
+            assert started[-1] == n
+
+    async def work(n):
+        started.append(n)
+        return n
+
+    reported = []
+
+    async def progress(done, total):
+        reported.append(total)
+
+    result = await run_batch(items(), work, lambda n: {"n": n}, concurrency=2, progress=progress)
+
+    assert [r["data"] for r in result.results] == [0, 1, 2, 3]
+    assert result.total == 4
+    assert reported[-1] == 4
@@ -0,0 +1,160 @@
+"""
+Unit tests for the local connection broker.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import uvicorn
+
+from mcp_lightrag.api_client import LightRAGApiClient
+from mcp_lightrag.broker import Broker, BrokerTransport, bind_socket
+from mcp_lightrag.models import ServerSettings
+
+
+def fake_lightrag(calls):
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "healthy"})
+        if request.url.path == "/query":
+            return httpx.Response(200, json={"response": f"answer {len(calls)}"})
+        return httpx.Response(200, json={"status": "success", "message": "ok", "track_id": "t1"})
+    return handler
+
+
+def make_broker(calls, **settings):
+    settings = ServerSettings(host="lightrag", port=9621, **settings)
+    upstream = httpx.AsyncClient(base_url=settings.base_url, transport=httpx.MockTransport(fake_lightrag(calls)))
+    return Broker(settings, upstream=upstream)
+
+
+@pytest.mark.asyncio
+async def test_broker_shares_query_cache_until_write():
+    calls = []
+    broker = make_broker(calls)
+    client = httpx.AsyncClient(base_url="http://broker", transport=httpx.ASGITransport(app=broker))
+
+    query = {"query": "What is LightRAG?", "mode": "mix"}
+    first = await client.post("/query", json=query)
+    second = await client.post("/query", json={"query": "What is  LightRAG? ", "mode": "mix"})
+    assert first.json() == second.json()
+    assert calls == [("POST", "/query")]
+
+    # A different API key does not see the cached answer
+    await client.post("/query", json=query, headers={"X-API-Key": "other"})
+    assert len(calls) == 2
+
+    await client.post("/documents/text", json={"text": "new"})
+    third = await client.post("/query", json=query)
+    assert len(calls) == 4
+    assert third.json() != first.json()
+
+    stats = (await client.get("/_broker/stats")).json()
+    assert stats["query_cache"]["hits"] == 1
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_broker_limits_requests_in_flight():
+    peak = 0
+    in_flight = 0
+
+    async def slow(request):
+        nonlocal peak, in_flight
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return httpx.Response(200, json={})
+
+    settings = ServerSettings(host="lightrag", port=9621, broker_max_inflight=2)
+    broker = Broker(settings, upstream=httpx.AsyncClient(base_url=settings.base_url,
+                                                         transport=httpx.MockTransport(slow)))
+    client = httpx.AsyncClient(base_url="http://broker", transport=httpx.ASGITransport(app=broker))
+
+    await asyncio.gather(*(client.get("/documents/pipeline_status") for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_transport_falls_back_to_direct_connections(tmp_path):
+    calls = []
+    stale = tmp_path / "broker.sock"
+    stale.write_text("")  # Left behind, nobody listening
+    transport = BrokerTransport(str(stale), httpx.MockTransport(fake_lightrag(calls)), "http://lightrag:9621")
+    client = httpx.AsyncClient(base_url="http://lightrag:9621", transport=transport)
+
+    response = await client.get("/health")
+
+    assert response.json() == {"status": "healthy"}
+    assert calls == [("GET", "/health")]
+    assert transport._bypass_until > 0
+
+
+async def start_broker(broker, socket_path):
+    server = uvicorn.Server(uvicorn.Config(broker, log_level="warning", lifespan="off"))
+    sock = bind_socket(socket_path)
+    serving = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    async def stop():
+        server.should_exit = True
+        await serving
+        sock.close()
+    return stop
+
+
+@pytest.mark.asyncio
+async def test_client_goes_through_running_broker(tmp_path):
+    upload = tmp_path / "notes.md"
+    upload.write_bytes(b"z" * 5000)
+    calls = []
+    socket_path = str(tmp_path / "broker.sock")
+    broker = make_broker(calls)
+    stop = await start_broker(broker, socket_path)
+
+    # "lightrag" does not resolve here, so answers can only come through the broker
+    client = LightRAGApiClient(ServerSettings(host="lightrag", port=9621, broker_socket=socket_path,
+                                              stream_upload_threshold=1024, upload_chunk_size=1000))
+    try:
+        assert await client.check_health() is not None
+        result = await client.upload_file(upload)
+        assert result.track_id == "t1"
+        assert calls == [("GET", "/health"), ("POST", "/documents/upload")]
+        assert broker.stats()["forwarded"] == 2
+    finally:
+        await client.close()
+        await stop()
+
+
+@pytest.mark.asyncio
+async def test_transport_bypasses_broker_of_another_server(tmp_path):
+    broker_calls, direct_calls = [], []
+    socket_path = str(tmp_path / "broker.sock")
+    stop = await start_broker(make_broker(broker_calls), socket_path)
+
+    transport = BrokerTransport(socket_path, httpx.MockTransport(fake_lightrag(direct_calls)), "http://other:9621")
+    client = httpx.AsyncClient(base_url="http://other:9621", transport=transport)
+    try:
+        await client.post("/documents/text", json={"text": "x"})
+        assert direct_calls == [("POST", "/documents/text")]
+        assert broker_calls == []
+    finally:
+        await client.aclose()
+        await stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_rejects_requests_meant_for_another_server():
+    calls = []
+    client = httpx.AsyncClient(base_url="http://broker", transport=httpx.ASGITransport(app=make_broker(calls)))
+
+    response = await client.post("/documents/text", json={"text": "x"},
+                                 headers={"X-LightRAG-Upstream": "http://other:9621"})
+    assert response.status_code == 421
+    response = await client.get("/health", headers={"X-LightRAG-Upstream": "http://lightrag:9621/"})
+    assert response.status_code == 200
+    assert calls == [("GET", "/health")]
@@ -0,0 +1,116 @@
+"""
+Unit tests for the per-endpoint-group circuit breakers.
+"""
+
+import httpx
+import pytest
+
+from mcp_lightrag.circuit_breaker import CircuitBreaker, CircuitState
+from mcp_lightrag.exceptions import APIConnectionError, APIResponseError, CircuitOpenError
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(retry_max_attempts=1, circuit_failure_threshold=2, circuit_reset_timeout=60.0)
+
+
+def test_breaker_state_machine():
+    breaker = CircuitBreaker("query", failure_threshold=2, reset_timeout=60)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.half_open()
+    breaker.before_call()
+    # Only a single trial call is admitted while half-open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    breaker.half_open()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_per_group(client, use_transport):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.startswith("/documents"):
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json=["label"])
+
+    use_transport(client, handler)
+    for _ in range(2):
+        with pytest.raises(APIConnectionError):
+            await client.get_pipeline_status()
+
+    with pytest.raises(CircuitOpenError):
+        await client.get_pipeline_status()
+    assert len(calls) == 2
+
+    # Other endpoint groups are unaffected
+    assert await client.get_labels() == ["label"]
+
+
+@pytest.mark.asyncio
+async def test_documented_error_responses_count_as_failures(client, use_transport):
+    from mcp_lightrag.mcp_tools import build_query_request
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(500, json={"detail": "LLM unavailable"})
+
+    use_transport(client, handler)
+    for _ in range(2):
+        with pytest.raises(APIResponseError) as exc_info:
+            await client.query(build_query_request("What is it?"))
+        assert exc_info.value.status_code == 500
+
+    with pytest.raises(CircuitOpenError):
+        await client.query(build_query_request("What is it?"))
+    assert calls == ["/query", "/query"]
+    assert client.query_cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_health_check_probes_open_circuit(client, use_transport):
+    healthy = False
+
+    def handler(request):
+        if request.url.path == "/health":
+            if healthy:
+                return httpx.Response(200, json={"status": "healthy"})
+            raise httpx.ConnectError("refused", request=request)
+        if not healthy:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json=["label"])
+
+    use_transport(client, handler)
+    for _ in range(2):
+        with pytest.raises(APIConnectionError):
+            await client.get_labels()
+    breaker = client.breakers["graph"]
+    assert breaker.state is CircuitState.OPEN
+
+    # Cooldown elapsed but the server is still down: the probe keeps the circuit open
+    breaker.opened_at -= 120
+    with pytest.raises(CircuitOpenError):
+        await client.get_labels()
+    assert breaker.state is CircuitState.OPEN
+
+    # Server recovered: the probe half-opens the circuit and the trial call closes it
+    healthy = True
+    breaker.opened_at -= 120
+    assert await client.get_labels() == ["label"]
+    assert breaker.state is CircuitState.CLOSED
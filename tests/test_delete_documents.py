@@ -0,0 +1,80 @@
+"""
+Unit tests for batched multi-id document deletion.
+"""
+
+import json
+
+import httpx
+import pytest
+
+
+def deletion(status, message="ok"):
+    return httpx.Response(200, json={"status": status, "message": message, "doc_id": ""})
+
+
+@pytest.mark.asyncio
+async def test_delete_documents_chunks_ids(make_client):
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return deletion("deletion_started")
+
+    client = make_client(handler, delete_batch_size=2)
+    result = await client.delete_documents(["a", "b", "c", "a", "d", "e"], delete_file=True)
+
+    assert [b["doc_ids"] for b in bodies] == [["a", "b"], ["c", "d"], ["e"]]
+    assert all(b["delete_file"] is True and b["delete_llm_cache"] is False for b in bodies)
+    assert (result.total, result.successful, result.failed) == (5, 5, 0)
+    assert [r["id"] for r in result.results] == ["a", "b", "c", "d", "e"]
+    assert [r["request"] for r in result.results] == [1, 1, 2, 2, 3]
+    assert result.results[0]["data"]["status"] == "deletion_started"
+
+
+@pytest.mark.asyncio
+async def test_delete_documents_waits_out_busy_pipeline(monkeypatch, make_client):
+    monkeypatch.setattr("mcp_lightrag.api_client.POLL_INTERVAL", 0.0)
+    responses = [deletion("busy", "Pipeline is busy"), deletion("deletion_started")]
+    polls = []
+
+    def handler(request):
+        if request.url.path == "/documents/pipeline_status":
+            polls.append(request)
+            return httpx.Response(200, json={"busy": len(polls) < 2})
+        return responses.pop(0)
+
+    client = make_client(handler, delete_batch_size=2)
+    result = await client.delete_documents(["a"])
+
+    assert len(polls) == 2
+    assert result.successful == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_documents_maps_rejections_per_id(make_client):
+    responses = [deletion("not_allowed", "LLM cache disabled"), deletion("deletion_started")]
+
+    client = make_client(lambda request: responses.pop(0), delete_batch_size=2)
+    result = await client.delete_documents(["a", "b", "c"], delete_llm_cache=True)
+
+    assert [r["status"] for r in result.results] == ["fail", "fail", "ok"]
+    assert "LLM cache disabled" in result.results[0]["error"]
+    assert result.failed == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_documents_only_counts_started_deletions_as_success(monkeypatch, make_client):
+    responses = [httpx.Response(422, json={"detail": [{"loc": ["body"], "msg": "invalid", "type": "value_error"}]})]
+
+    client = make_client(lambda request: responses.pop(0), delete_batch_size=2)
+    result = await client.delete_documents(["a", "b"])
+    assert [r["status"] for r in result.results] == ["fail", "fail"]
+
+    async def no_answer(*args):
+        return None
+
+    monkeypatch.setattr(client, "delete_by_docs", no_answer)
+    result = await client.delete_documents(["c"])
+    assert result.results[0]["status"] == "fail"
+    assert "Unexpected deletion response" in result.results[0]["error"]
+    assert result.successful == 0
@@ -0,0 +1,180 @@
+"""
+Unit tests for the in-process document index used by find_document_by_file_name.
+"""
+
+import asyncio
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from mcp_lightrag.api_client import LightRAGApiClient
+from mcp_lightrag.doc_index import DocumentIndex
+from mcp_lightrag.endpoints import api_models
+from mcp_lightrag.models import ServerSettings
+
+
+@pytest.fixture
+def settings():
+    return ServerSettings(host="localhost", port=9621, api_key="test")
+
+
+@pytest.fixture
+def mock_client(settings):
+    """Create a LightRAGApiClient with mocked AuthenticatedClient."""
+    with patch("mcp_lightrag.api_client.AuthenticatedClient"):
+        client = LightRAGApiClient(settings)
+        yield client
+
+
+def make_doc(doc_id: str, file_path: str, updated_at: str):
+    return SimpleNamespace(id=doc_id, file_path=file_path, updated_at=updated_at, content_length=10)
+
+
+def make_page(docs, total_count):
+    return SimpleNamespace(documents=docs, pagination=SimpleNamespace(total_count=total_count))
+
+
+def test_index_lookup_by_path_and_name():
+    index = DocumentIndex(ttl=60)
+    index.add(make_doc("doc-1", "/inputs/notes/a.md", "2025-01-01T00:00:00"))
+
+    assert index.get("/inputs/notes/a.md").id == "doc-1"
+    assert index.get("a.md").id == "doc-1"
+    assert index.get("b.md") is None
+    assert index.watermark == "2025-01-01T00:00:00"
+
+
+def test_index_keeps_newest_and_removes():
+    index = DocumentIndex(ttl=60)
+    index.add(make_doc("doc-new", "/x/a.md", "2025-02-01T00:00:00"))
+    index.add(make_doc("doc-old", "/y/a.md", "2025-01-01T00:00:00"))
+
+    assert index.get("a.md").id == "doc-new"
+    assert index.get("/y/a.md").id == "doc-old"
+
+    index.remove("doc-new")
+    assert index.get("/x/a.md") is None
+    assert index.get("a.md") is None
+
+
+def test_index_remove_leaves_entries_taken_over_by_newer_documents():
+    index = DocumentIndex(ttl=60)
+    index.add(make_doc("doc-old", "/x/a.md", "2025-01-01T00:00:00"))
+    index.add(make_doc("doc-new", "/y/a.md", "2025-02-01T00:00:00"))
+
+    index.remove("doc-old")
+    assert index.get("/x/a.md") is None
+    assert index.get("a.md").id == "doc-new"
+    assert index.get("/y/a.md").id == "doc-new"
+    index.remove("doc-old")
+
+
+def test_index_expiry():
+    index = DocumentIndex(ttl=0)
+    assert index.is_expired()
+    index.mark_built()
+    assert index.is_expired()
+
+    index = DocumentIndex(ttl=60)
+    index.mark_built()
+    assert not index.is_expired()
+
+
+@pytest.mark.asyncio
+async def test_find_document_uses_index(mock_client):
+    """The first lookup sweeps all pages; later hits need no requests."""
+    # Page size is 100, so a total of 101 forces a second page
+    pages = [
+        make_page([make_doc(f"doc-{i}", f"file{i}.md", f"2025-01-0{9 - i}") for i in range(5)], 101),
+        make_page([make_doc(f"doc-{i}", f"file{i}.md", f"2025-01-0{9 - i}") for i in range(5, 7)], 101),
+    ]
+    with patch.object(mock_client, "get_documents_paginated", new_callable=AsyncMock) as mock_list:
+        mock_list.side_effect = pages
+
+        doc = await mock_client.find_document_by_file_name("file6.md")
+        assert doc.id == "doc-6"
+        assert mock_list.call_count == 2
+
+        doc = await mock_client.find_document_by_file_name("file0.md")
+        assert doc.id == "doc-0"
+        assert mock_list.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_find_document_incremental_refresh_on_miss(mock_client):
+    """A miss only fetches documents newer than the watermark."""
+    initial = make_page([make_doc("doc-1", "old.md", "2025-01-01T00:00:00")], 1)
+    incremental = make_page([
+        make_doc("doc-2", "new.md", "2025-01-02T00:00:00"),
+        make_doc("doc-1", "old.md", "2025-01-01T00:00:00"),
+    ], 2)
+
+    with patch.object(mock_client, "get_documents_paginated", new_callable=AsyncMock) as mock_list:
+        mock_list.side_effect = [initial, incremental]
+
+        assert (await mock_client.find_document_by_file_name("old.md")).id == "doc-1"
+        assert (await mock_client.find_document_by_file_name("new.md")).id == "doc-2"
+        assert mock_list.call_count == 2
+        assert mock_client.doc_index.watermark == "2025-01-02T00:00:00"
+
+
+@pytest.mark.asyncio
+async def test_delete_by_doc_updates_index(mock_client):
+    mock_client.doc_index.add(make_doc("doc-1", "a.md", "2025-01-01"))
+    mock_client.doc_index.mark_built()
+
+    with patch("mcp_lightrag.api_client.async_delete_by_doc_id", new_callable=AsyncMock) as mock_delete:
+        mock_delete.return_value = MagicMock(status=api_models.DeleteDocByIdResponseStatus.DELETION_STARTED)
+        await mock_client.delete_by_doc("doc-1")
+        mock_delete.assert_called_once()
+
+    assert mock_client.doc_index.get("a.md") is None
+
+
+@pytest.mark.asyncio
+async def test_iter_documents_prefetches_a_window_of_pages(mock_client):
+    in_flight = 0
+    peak = 0
+
+    async def fetch_page(page, page_size, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        docs = [make_doc(f"doc-{page}-{i}", f"p{page}-{i}.md", "2025-01-01") for i in range(page_size)]
+        return make_page(docs if page <= 6 else [], 6 * page_size)
+
+    with patch.object(mock_client, "get_documents_paginated", side_effect=fetch_page) as mock_list:
+        ids = [doc.id async for doc in mock_client.iter_documents(page_size=2, prefetch=2)]
+
+    assert ids == [f"doc-{p}-{i}" for p in range(1, 7) for i in range(2)]
+    assert [c.kwargs["page"] for c in mock_list.call_args_list] == [1, 2, 3, 4, 5, 6]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_documents_cancels_prefetch_on_close(mock_client):
+    cancelled = []
+
+    async def fetch_page(page, page_size, **kwargs):
+        if page > 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+        return make_page([make_doc("doc-1", "a.md", "2025-01-01")], 100)
+
+    with patch.object(mock_client, "get_documents_paginated", side_effect=fetch_page):
+        documents = mock_client.iter_documents(page_size=1, prefetch=3)
+        await anext(documents)
+        pending = asyncio.ensure_future(anext(documents))
+        await asyncio.sleep(0.01)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        await documents.aclose()
+
+    assert sorted(cancelled) == [2, 3, 4, 5]
@@ -0,0 +1,170 @@
+"""
+Unit tests for the query result cache and single-flight read coalescing.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_lightrag.api_client import LightRAGApiClient
+from mcp_lightrag.cache import QueryCache, SingleFlight, query_cache_key
+from mcp_lightrag.mcp_tools import build_query_request
+from mcp_lightrag.models import ServerSettings
+
+
+def test_cache_key_normalizes_query_text():
+    a = query_cache_key("query", {"query": "  What is  LightRAG? ", "mode": "mix", "hl_keywords": ["b", "a "]})
+    b = query_cache_key("query", {"mode": "mix", "query": "What is LightRAG?", "hl_keywords": ["a", "b"]})
+    assert a == b
+    assert a != query_cache_key("query", {"query": "what is lightrag?", "mode": "mix", "hl_keywords": ["a", "b"]})
+    assert a != query_cache_key("query", {"query": "What is LightRAG?", "mode": "local", "hl_keywords": ["a", "b"]})
+    assert a != query_cache_key("query_data", {"query": "What is LightRAG?", "mode": "mix", "hl_keywords": ["a", "b"]})
+
+
+def test_lru_eviction():
+    cache = QueryCache(max_entries=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("mcp_lightrag.cache.time.monotonic", lambda: now[0])
+    cache = QueryCache(max_entries=10, ttl=5)
+    cache.put("a", 1)
+    now[0] += 6
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_stale_generation_is_not_stored():
+    cache = QueryCache()
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("a", 1, generation=generation)
+    assert len(cache) == 0
+
+
+def test_disabled_cache():
+    cache = QueryCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeated_queries_from_cache_until_write(use_transport, make_client):
+    client = make_client()
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/query":
+            return httpx.Response(200, json={"response": "answer"})
+        return httpx.Response(200, json={"status": "success", "message": "ok", "track_id": "t1"})
+
+    use_transport(client, handler)
+
+    await client.query(build_query_request("What is it?"))
+    await client.query(build_query_request("What  is it? "))
+    assert paths == ["/query"]
+
+    await client.add_text("new facts")
+    await client.query(build_query_request("What is it?"))
+    assert paths == ["/query", "/documents/text", "/query"]
+
+    stats = client.get_metrics()["query_cache"]
+    assert stats["hits"] == 1
+    assert stats["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call_and_survives_cancelled_waiters():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    waiters = [asyncio.create_task(flight.run("k", work)) for _ in range(3)]
+    await asyncio.sleep(0)
+    waiters[0].cancel()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert calls == 1
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == ["result", "result"]
+    assert flight.stats() == {"in_flight": 0, "calls": 1, "coalesced": 2}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_call_without_waiters():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flight.run("k", work))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_concurrent_reads_but_not_writes(use_transport, make_client):
+    client = make_client(query_cache_size=0)
+    paths = []
+
+    async def handler(request):
+        paths.append(request.url.path)
+        await asyncio.sleep(0.05)
+        if request.url.path == "/query":
+            return httpx.Response(200, json={"response": "answer"})
+        if request.url.path == "/graph/label/list":
+            return httpx.Response(200, json=["A", "B"])
+        return httpx.Response(200, json={"status": "success", "message": "ok", "track_id": "t1"})
+
+    use_transport(client, handler)
+
+    labels = await asyncio.gather(*(client.get_labels() for _ in range(3)))
+    assert labels == [["A", "B"]] * 3
+    await asyncio.gather(
+        client.query(build_query_request("What is it?")),
+        client.query(build_query_request(" What is  it?")),
+        client.query(build_query_request("Something else")),
+    )
+    assert sorted(paths) == ["/graph/label/list", "/query", "/query"]
+
+    paths.clear()
+    await asyncio.gather(*(client.add_text("same facts") for _ in range(2)))
+    assert paths == ["/documents/text", "/documents/text"]
+    assert client.get_metrics()["single_flight"]["coalesced"] == 3
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_cache_error_results():
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    client = LightRAGApiClient(ServerSettings(host="localhost", port=9621))
+    with patch("mcp_lightrag.api_client.async_query_document", new_callable=AsyncMock) as mock_query:
+        mock_query.return_value = MagicMock(detail="internal error")
+        await client.query(build_query_request("What is it?"))
+        await client.query(build_query_request("What is it?"))
+    assert mock_query.call_count == 2
+    assert client.get_metrics()["query_cache"]["size"] == 0
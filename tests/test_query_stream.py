@@ -0,0 +1,123 @@
+"""
+Unit tests for streaming queries over /query/stream.
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from mcp_lightrag.exceptions import APIResponseError
+from mcp_lightrag.mcp_tools import AppContext, build_query_request, query_knowledge_graph_stream
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
+
+
+def ndjson_handler(lines, status_code=200):
+    def handler(request):
+        body = "\n".join(json.dumps(line) for line in lines) + "\n"
+        return httpx.Response(status_code, content=body.encode(),
+                              headers={"Content-Type": "application/x-ndjson"})
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_query_stream_yields_ndjson_objects(client, use_transport):
+    use_transport(client, ndjson_handler([
+        {"references": [{"reference_id": "1", "file_path": "a.md"}]},
+        {"response": "Hello"},
+        {"response": " world"},
+    ]))
+
+    messages = [m async for m in client.query_stream(build_query_request("hi"))]
+
+    assert messages[0]["references"][0]["file_path"] == "a.md"
+    assert [m["response"] for m in messages[1:]] == ["Hello", " world"]
+
+
+@pytest.mark.asyncio
+async def test_query_streaming_assembles_answer(client, use_transport):
+    use_transport(client, ndjson_handler([
+        {"references": [{"reference_id": "1", "file_path": "a.md"}]},
+        {"response": "Hello"},
+        {"response": " world"},
+    ]))
+    chunks = []
+
+    async def on_chunk(chunk):
+        chunks.append(chunk)
+
+    result = await client.query_streaming(build_query_request("hi"), on_chunk=on_chunk)
+
+    assert chunks == ["Hello", " world"]
+    assert result["response"] == "Hello world"
+    assert result["references"] == [{"reference_id": "1", "file_path": "a.md"}]
+
+
+@pytest.mark.asyncio
+async def test_query_streaming_errors(client, use_transport):
+    use_transport(client, ndjson_handler([{"response": "par"}, {"error": "LLM failed"}]))
+    with pytest.raises(APIResponseError):
+        await client.query_streaming(build_query_request("hi"))
+
+    use_transport(client, ndjson_handler([{"detail": "bad"}], status_code=400))
+    with pytest.raises(APIResponseError) as exc_info:
+        await client.query_streaming(build_query_request("hi"))
+    assert exc_info.value.status_code == 400
+
+
+class TrackedBody(httpx.AsyncByteStream):
+    def __init__(self, lines):
+        self.lines = lines
+        self.closed = False
+
+    async def __aiter__(self):
+        for line in self.lines:
+            yield line
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_query_streaming_closes_stream_on_error_and_rejects_invalid_lines(client, use_transport):
+    body = TrackedBody([b'{"response": "par"}\n', b'{"error": "LLM failed"}\n', b'{"response": "never read"}\n'])
+    use_transport(client, lambda request: httpx.Response(200, stream=body))
+    with pytest.raises(APIResponseError):
+        await client.query_streaming(build_query_request("hi"))
+    assert body.closed
+
+    body = TrackedBody([b'{"response": "par"}\n', b'not json\n'])
+    use_transport(client, lambda request: httpx.Response(200, stream=body))
+    with pytest.raises(APIResponseError) as exc_info:
+        await client.query_streaming(build_query_request("hi"))
+    assert exc_info.value.details == "not json"
+    assert body.closed
+
+
+@pytest.mark.asyncio
+async def test_stream_tool_forwards_chunks_as_progress():
+    mock_api = AsyncMock()
+
+    async def fake_streaming(params, on_chunk):
+        for chunk in ("a", "b"):
+            await on_chunk(chunk)
+        return {"response": "ab", "references": []}
+
+    mock_api.query_streaming.side_effect = fake_streaming
+    app_context = MagicMock(spec=AppContext)
+    app_context.api = mock_api
+    ctx = MagicMock()
+    ctx.request_context.lifespan_context = app_context
+    ctx.request_context.meta.progressToken = "token-1"
+    ctx.report_progress = AsyncMock()
+
+    result = await query_knowledge_graph_stream(ctx, prompt="hi", search_mode="mix", limit=10)
+
+    assert result["status"] == "success"
+    assert result["response"]["response"] == "ab"
+    assert [c.kwargs["message"] for c in ctx.report_progress.call_args_list] == ["a", "b"]
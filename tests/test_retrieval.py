@@ -0,0 +1,71 @@
+"""
+Unit tests for structured retrieval over /query/data and its projection.
+"""
+
+import httpx
+import pytest
+
+from mcp_lightrag.mcp_tools import build_query_request
+from mcp_lightrag.models import ContextProjection
+from mcp_lightrag.retrieval import project_query_data
+
+
+def sample_payload():
+    return {
+        "status": "success",
+        "message": "ok",
+        "data": {
+            "entities": [
+                {"entity_name": f"E{i}", "entity_type": "concept", "description": "d" * 500,
+                 "source_id": "chunk-1<SEP>chunk-2", "reference_id": str(i)}
+                for i in range(5)
+            ],
+            "relationships": [
+                {"src_id": "E0", "tgt_id": "E1", "description": "related", "keywords": "k",
+                 "weight": 1.0, "source_id": "chunk-1", "reference_id": "0"}
+            ],
+            "chunks": [
+                {"content": "x" * 2000, "file_path": "a.md", "chunk_id": "chunk-1", "reference_id": "0"}
+            ],
+            "references": [{"reference_id": str(i), "file_path": f"{i}.md"} for i in range(5)],
+        },
+        "metadata": {"query_mode": "mix", "keywords": {"high_level": ["x"]}, "processing_info": {}, "debug": "big"},
+    }
+
+
+def test_project_query_data_limits_and_truncates():
+    projection = ContextProjection(max_entities=2, max_chunks=1, max_description_length=50)
+    result = project_query_data(sample_payload(), projection)
+
+    entities = result["data"]["entities"]
+    assert [e["entity_name"] for e in entities] == ["E0", "E1"]
+    assert all("source_id" not in e for e in entities)
+    assert len(entities[0]["description"]) == 51
+    assert "content" not in result["data"]["chunks"][0]
+    assert [r["reference_id"] for r in result["data"]["references"]] == ["0", "1"]
+    assert "debug" not in result["metadata"]
+
+
+def test_project_query_data_chunk_content():
+    projection = ContextProjection(include_chunk_content=True, max_chunk_length=100)
+    result = project_query_data(sample_payload(), projection)
+    assert len(result["data"]["chunks"][0]["content"]) == 101
+
+
+@pytest.mark.asyncio
+async def test_query_data_returns_projected_payload(use_transport, make_client):
+    client = make_client()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=sample_payload())
+
+    use_transport(client, handler)
+
+    raw = await client.query_data(build_query_request("what?"))
+    projected = await client.query_data(build_query_request("what?"), ContextProjection(max_entities=1))
+
+    assert requests[0].url.path == "/query/data"
+    assert len(raw["data"]["entities"]) == 5
+    assert len(projected["data"]["entities"]) == 1
@@ -0,0 +1,130 @@
+"""
+Unit tests for the retry policy used by LightRAGApiClient._execute_op.
+"""
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from mcp_lightrag.exceptions import APIConnectionError, APIResponseError
+from mcp_lightrag.retry import (
+    Idempotency,
+    RetryableStatus,
+    RetryBudget,
+    RetryPolicy,
+    is_retryable,
+    parse_retry_after,
+)
+from mcp_lightrag.client.light_rag_server_api_client.errors import UnexpectedStatus
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(retry_base_delay=0.0)
+
+
+def test_is_retryable_by_idempotency():
+    request = httpx.Request("GET", "http://test")
+    assert is_retryable(httpx.ConnectError("refused", request=request), Idempotency.GUARDED)
+    assert is_retryable(httpx.ReadTimeout("slow", request=request), Idempotency.SAFE)
+    assert not is_retryable(httpx.ReadTimeout("slow", request=request), Idempotency.GUARDED)
+    assert is_retryable(RetryableStatus(502), Idempotency.SAFE)
+    assert not is_retryable(RetryableStatus(502), Idempotency.GUARDED)
+    assert is_retryable(RetryableStatus(429), Idempotency.GUARDED)
+    assert not is_retryable(UnexpectedStatus(404, b""), Idempotency.SAFE)
+    assert not is_retryable(ValueError("bad"), Idempotency.SAFE)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_backoff_full_jitter_and_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt)
+    assert policy.backoff(0, retry_after=2.5) == 2.5
+    assert policy.backoff(0, retry_after=60) == 5.0
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, min_tokens=1, max_tokens=2)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_spend()
+
+
+@pytest.mark.asyncio
+async def test_execute_op_honors_retry_after(client, use_transport):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503, headers={"Retry-After": "1"})
+        return httpx.Response(200, json={"status": "healthy"})
+
+    use_transport(client, handler)
+    with patch("mcp_lightrag.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        result = await client.check_health()
+
+    assert len(calls) == 2
+    mock_sleep.assert_called_once_with(1.0)
+    assert result is not None
+
+
+@pytest.mark.asyncio
+async def test_execute_op_does_not_retry_ambiguous_write(client, use_transport):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    use_transport(client, handler)
+    with pytest.raises(APIResponseError) as exc_info:
+        await client.add_text("hello")
+
+    assert exc_info.value.status_code == 502
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_op_stops_when_budget_exhausted(client, use_transport):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    use_transport(client, handler)
+    client.retry_budget = RetryBudget(ratio=0.0, min_tokens=0)
+    with pytest.raises(APIConnectionError):
+        await client.get_pipeline_status()
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_retry_resends_whole_file(client, tmp_path, use_transport):
+    sample = tmp_path / "sample.txt"
+    sample.write_text("file body to upload")
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.read())
+        if len(bodies) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"status": "success", "message": "ok", "track_id": "t1"})
+
+    use_transport(client, handler)
+    result = await client.upload_file(sample)
+
+    assert len(bodies) == 2
+    assert all(b"file body to upload" in body for body in bodies)
+    assert result.track_id == "t1"
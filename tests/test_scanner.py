@@ -0,0 +1,63 @@
+"""
+Unit tests for the threaded directory scanner.
+"""
+
+import pytest
+
+from mcp_lightrag.exceptions import ResourceNotFoundError
+from mcp_lightrag.scanner import compile_patterns, scan_files, walk_files
+
+
+def make_tree(root):
+    (root / "a.md").write_text("a")
+    (root / "b.txt").write_text("b")
+    (root / "sub").mkdir()
+    (root / "sub" / "c.md").write_text("c")
+    (root / "sub" / "deeper").mkdir()
+    (root / "sub" / "deeper" / "d.md").write_text("d")
+    (root / ".git").mkdir()
+    (root / ".git" / "e.md").write_text("e")
+
+
+def names(paths):
+    return sorted(p.name for p in paths)
+
+
+def test_patterns_accept_globs_and_regexes():
+    pattern = compile_patterns(["*.md", r"\.txt$", "glob:data?.csv", "re:^notes"])
+
+    assert pattern.search("readme.md")
+    assert not pattern.search("readme.md.bak")
+    assert pattern.search("b.txt")
+    assert pattern.search("data1.csv")
+    assert not pattern.search("data10.csv")
+    assert pattern.search("notes-2024.rst")
+    assert compile_patterns([]) is None
+
+
+def test_walk_files_depth_and_filters(tmp_path):
+    make_tree(tmp_path)
+
+    assert names(walk_files(tmp_path)) == ["a.md", "b.txt"]
+    assert names(walk_files(tmp_path, recursive=True, depth=1, ignore_dirs=[r"^\.git$"])) == [
+        "a.md", "b.txt", "c.md"
+    ]
+    assert names(walk_files(tmp_path, recursive=True, depth=2, include_only=["*.md"], ignore_dirs=[".git"])) == [
+        "a.md", "c.md", "d.md"
+    ]
+    assert names(walk_files(tmp_path, ignore_files=["*.md"])) == ["b.txt"]
+
+
+@pytest.mark.asyncio
+async def test_scan_files_streams_results(tmp_path):
+    make_tree(tmp_path)
+
+    found = [p async for p in scan_files(tmp_path, recursive=True, depth=5, include_only=["*.md"])]
+
+    assert names(found) == ["a.md", "c.md", "d.md", "e.md"]
+
+
+@pytest.mark.asyncio
+async def test_scan_files_missing_directory(tmp_path):
+    with pytest.raises(ResourceNotFoundError):
+        _ = [p async for p in scan_files(tmp_path / "missing")]
@@ -7,6 +7,11 @@ def test_default_settings():
     assert settings.host == "localhost"
     assert settings.port == 9621
     assert settings.api_key == ""
+    assert settings.max_concurrency == 8
+    assert settings.file_timeout == 300.0
+    assert settings.max_connections == 100
+    assert settings.connect_timeout == 10.0
+    assert settings.http2 is False
     assert settings.base_url == "http://localhost:9621"
 
 def test_env_settings():
@@ -24,3 +29,16 @@ def test_env_settings():
     del os.environ["LIGHTRAG_HOST"]
     del os.environ["LIGHTRAG_PORT"]
     del os.environ["LIGHTRAG_API_KEY"]
+
+def test_broker_is_opt_in(monkeypatch):
+    monkeypatch.delenv("LIGHTRAG_BROKER_SOCKET", raising=False)
+    assert get_settings().broker_socket is None
+
+    monkeypatch.setenv("LIGHTRAG_BROKER_SOCKET", "auto")
+    default = get_settings().broker_socket
+    assert default is not None and default.endswith(".sock")
+    monkeypatch.setenv("LIGHTRAG_HOST", "other-host")
+    assert get_settings().broker_socket != default
+
+    monkeypatch.setenv("LIGHTRAG_BROKER_SOCKET", "/tmp/broker.sock")
+    assert get_settings().broker_socket == "/tmp/broker.sock"
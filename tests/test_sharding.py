@@ -0,0 +1,139 @@
+"""
+Unit tests for scatter-gather queries across LightRAG shards.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_lightrag.exceptions import APIConnectionError, ConfigurationError
+from mcp_lightrag.mcp_tools import build_query_request
+from mcp_lightrag.models import ContextProjection, ServerSettings
+from mcp_lightrag.sharding import ShardedClient, fuse_query_data, parse_shard
+
+
+def payload(entities=(), relationships=(), chunks=(), references=()):
+    return {
+        "status": "success",
+        "message": "ok",
+        "data": {
+            "entities": [{"entity_name": name, "description": name, "reference_id": ref} for name, ref in entities],
+            "relationships": [{"src_id": s, "tgt_id": t, "reference_id": ref} for s, t, ref in relationships],
+            "chunks": [{"chunk_id": cid, "content": cid, "reference_id": ref} for cid, ref in chunks],
+            "references": [{"reference_id": ref, "file_path": path} for ref, path in references],
+        },
+        "metadata": {"query_mode": "mix"},
+    }
+
+
+def make_sharded(handlers, timeout=1.0):
+    client = ShardedClient(ServerSettings(
+        shards=tuple(f"{name}=http://{name}:9621" for name in handlers), shard_timeout=timeout, broker_socket=None,
+        retry_max_attempts=1
+    ))
+    for shard in client.shards:
+        shard.client.client.set_async_httpx_client(httpx.AsyncClient(
+            base_url=shard.client.settings.base_url, transport=httpx.MockTransport(handlers[shard.name])
+        ))
+    return client
+
+
+def test_parse_shard():
+    assert parse_shard("sales=http://rag-sales:9621/") == ("sales", "http://rag-sales:9621")
+    assert parse_shard("https://rag:443") == ("rag:443", "https://rag:443")
+    with pytest.raises(ConfigurationError):
+        parse_shard("sales=rag-sales")
+
+
+def test_fuse_deduplicates_and_ranks_by_reciprocal_rank():
+    a = payload(
+        entities=[("Acme", "1"), ("Bob", "2")],
+        relationships=[("Acme", "Bob", "1")],
+        chunks=[("c1", "1"), ("c2", "2")],
+        references=[("1", "a.md"), ("2", "b.md")],
+    )
+    b = payload(
+        entities=[("Carol", "1"), ("Bob", "1")],
+        relationships=[("Bob", "Acme", "1")],
+        chunks=[("c3", "1"), ("c2", "1")],
+        references=[("1", "c.md")],
+    )
+    fused = fuse_query_data([("a", a), ("b", b)])["data"]
+
+    # Bob is ranked second by both shards, which beats a single first place
+    assert [e["entity_name"] for e in fused["entities"]] == ["Bob", "Acme", "Carol"]
+    assert fused["entities"][0]["shard"] == "a"
+    assert len(fused["relationships"]) == 1
+    assert [c["chunk_id"] for c in fused["chunks"]] == ["c2", "c1", "c3"]
+
+    # Reference IDs are renumbered so that each points at one shard's file
+    paths = {ref["reference_id"]: (ref["shard"], ref["file_path"]) for ref in fused["references"]}
+    assert paths[fused["entities"][0]["reference_id"]] == ("a", "b.md")
+    assert paths[fused["entities"][2]["reference_id"]] == ("b", "c.md")
+    assert len(paths) == 3
+
+
+@pytest.mark.asyncio
+async def test_query_data_drops_slow_and_failing_shards():
+    async def fast(request):
+        return httpx.Response(200, json=payload(entities=[("Acme", "1")], references=[("1", "a.md")]))
+
+    async def slow(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json=payload())
+
+    async def broken(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = make_sharded({"fast": fast, "slow": slow, "broken": broken}, timeout=0.2)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    result = await client.query_data(build_query_request("who?"), ContextProjection(max_entities=5))
+    assert loop.time() - start < 1.0
+
+    assert [e["entity_name"] for e in result["data"]["entities"]] == ["Acme"]
+    assert result["metadata"]["shards"] == ["fast"]
+    assert set(result["metadata"]["dropped_shards"]) == {"slow", "broken"}
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_query_fails_when_no_shard_answers():
+    async def broken(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = make_sharded({"a": broken}, timeout=0.5)
+    with pytest.raises(APIConnectionError):
+        await client.query(build_query_request("who?"))
+    await client.close()
+
+
+def test_shards_bypass_the_broker(tmp_path):
+    client = ShardedClient(ServerSettings(shards=("a=http://a:9621", "b=http://b:9621"),
+                                          broker_socket=str(tmp_path / "broker.sock")))
+    assert [shard.client.settings.broker_socket for shard in client.shards] == [None, None]
+    assert [shard.client.settings.base_url for shard in client.shards] == ["http://a:9621", "http://b:9621"]
+
+
+@pytest.mark.asyncio
+async def test_error_answers_count_as_dropped_shards():
+    async def answering(request):
+        if request.url.path == "/query":
+            return httpx.Response(200, json={"response": "from a"})
+        return httpx.Response(200, json=payload(entities=[("Acme", "1")]))
+
+    async def failing(request):
+        return httpx.Response(500, json={"detail": "LLM unavailable"})
+
+    client = make_sharded({"a": answering, "b": failing})
+
+    result = await client.query(build_query_request("who?"))
+    assert result["responses"] == [{"shard": "a", "response": "from a"}]
+    assert set(result["dropped_shards"]) == {"b"}
+
+    result = await client.query_data(build_query_request("who?"))
+    assert result["metadata"]["shards"] == ["a"]
+    assert set(result["metadata"]["dropped_shards"]) == {"b"}
+    await client.close()
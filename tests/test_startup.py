@@ -0,0 +1,30 @@
+"""
+Start-up tests: the generated API client must stay out of the import path.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from mcp_lightrag import api_client
+from mcp_lightrag.endpoints import LazyEndpoint
+
+
+def test_server_import_does_not_load_generated_endpoints():
+    code = (
+        "import json, sys, mcp_lightrag.cli; "
+        "print(json.dumps([m for m in sys.modules if m.startswith('mcp_lightrag.client.')]))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    loaded = json.loads(output)
+    assert loaded
+    assert not [m for m in loaded if ".api." in m or ".models" in m]
+
+
+@pytest.mark.parametrize("name", [n for n, v in vars(api_client).items() if isinstance(v, LazyEndpoint)])
+def test_lazy_endpoints_resolve(name):
+    endpoint = getattr(api_client, name)
+    assert callable(endpoint.resolve())
+    assert endpoint.resolve().__module__ == endpoint.__module__
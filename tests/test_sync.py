@@ -0,0 +1,120 @@
+"""
+Unit tests for incremental directory sync.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcp_lightrag.api_client import LightRAGApiClient
+from mcp_lightrag.models import BatchResult, ManifestEntry, ServerSettings
+from mcp_lightrag.sync import DirectorySync
+
+
+@pytest.fixture
+def manifest_client(tmp_path):
+    """Create a LightRAGApiClient with a manifest stored in a temporary directory."""
+    with patch("mcp_lightrag.api_client.AuthenticatedClient"):
+        client = LightRAGApiClient(ServerSettings(host="localhost", port=9621,
+                                                  manifest_path=str(tmp_path / "manifest.sqlite3")))
+        yield client
+        client.manifest.close()
+
+
+def record(client, path, doc_id):
+    stat = path.stat()
+    client.manifest.put(ManifestEntry(str(path.resolve()), stat.st_size, stat.st_mtime_ns, "hash", doc_id=doc_id))
+
+
+def upsert_result(files):
+    return {"total": len(files), "created": len(files), "updated": 0, "skipped": 0, "failed": 0, "details": []}
+
+
+@pytest.mark.asyncio
+async def test_catch_up_only_syncs_changes_since_checkpoint(manifest_client, tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    for name in ("same.md", "edited.md", "gone.md"):
+        (vault / name).write_text(name)
+        record(manifest_client, vault / name, f"doc-{name}")
+    (vault / "edited.md").write_text("edited content")
+    (vault / "gone.md").unlink()
+    (vault / "new.md").write_text("new")
+
+    sync = DirectorySync(manifest_client, vault)
+    with patch.object(manifest_client, "upsert_many", new_callable=AsyncMock) as mock_upsert, \
+         patch.object(manifest_client, "delete_documents", new_callable=AsyncMock) as mock_delete:
+        mock_upsert.side_effect = upsert_result
+        mock_delete.return_value = BatchResult(1, 1, 0, [{"id": "doc-gone.md", "status": "ok"}])
+        result = await sync.catch_up()
+
+    resolved = vault.resolve()
+    mock_upsert.assert_awaited_once_with([str(resolved / "edited.md"), str(resolved / "new.md")])
+    mock_delete.assert_awaited_once_with(["doc-gone.md"])
+    assert result["changed"] == 2 and result["removed"] == 1
+    assert manifest_client.manifest.get(str(resolved / "gone.md")) is None
+    assert manifest_client.manifest.get(str(resolved / "same.md")) is not None
+
+
+@pytest.mark.asyncio
+async def test_remove_files_expands_directories(manifest_client, tmp_path):
+    (tmp_path / "notes").mkdir()
+    for name in ("a.md", "b.md"):
+        (tmp_path / "notes" / name).write_text(name)
+        record(manifest_client, tmp_path / "notes" / name, f"doc-{name}")
+    (tmp_path / "notes-old.md").write_text("x")
+    record(manifest_client, tmp_path / "notes-old.md", "doc-old")
+
+    with patch.object(manifest_client, "delete_documents", new_callable=AsyncMock) as mock_delete:
+        mock_delete.return_value = BatchResult(2, 1, 1, [
+            {"id": "doc-a.md", "status": "ok"},
+            {"id": "doc-b.md", "status": "fail", "error": "Pipeline busy"},
+        ])
+        result = await manifest_client.remove_files([tmp_path / "notes"])
+
+    assert sorted(mock_delete.await_args.args[0]) == ["doc-a.md", "doc-b.md"]
+    assert (result.successful, result.failed) == (1, 1)
+    # Failed deletions stay in the manifest so they are retried
+    remaining = manifest_client.manifest.entries_under(str(tmp_path.resolve()))
+    assert set(remaining) == {str((tmp_path / "notes" / "b.md").resolve()), str((tmp_path / "notes-old.md").resolve())}
+
+
+@pytest.mark.asyncio
+async def test_watch_debounces_changes_into_batches(manifest_client, tmp_path):
+    sync = DirectorySync(manifest_client, tmp_path, include_only=["*.md"], debounce=0.1,
+                         poll_interval=0.02, force_polling=True)
+    applied = asyncio.Queue()
+
+    async def apply(changed, removed):
+        applied.put_nowait((sorted(changed), sorted(removed)))
+
+    with patch.object(sync, "apply", side_effect=apply):
+        task = asyncio.create_task(sync.run())
+        assert await asyncio.wait_for(applied.get(), 1) == ([], [])  # Catch-up of an empty directory
+        for name in ("a.md", "b.md", "ignored.tmp"):
+            (tmp_path / name).write_text(name)
+            await asyncio.sleep(0.03)
+        changed, removed = await asyncio.wait_for(applied.get(), 2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    resolved = tmp_path.resolve()
+    assert changed == [str(resolved / "a.md"), str(resolved / "b.md")]
+    assert removed == []
+    assert applied.empty()
+
+
+@pytest.mark.asyncio
+async def test_remove_files_without_manifest_deletes_nothing(tmp_path):
+    with patch("mcp_lightrag.api_client.AuthenticatedClient"):
+        client = LightRAGApiClient(ServerSettings(host="localhost", port=9621, api_key="test", manifest_path=None))
+
+    with patch.object(client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
+         patch.object(client, "delete_documents", new_callable=AsyncMock) as mock_delete:
+        result = await client.remove_files([tmp_path / "notes" / "README.md"])
+
+    mock_find.assert_not_called()
+    mock_delete.assert_not_called()
+    assert (result.total, result.successful, result.failed) == (1, 0, 0)
+    assert result.results[0]["status"] == "skipped"
@@ -0,0 +1,71 @@
+"""
+Unit tests for the HTTP transports and the client shared across MCP sessions.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mcp_lightrag.exceptions import ConfigurationError
+from mcp_lightrag.mcp_tools import SharedAppContext, mcp, shared_context
+from mcp_lightrag.models import ServerSettings
+from mcp_lightrag.transports import create_app, parse_bind
+
+
+def fake_client(*args, **kwargs):
+    client = MagicMock()
+    client.warm_up = AsyncMock(return_value=True)
+    client.close = AsyncMock()
+    return client
+
+
+def test_parse_bind():
+    assert parse_bind("0.0.0.0:9000") == ("0.0.0.0", 9000)
+    assert parse_bind("[::1]:8000") == ("::1", 8000)
+    assert parse_bind("8080") == ("127.0.0.1", 8080)
+    with pytest.raises(ConfigurationError):
+        parse_bind("localhost")
+
+
+@pytest.mark.asyncio
+async def test_sessions_share_one_client():
+    shared = SharedAppContext()
+    with patch("mcp_lightrag.mcp_tools.LightRAGApiClient", side_effect=fake_client) as mock_cls:
+        async with shared.session() as first:
+            async with shared.session() as second:
+                assert second is first
+            first.api.close.assert_not_awaited()
+        first.api.close.assert_awaited_once()
+
+        shared.persistent = True
+        async with shared.session() as third:
+            pass
+        assert third is not first
+        third.api.close.assert_not_awaited()
+        await shared.close()
+        third.api.close.assert_awaited_once()
+
+    assert mock_cls.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_http_app_keeps_client_until_shutdown():
+    app = create_app(ServerSettings(transport="sse", bind="127.0.0.1:8000"))
+    with patch("mcp_lightrag.mcp_tools.LightRAGApiClient", side_effect=fake_client):
+        async with app.router.lifespan_context(app):
+            async with shared_context.session() as session:
+                pass
+            session.api.close.assert_not_awaited()
+        session.api.close.assert_awaited_once()
+    shared_context.persistent = False
+
+
+def test_remote_bind_disables_local_host_check():
+    security = mcp.settings.transport_security
+    try:
+        create_app(ServerSettings(transport="sse", bind="0.0.0.0:8000"))
+        assert mcp.settings.transport_security is None
+        with pytest.raises(ConfigurationError):
+            create_app(ServerSettings(transport="stdio"))
+    finally:
+        mcp.settings.transport_security = security
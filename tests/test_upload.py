@@ -0,0 +1,57 @@
+"""
+Unit tests for streamed multipart uploads.
+"""
+
+import httpx
+import pytest
+
+from mcp_lightrag.upload import MultipartFileStream
+
+
+@pytest.mark.asyncio
+async def test_multipart_stream_reads_in_chunks(tmp_path):
+    path = tmp_path / 'report "q1".pdf'
+    path.write_bytes(b"x" * 2500)
+    stream = MultipartFileStream(path, chunk_size=1000)
+
+    parts = [part async for part in stream]
+    body = b"".join(parts)
+
+    assert [len(p) for p in parts[1:-1]] == [1000, 1000, 500]
+    assert int(stream.headers["Content-Length"]) == len(body)
+    assert b'filename="report %22q1%22.pdf"' in body
+    assert b"x" * 2500 in body
+
+
+@pytest.mark.asyncio
+async def test_multipart_stream_detects_size_change(tmp_path):
+    path = tmp_path / "growing.txt"
+    path.write_bytes(b"abc")
+    stream = MultipartFileStream(path)
+    path.write_bytes(b"abcdef")
+
+    with pytest.raises(IOError):
+        _ = [part async for part in stream]
+
+
+@pytest.mark.asyncio
+async def test_large_files_are_streamed(tmp_path, use_transport, make_client):
+    client = make_client(stream_upload_threshold=1024)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"status": "success", "message": "ok", "track_id": "upload_1"})
+
+    use_transport(client, handler)
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"y" * 4096)
+
+    result = await client.upload_file(path)
+
+    assert result.track_id == "upload_1"
+    request = requests[0]
+    assert request.url.path == "/documents/upload"
+    assert request.headers["Content-Type"].startswith("multipart/form-data; boundary=")
+    assert int(request.headers["Content-Length"]) == len(request.content)
+    assert b"y" * 4096 in request.content
@@ -13,7 +13,8 @@ from unittest.mock import AsyncMock, patch, MagicMock
 from pathlib import Path
 
 from mcp_lightrag.api_client import LightRAGApiClient
-from mcp_lightrag.models import ServerSettings
+from mcp_lightrag.endpoints import api_models
+from mcp_lightrag.models import BatchResult, ServerSettings
 
 
 @pytest.fixture
@@ -29,6 +30,12 @@ def mock_client(settings):
         yield client
 
 
+def deletion_result(doc_id, error=None):
+    """A delete_documents result for a single ID."""
+    outcome = {"id": doc_id, "status": "fail", "error": error} if error else {"id": doc_id, "status": "ok"}
+    return BatchResult(total=1, successful=0 if error else 1, failed=1 if error else 0, results=[outcome])
+
+
 @pytest.fixture
 def test_doc_path():
     """Path to the test document."""
@@ -69,7 +76,7 @@ async def test_upsert_document_identical(mock_client, test_doc_path):
     
     with patch.object(mock_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
          patch.object(mock_client, "upload_file", new_callable=AsyncMock) as mock_upload, \
-         patch.object(mock_client, "delete_by_doc", new_callable=AsyncMock) as mock_delete:
+         patch.object(mock_client, "delete_documents", new_callable=AsyncMock) as mock_delete:
         
         # Document exists with same content length
         mock_find.return_value = MockExistingDoc(
@@ -100,7 +107,7 @@ async def test_upsert_document_modified_removed_word(mock_client, tmp_path):
     
     with patch.object(mock_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
          patch.object(mock_client, "upload_file", new_callable=AsyncMock) as mock_upload, \
-         patch.object(mock_client, "delete_by_doc", new_callable=AsyncMock) as mock_delete:
+         patch.object(mock_client, "delete_documents", new_callable=AsyncMock) as mock_delete:
         
         # Document exists but with different content length (original was longer)
         mock_find.return_value = MockExistingDoc(
@@ -108,7 +115,7 @@ async def test_upsert_document_modified_removed_word(mock_client, tmp_path):
             content_length=original_size,  # Different from modified file
             file_path="/inputs/test_upsert_doc.txt"
         )
-        mock_delete.return_value = {"status": "deleted"}
+        mock_delete.return_value = deletion_result("doc-456")
         mock_upload.return_value = {"status": "success"}
         
         result = await mock_client.upsert_document(modified_doc)
@@ -116,7 +123,7 @@ async def test_upsert_document_modified_removed_word(mock_client, tmp_path):
         assert result["action"] == "updated"
         assert result["old_doc_id"] == "doc-456"
         mock_find.assert_called_once()
-        mock_delete.assert_called_once_with("doc-456")
+        mock_delete.assert_called_once_with(["doc-456"])
         mock_upload.assert_called_once_with(modified_doc)
 
 
@@ -132,7 +139,7 @@ async def test_upsert_document_modified_added_word(mock_client, tmp_path):
     
     with patch.object(mock_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
          patch.object(mock_client, "upload_file", new_callable=AsyncMock) as mock_upload, \
-         patch.object(mock_client, "delete_by_doc", new_callable=AsyncMock) as mock_delete:
+         patch.object(mock_client, "delete_documents", new_callable=AsyncMock) as mock_delete:
         
         # Document exists but with different content length (original was shorter)
         mock_find.return_value = MockExistingDoc(
@@ -140,7 +147,7 @@ async def test_upsert_document_modified_added_word(mock_client, tmp_path):
             content_length=original_size,  # Different from modified file
             file_path="/inputs/test_upsert_doc.txt"
         )
-        mock_delete.return_value = {"status": "deleted"}
+        mock_delete.return_value = deletion_result("doc-789")
         mock_upload.return_value = {"status": "success"}
         
         result = await mock_client.upsert_document(modified_doc)
@@ -148,10 +155,46 @@ async def test_upsert_document_modified_added_word(mock_client, tmp_path):
         assert result["action"] == "updated"
         assert result["old_doc_id"] == "doc-789"
         mock_find.assert_called_once()
-        mock_delete.assert_called_once_with("doc-789")
+        mock_delete.assert_called_once_with(["doc-789"])
         mock_upload.assert_called_once_with(modified_doc)
 
 
+@pytest.mark.asyncio
+async def test_upsert_document_keeps_old_version_when_delete_fails(mock_client, tmp_path):
+    """Test that a modified file is not uploaded while its old version could not be deleted."""
+    modified_doc = tmp_path / "test_upsert_doc.txt"
+    modified_doc.write_text("A much longer version of the document than the one stored on the server.\n")
+
+    with patch.object(mock_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
+         patch.object(mock_client, "upload_file", new_callable=AsyncMock) as mock_upload, \
+         patch.object(mock_client, "delete_documents", new_callable=AsyncMock) as mock_delete:
+        mock_find.return_value = MockExistingDoc(doc_id="doc-456", content_length=10, file_path="test_upsert_doc.txt")
+        mock_delete.return_value = deletion_result("doc-456", error="Server busy")
+
+        result = await mock_client.upsert_document(modified_doc)
+
+        assert result["action"] == "failed"
+        assert result["old_doc_id"] == "doc-456"
+        assert "Server busy" in result["error"]
+        mock_upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_by_doc_forgets_only_started_deletions(mock_client):
+    """Test that a busy server leaves the document in the index."""
+    from types import SimpleNamespace
+
+    mock_client.doc_index.add(SimpleNamespace(id="doc-1", file_path="a.md", updated_at="1", track_id=None))
+    with patch("mcp_lightrag.api_client.async_delete_by_doc_id", new_callable=AsyncMock) as mock_delete:
+        mock_delete.return_value = MagicMock(status=api_models.DeleteDocByIdResponseStatus.BUSY)
+        await mock_client.delete_by_doc("doc-1")
+        assert mock_client.doc_index.get_by_id("doc-1") is not None
+
+        mock_delete.return_value = MagicMock(status=api_models.DeleteDocByIdResponseStatus.DELETION_STARTED)
+        await mock_client.delete_by_doc("doc-1")
+        assert mock_client.doc_index.get_by_id("doc-1") is None
+
+
 @pytest.mark.asyncio
 async def test_upsert_document_file_not_found(mock_client):
     """Test upsert with non-existent file - should raise ResourceNotFoundError."""
@@ -159,3 +202,219 @@ async def test_upsert_document_file_not_found(mock_client):
     
     with pytest.raises(ResourceNotFoundError):
         await mock_client.upsert_document("/non/existent/file.txt")
+
+
+@pytest.fixture
+def manifest_client(tmp_path):
+    """Create a LightRAGApiClient with a manifest stored in a temporary directory."""
+    settings = ServerSettings(host="localhost", port=9621, api_key="test",
+                              manifest_path=str(tmp_path / "manifest.sqlite3"))
+    with patch("mcp_lightrag.api_client.AuthenticatedClient"):
+        client = LightRAGApiClient(settings)
+        yield client
+        client.manifest.close()
+
+
+@pytest.mark.asyncio
+async def test_upsert_document_manifest_skips_with_stat_only(manifest_client, tmp_path):
+    """Test that a file unchanged since its last upload is skipped without hashing or listing."""
+    doc = tmp_path / "note.md"
+    doc.write_text("Some note content\n")
+
+    with patch.object(manifest_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
+         patch.object(manifest_client, "upload_file", new_callable=AsyncMock) as mock_upload:
+        mock_find.return_value = None
+        mock_upload.return_value = MagicMock(track_id="upload_1")
+
+        result = await manifest_client.upsert_document(doc)
+        assert result["action"] == "created"
+
+        with patch("mcp_lightrag.api_client.hash_file") as mock_hash:
+            result = await manifest_client.upsert_document(doc)
+            mock_hash.assert_not_called()
+
+        assert result["action"] == "skipped"
+        assert result["reason"] == "file unchanged since last upload"
+        mock_find.assert_called_once()
+        mock_upload.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_upsert_document_manifest_detects_same_length_edit(manifest_client, tmp_path):
+    """Test that an edit keeping the same length is detected and re-uploaded via the recorded track ID."""
+    import os
+    doc = tmp_path / "note.md"
+    doc.write_text("The quick brown fox\n")
+
+    with patch.object(manifest_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
+         patch.object(manifest_client, "upload_file", new_callable=AsyncMock) as mock_upload, \
+         patch.object(manifest_client, "get_track_status", new_callable=AsyncMock) as mock_track, \
+         patch.object(manifest_client, "delete_documents", new_callable=AsyncMock) as mock_delete:
+        mock_find.return_value = None
+        mock_upload.return_value = MagicMock(track_id="upload_1")
+        mock_track.return_value = MagicMock(documents=[MagicMock(id="doc-abc")])
+        mock_delete.return_value = deletion_result("doc-abc")
+
+        await manifest_client.upsert_document(doc)
+
+        doc.write_text("The quick brown cat\n")
+        stat = doc.stat()
+        os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        result = await manifest_client.upsert_document(doc)
+
+        assert result["action"] == "updated"
+        assert result["old_doc_id"] == "doc-abc"
+        mock_track.assert_called_once_with("upload_1")
+        mock_delete.assert_called_once_with(["doc-abc"])
+        mock_find.assert_called_once()
+        assert mock_upload.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_upsert_document_manifest_touched_file(manifest_client, tmp_path):
+    """Test that a touched but unmodified file is skipped by comparing content hashes."""
+    import os
+    doc = tmp_path / "note.md"
+    doc.write_text("Unchanged content\n")
+
+    with patch.object(manifest_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
+         patch.object(manifest_client, "upload_file", new_callable=AsyncMock) as mock_upload:
+        mock_find.return_value = None
+        mock_upload.return_value = MagicMock(track_id="upload_1")
+
+        await manifest_client.upsert_document(doc)
+
+        stat = doc.stat()
+        os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        result = await manifest_client.upsert_document(doc)
+
+        assert result["action"] == "skipped"
+        assert result["reason"] == "document already exists with identical content"
+        mock_upload.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_single_sweep_and_batched_deletes(mock_client, tmp_path):
+    """Test that upsert_many lists documents once, batches deletions and uploads changed files."""
+    (tmp_path / "new.md").write_text("brand new")
+    (tmp_path / "same.md").write_text("identical")
+    (tmp_path / "changed_a.md").write_text("this content has changed a lot")
+    (tmp_path / "changed_b.md").write_text("this one too, quite a bit longer now")
+
+    existing = [
+        MockExistingDoc("doc-same", len("identical"), "same.md"),
+        MockExistingDoc("doc-a", 5, "changed_a.md"),
+        MockExistingDoc("doc-b", 5, "changed_b.md"),
+    ]
+    for doc in existing:
+        doc.updated_at = "2025-01-01T00:00:00"
+    page = MagicMock(documents=existing, pagination=MagicMock(total_count=3))
+
+    with patch.object(mock_client, "get_documents_paginated", new_callable=AsyncMock) as mock_list, \
+         patch.object(mock_client, "upload_file", new_callable=AsyncMock) as mock_upload, \
+         patch("mcp_lightrag.api_client.async_delete_by_doc_id", new_callable=AsyncMock) as mock_delete:
+        mock_list.return_value = page
+        mock_upload.return_value = {"status": "success"}
+        mock_delete.return_value = MagicMock(status=api_models.DeleteDocByIdResponseStatus.DELETION_STARTED)
+
+        result = await mock_client.upsert_many(tmp_path)
+
+    assert result["total"] == 4
+    assert result["created"] == 1
+    assert result["updated"] == 2
+    assert result["skipped"] == 1
+    assert result["failed"] == 0
+    mock_list.assert_called_once()
+    mock_delete.assert_called_once()
+    assert sorted(mock_delete.call_args.kwargs["body"].doc_ids) == ["doc-a", "doc-b"]
+    assert mock_upload.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_missing_file(mock_client, tmp_path):
+    """Test that missing paths are reported as failures without aborting the batch."""
+    (tmp_path / "ok.md").write_text("content")
+    page = MagicMock(documents=[], pagination=MagicMock(total_count=0))
+
+    with patch.object(mock_client, "get_documents_paginated", new_callable=AsyncMock) as mock_list, \
+         patch.object(mock_client, "upload_file", new_callable=AsyncMock) as mock_upload:
+        mock_list.return_value = page
+        mock_upload.return_value = {"status": "success"}
+
+        result = await mock_client.upsert_many([tmp_path / "ok.md", tmp_path / "missing.md"])
+
+    assert result["created"] == 1
+    assert result["failed"] == 1
+    assert result["details"][1]["status"] == "fail"
+
+
+@pytest.mark.asyncio
+async def test_manifest_entries_belong_to_one_server(tmp_path):
+    """Test that a file uploaded to one server is not skipped when upserting it to another."""
+    doc = tmp_path / "note.md"
+    doc.write_text("Some note content\n")
+    manifest_path = str(tmp_path / "manifest.sqlite3")
+
+    with patch("mcp_lightrag.api_client.AuthenticatedClient"):
+        first = LightRAGApiClient(ServerSettings(host="rag-a", port=9621, api_key="test", manifest_path=manifest_path))
+        second = LightRAGApiClient(ServerSettings(host="rag-b", port=9621, api_key="test", manifest_path=manifest_path))
+
+    for client in (first, second):
+        with patch.object(client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
+             patch.object(client, "upload_file", new_callable=AsyncMock) as mock_upload:
+            mock_find.return_value = None
+            mock_upload.return_value = MagicMock(track_id="upload_1")
+            result = await client.upsert_document(doc)
+            assert result["action"] == "created"
+        client.manifest.close()
+
+
+@pytest.mark.asyncio
+async def test_deleted_documents_are_dropped_from_manifest(manifest_client, tmp_path):
+    """Test that a file whose document was purged is uploaded again instead of skipped."""
+    from types import SimpleNamespace
+
+    recorded, pending = tmp_path / "a.md", tmp_path / "b.md"
+    for doc in (recorded, pending):
+        doc.write_text(f"Content of {doc.name}\n")
+
+    with patch.object(manifest_client, "find_document_by_file_name", new_callable=AsyncMock) as mock_find, \
+         patch.object(manifest_client, "upload_file", new_callable=AsyncMock) as mock_upload, \
+         patch("mcp_lightrag.api_client.async_delete_by_doc_id", new_callable=AsyncMock) as mock_delete:
+        mock_find.return_value = None
+        mock_upload.return_value = MagicMock(track_id="upload_b")
+        await manifest_client.upsert_document(pending)
+        await manifest_client._record_upload(str(recorded.resolve()), recorded.stat(), "hash", doc_id="doc-a")
+        # The document of b.md is only known through the index, by its upload's track ID
+        manifest_client.doc_index.add(SimpleNamespace(id="doc-b", file_path="b.md", updated_at="1", track_id="upload_b"))
+
+        mock_delete.return_value = MagicMock(status=api_models.DeleteDocByIdResponseStatus.DELETION_STARTED)
+        await manifest_client.delete_by_docs(["doc-a", "doc-b"])
+
+        assert manifest_client.manifest.get(str(recorded.resolve())) is None
+        assert manifest_client.manifest.get(str(pending.resolve())) is None
+        result = await manifest_client.upsert_document(recorded)
+        assert result["action"] == "created"
+
+
+def test_manifest_refuses_foreign_schema_versions(tmp_path):
+    """Test that opening a database with another schema version leaves it untouched."""
+    import sqlite3
+    from mcp_lightrag.exceptions import ConfigurationError
+    from mcp_lightrag.manifest import Manifest
+
+    db_path = tmp_path / "other.sqlite3"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE files (name TEXT)")
+    conn.execute("PRAGMA user_version = 7")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(ConfigurationError):
+        Manifest(db_path, "http://localhost:9621")
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == [("files",)]
+    conn.close()
@@ -0,0 +1,85 @@
+"""
+Unit tests for waiting on ingestion by track ID.
+"""
+
+import httpx
+import pytest
+
+
+def track_status(*statuses):
+    docs = [
+        {"id": f"doc-{i}", "content_summary": "", "content_length": 1, "status": status,
+         "created_at": "2025-01-01T00:00:00", "updated_at": "2025-01-01T00:00:00",
+         "file_path": f"file{i}.txt", "track_id": "t1", "chunks_count": 3}
+        for i, status in enumerate(statuses)
+    ]
+    summary = {}
+    for status in statuses:
+        summary[status] = summary.get(status, 0) + 1
+    return httpx.Response(200, json={
+        "track_id": "t1", "documents": docs, "total_count": len(docs), "status_summary": summary
+    })
+
+
+def replay(responses):
+    """A handler answering with `responses` in turn (repeating the last one), and the requests it got."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    return handler, requests
+
+
+@pytest.mark.asyncio
+async def test_wait_for_track_until_processed(monkeypatch, make_client):
+    monkeypatch.setattr("mcp_lightrag.api_client.POLL_INTERVAL", 0.0)
+    handler, requests = replay([
+        track_status(),
+        track_status("pending", "pending"),
+        track_status("processed", "processing"),
+        track_status("processed", "failed"),
+    ])
+    client = make_client(handler)
+    reports = []
+
+    async def progress(finished, total):
+        reports.append((finished, total))
+
+    result = await client.wait_for_track("t1", timeout=5, progress=progress)
+
+    assert requests[0].url.path == "/documents/track_status/t1"
+    assert len(requests) == 4
+    assert result["completed"] is True
+    assert result["status_summary"] == {"processed": 1, "failed": 1}
+    assert [d["status"] for d in result["documents"]] == ["processed", "failed"]
+    assert reports == [(0, 0), (1, 2), (2, 2)]
+    assert client.doc_index.get("file0.txt").id == "doc-0"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_track_times_out(monkeypatch, make_client):
+    monkeypatch.setattr("mcp_lightrag.api_client.POLL_INTERVAL", 0.01)
+    handler, _ = replay([track_status("processing")])
+    client = make_client(handler)
+
+    result = await client.wait_for_track("t1", timeout=0.05)
+
+    assert result["completed"] is False
+    assert result["timed_out"] is True
+    assert result["status_summary"] == {"processing": 1}
+
+
+@pytest.mark.asyncio
+async def test_wait_for_track_returns_early_without_documents(monkeypatch, make_client):
+    monkeypatch.setattr("mcp_lightrag.api_client.POLL_INTERVAL", 0.0)
+    handler, requests = replay([track_status()])
+    client = make_client(handler)
+
+    result = await client.wait_for_track("unknown", timeout=60)
+
+    assert len(requests) == 3
+    assert result["found"] is False
+    assert result["completed"] is False
+    assert result["timed_out"] is False